@@ -1,3 +1,6 @@
+from typing import Literal
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -5,8 +8,88 @@ class Settings(BaseSettings):
     port: int = 8000
     allowed_origins: str = "http://localhost:3000"
     artifacts_dir: str = "artifacts"
+    # Registry of <family>_fold<k>_bundle.* files; primary_fold is served as <family>.
+    primary_fold: int = 8
+    registry_max_models: int = 16
+    registry_max_mb: float = 0.0  # 0 = no memory cap
+    registry_preload: str = "baseline_nn,pcinn,sa_pcinn"
+    registry_hot_reload: bool = True
+    registry_reload_interval_s: float = 2.0
+    # "numpy" serves without importing torch at request time; see numpy_engine.py.
+    inference_engine: Literal["torch", "numpy"] = "torch"
+    # Layer precision for predict(); bfloat16/int8 need the torch engine.
+    inference_precision: Literal["mixed", "float32", "bfloat16", "int8"] = "mixed"
+    # Per-model overrides of inference_precision, e.g. "pcinn=int8,sa_pcinn=float32".
+    # Precision, engine and folding apply to single-model predict() only; the
+    # stacked and Jacobian paths (time series, compare, ensemble, Jacobian,
+    # inverse) always run the unfolded weights in numpy at mixed precision.
+    model_precisions: str = ""
+    # Load-time optimisation of registry models; see app/models/optimize.py.
+    fold_scaler: bool = True
+    torch_compile: Literal["none", "trace", "compile"] = "none"
+    warmup_batch_sizes: str = "1,64,1024"  # empty = no warmup
+    # Forward passes run in this pool so the event loop stays responsive.
+    inference_executor: Literal["thread", "process"] = "thread"
+    inference_workers: int = 2
+    torch_intra_op_threads: int = 0  # 0 = cpu_count // inference_workers
+    # Coalesce concurrent single-point /predict calls into one forward pass.
+    batching_enabled: bool = True
+    batch_max_size: int = 64
+    batch_max_wait_ms: float = 2.0
+    # LRU cache of serialized /predict, /predict/timeseries and /predict/compare bodies.
+    cache_enabled: bool = True
+    cache_max_entries: int = 1024
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_ttl_s: float = 0.0  # 0 = entries never expire
+    cache_significant_digits: int = 6
+    # Identical concurrent timeseries/compare misses share one computation.
+    single_flight_enabled: bool = True
+    # Rows per forward pass for /predict/stream; bounds its memory use.
+    stream_chunk_rows: int = 4096
+    # Longest NDJSON/CSV line accepted by /predict/stream and /jobs uploads.
+    stream_max_line_bytes: int = 65536
+    # Row cap for application/x-npy bodies on /predict/batch (JSON stays at 1000).
+    binary_batch_max_rows: int = 100_000
+    # /predict/sweep grids are generated and evaluated sweep_chunk_rows at a time.
+    sweep_max_points: int = 10_000_000
+    sweep_json_max_points: int = 100_000  # larger grids must use a streamed format
+    sweep_chunk_rows: int = 16384
+    # Starting grid for time series requested with sampling=adaptive.
+    adaptive_initial_steps: int = 17
+    # Background /jobs: SQLite metadata plus raw float64 input/result files.
+    jobs_dir: str = "jobs"
+    job_workers: int = 1
+    job_chunk_rows: int = 16384
+    job_max_rows: int = 10_000_000
+    job_ttl_s: float = 86400.0  # finished jobs and their files are deleted after this
+    job_stale_s: float = 60.0  # a running job without progress this long is reclaimed
+    job_poll_interval_s: float = 1.0
+    # Admission control: work in flight is counted in rows per forward pass x models.
+    admission_enabled: bool = True
+    admission_max_cost: int = 32768
+    admission_bulk_share: float = 0.75  # share of the budget bulk requests may hold
+    admission_interactive_max_cost: int = 256  # up to this cost: interactive lane
+    admission_queue_depth: int = 64  # waiters per lane before 429
+    admission_queue_timeout_s: float = 5.0  # queued longer than this -> 503
+    admission_retry_after_s: float = 1.0
+    # Requests sending "X-Server-Timing: 1" get a Server-Timing stage breakdown.
+    server_timing_enabled: bool = True
+    # "X-Profile-Token: <token>" also profiles the request's executor work; "" = off.
+    profiling_token: str = ""
+    profile_store_size: int = 32
+    profile_top_functions: int = 40
 
     model_config = {"env_file": ".env"}
 
+    @model_validator(mode="after")
+    def _check_compatible(self) -> "Settings":
+        # Frozen TorchScript modules cannot be pickled into process-pool workers.
+        if self.torch_compile == "trace" and self.inference_executor == "process":
+            raise ValueError(
+                "TORCH_COMPILE=trace cannot be used with INFERENCE_EXECUTOR=process; "
+                "use TORCH_COMPILE=compile or none, or the thread executor"
+            )
+        return self
+
 
 settings = Settings()
@@ -2,18 +2,54 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.config import settings
 from app.middleware.cors import add_cors_middleware
-from app.models.inference import load_all_models
-from app.routers import health, predict
+from app.middleware.metrics import add_metrics_middleware
+from app.middleware.server_timing import add_server_timing_middleware
+from app.models.registry import ModelRegistry
+from app.routers import health, jobs, metrics, predict, stats
+from app.services.admission import AdmissionController
+from app.services.batcher import BatcherPool
+from app.services.cache import PredictionCache
+from app.services.executor import InferenceExecutor
+from app.services.jobs import JobRunner, JobStore
+from app.services.singleflight import SingleFlight
 
 DEFAULT_MODEL = "sa_pcinn"
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    app.state.predictors = load_all_models()
+    app.state.predictors = ModelRegistry()
+    # Preloaded models are optimised and warmed up before the app takes traffic,
+    # so /health/ready never reports ready with cold models.
+    app.state.predictors.preload(settings.registry_preload.split(","))
     app.state.default_model = DEFAULT_MODEL
+    app.state.executor = InferenceExecutor()
+    app.state.batchers = BatcherPool(app.state.executor)
+    app.state.cache = PredictionCache()
+    app.state.admission = AdmissionController()
+    app.state.single_flight = SingleFlight()
+    app.state.predictors.on_reload(app.state.cache.invalidate)
+    # Background jobs get their own pool so they never queue ahead of /predict.
+    app.state.jobs = JobRunner(
+        JobStore(),
+        app.state.predictors,
+        InferenceExecutor(
+            "thread", settings.job_workers, app.state.executor.torch_threads
+        ),
+    )
+    app.state.jobs.ensure_started()
     yield
+    await app.state.jobs.stop()
+    app.state.jobs.store.close()
+    del app.state.jobs
+    del app.state.single_flight
+    del app.state.admission
+    del app.state.cache
+    del app.state.batchers
+    app.state.executor.shutdown()
+    del app.state.executor
     del app.state.predictors
 
 
@@ -25,6 +61,11 @@ app = FastAPI(
 )
 
 add_cors_middleware(app)
+add_metrics_middleware(app)
+add_server_timing_middleware(app)
 
 app.include_router(health.router, prefix="/api/v1")
 app.include_router(predict.router, prefix="/api/v1")
+app.include_router(stats.router, prefix="/api/v1")
+app.include_router(jobs.router, prefix="/api/v1")
+app.include_router(metrics.router)
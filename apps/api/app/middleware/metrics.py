@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import time
+from collections.abc import Callable
+
+from fastapi import FastAPI, Request, Response
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services import metrics
+
+# perf_counter marks: route handler start, then endpoint end if FastAPI serializes.
+_route_marks: contextvars.ContextVar[list[float] | None] = contextvars.ContextVar(
+    "route_marks", default=None
+)
+
+
+def _route_label(scope: Scope) -> str:
+    """The route template that handled the request, bounded in cardinality."""
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        # Unmatched paths share one label so scanners can't grow the series count.
+        return "unmatched"
+    # Routes of included routers carry their path without the router prefix; with no
+    # path parameters the matched path is the full template.
+    return scope["path"] if "{" not in template else template
+
+
+class MetricsMiddleware:
+    """Records every HTTP request in ``REQUEST_SECONDS`` by its route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.REQUEST_SECONDS.labels(
+                _route_label(scope), scope["method"], status
+            ).observe(time.perf_counter() - start)
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    @functools.wraps(endpoint)
+    async def timed(*args, **kwargs):
+        marks = _route_marks.get()
+        if marks is not None:
+            metrics.record_stage("validation", time.perf_counter() - marks[0])
+        result = await endpoint(*args, **kwargs)
+        # Endpoints that build their own Response have already serialized it.
+        if marks is not None and not isinstance(result, Response):
+            marks.append(time.perf_counter())
+        return result
+
+    return timed
+
+
+class TimedRoute(APIRoute):
+    """Times request validation and FastAPI's response serialization.
+
+    Validation runs from the route handler starting to the endpoint being called
+    (body read, parsing, pydantic validation). Serialization is the time after
+    an endpoint that returns a plain object rather than a ``Response``.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        # Sync endpoints run in a thread pool; only coroutines are wrapped.
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _timed_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            marks = [time.perf_counter()]
+            token = _route_marks.set(marks)
+            try:
+                response = await handler(request)
+            finally:
+                _route_marks.reset(token)
+            if len(marks) > 1:
+                metrics.record_stage("serialization", time.perf_counter() - marks[1])
+            return response
+
+        return timed_handler
+
+
+def add_metrics_middleware(app: FastAPI) -> None:
+    app.add_middleware(MetricsMiddleware)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from fastapi import FastAPI
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.services import tracing
+
+TIMING_HEADER = "x-server-timing"
+PROFILE_TOKEN_HEADER = "x-profile-token"
+
+
+class ServerTimingMiddleware:
+    """Adds a ``Server-Timing`` stage breakdown to requests that opt in.
+
+    ``X-Server-Timing: 1`` turns it on; a valid ``X-Profile-Token`` additionally
+    profiles the request and returns ``X-Profile-Id`` for ``GET /profiles/{id}``.
+    The header is written when the response starts, so for streamed responses
+    it covers only the work done before the first chunk.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        profile = tracing.authorized(headers.get(PROFILE_TOKEN_HEADER))
+        timing = settings.server_timing_enabled and headers.get(TIMING_HEADER) in (
+            "1",
+            "true",
+        )
+        if not (timing or profile):
+            await self.app(scope, receive, send)
+            return
+        origin = headers.get("origin")
+        allowed_origins = [o.strip() for o in settings.allowed_origins.split(",")]
+
+        trace, token = tracing.begin(profile=profile)
+        profile_id = tracing.PROFILES.reserve() if profile else None
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                response_headers.append("Server-Timing", trace.server_timing())
+                if origin in allowed_origins:
+                    # Lets the browser's PerformanceResourceTiming read the entries.
+                    response_headers.append("Timing-Allow-Origin", origin)
+                if profile_id is not None:
+                    response_headers.append("X-Profile-Id", profile_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            tracing.end(token)
+            if profile_id is not None:
+                request_line = f"{scope['method']} {scope['path']}"
+                tracing.PROFILES.put(profile_id, trace, request_line)
+
+
+def add_server_timing_middleware(app: FastAPI) -> None:
+    app.add_middleware(ServerTimingMiddleware)
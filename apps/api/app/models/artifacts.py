@@ -0,0 +1,152 @@
+"""Flat, memory-mappable model artifacts in the safetensors layout.
+
+A file is an 8-byte little-endian header length, a JSON header describing each
+array (``dtype``, ``shape``, ``data_offsets``) plus string ``__metadata__``, and
+then the raw array bytes. ``load_safetensors`` maps the file read-only and
+returns ``np.ndarray`` views into the mapping, so loading costs a header parse,
+nothing is unpickled or copied, and pre-forked workers share the weight pages.
+Files are readable by the ``safetensors`` library but don't depend on it.
+
+``save_safetensors`` writes to a temporary file and renames it over the target.
+A process that still maps the old file keeps that inode, so rewriting an
+artifact that is being served never truncates memory that is in use.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import tempfile
+from collections.abc import Mapping
+
+import numpy as np
+
+from app.models.numpy_engine import LAYER_KEYS, NumpyMLP
+
+SAFETENSORS_SUFFIX = ".safetensors"
+ARTIFACT_FORMAT = "pcinn-nnmodel-v1"
+
+_DTYPES = {"F32": np.dtype("<f4"), "F64": np.dtype("<f8")}
+_DTYPE_NAMES = {dtype: name for name, dtype in _DTYPES.items()}
+
+# Header is space-padded so the data section starts 8-byte aligned.
+_ALIGNMENT = 8
+
+
+def save_safetensors(
+    path: str, tensors: Mapping[str, np.ndarray], metadata: Mapping[str, str]
+) -> None:
+    header: dict = {"__metadata__": dict(metadata)}
+    blobs = []
+    offset = 0
+    # Widest dtypes first keeps every array naturally aligned without gaps.
+    for name, array in sorted(tensors.items(), key=lambda item: -item[1].itemsize):
+        array = np.ascontiguousarray(array)
+        dtype = array.dtype.newbyteorder("<")
+        if dtype not in _DTYPE_NAMES:
+            raise ValueError(f"Unsupported dtype {array.dtype} for '{name}'")
+        blob = array.astype(dtype, copy=False).tobytes()
+        header[name] = {
+            "dtype": _DTYPE_NAMES[dtype],
+            "shape": list(array.shape),
+            "data_offsets": [offset, offset + len(blob)],
+        }
+        blobs.append(blob)
+        offset += len(blob)
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode()
+    header_bytes += b" " * (-(8 + len(header_bytes)) % _ALIGNMENT)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(struct.pack("<Q", len(header_bytes)))
+            f.write(header_bytes)
+            for blob in blobs:
+                f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _read_header(path: str) -> tuple[dict, int]:
+    """The JSON header of ``path`` and the offset its data section starts at."""
+    with open(path, "rb") as f:
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_len))
+    return header, 8 + header_len
+
+
+def read_metadata(path: str) -> dict[str, str]:
+    """The ``__metadata__`` of ``path``, read from its header alone."""
+    return _read_header(path)[0].get("__metadata__", {})
+
+
+def load_safetensors(path: str) -> tuple[dict[str, np.ndarray], dict[str, str]]:
+    """Map ``path`` read-only; returns (array views, metadata)."""
+    header, data_start = _read_header(path)
+    metadata = header.pop("__metadata__", {})
+
+    mapping = np.memmap(path, dtype=np.uint8, mode="r")
+    tensors = {}
+    for name, info in header.items():
+        begin, end = info["data_offsets"]
+        dtype = _DTYPES[info["dtype"]]
+        tensors[name] = np.ndarray(
+            tuple(info["shape"]),
+            dtype=dtype,
+            buffer=mapping,
+            offset=data_start + begin,
+        )
+        if tensors[name].nbytes != end - begin:
+            raise ValueError(f"Corrupt artifact {path}: size mismatch for '{name}'")
+    return tensors, metadata
+
+
+def bundle_to_safetensors(bundle: Mapping, path: str) -> None:
+    """Write a ``*_bundle.pt`` dict (weights, scaler, metadata) as safetensors."""
+    state_dict = NumpyMLP.from_state_dict(bundle["model_state_dict"]).state_dict()
+    tensors = {
+        **state_dict,
+        "scalerx_min": np.asarray(bundle["scalerx_min"], dtype=np.float64),
+        "scalerx_max": np.asarray(bundle["scalerx_max"], dtype=np.float64),
+    }
+    metadata = {
+        "format": ARTIFACT_FORMAT,
+        "model_name": str(bundle["model_name"]),
+        "fold": str(int(bundle["fold"])),
+        "final_test_loss": repr(float(bundle["final_test_loss"])),
+        "is_best": "true" if bundle["is_best"] else "false",
+    }
+    save_safetensors(path, tensors, metadata)
+
+
+def read_bundle(path: str) -> dict:
+    """Load a bundle from ``.safetensors`` (mmap, torch-free) or ``.pt`` (torch).
+
+    Both return the keys of the original torch bundle; safetensors weights are
+    read-only float32 views into the mapped file.
+    """
+    if not path.endswith(SAFETENSORS_SUFFIX):
+        import torch
+
+        return torch.load(path, map_location="cpu", weights_only=False)
+
+    tensors, metadata = load_safetensors(path)
+    if metadata.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"{path} is not a {ARTIFACT_FORMAT} artifact")
+    return {
+        "model_state_dict": {key: tensors[key] for key in LAYER_KEYS},
+        "scalerx_min": tensors["scalerx_min"],
+        "scalerx_max": tensors["scalerx_max"],
+        "model_name": metadata["model_name"],
+        "fold": int(metadata["fold"]),
+        "final_test_loss": float(metadata["final_test_loss"]),
+        "is_best": metadata["is_best"] == "true",
+    }
@@ -0,0 +1,66 @@
+"""Convert ``*_bundle.pt`` artifacts to memory-mappable ``.safetensors``.
+
+Usage (from apps/api)::
+
+    python -m app.models.convert artifacts/*_bundle.pt [--output-dir DIR]
+
+Each bundle is written next to its source (or into ``--output-dir``) with the
+same stem. The converted model is then reloaded with the numpy engine and
+checked against the original torch model on a sample of the input domain; a
+conversion whose raw outputs differ by more than ``--atol`` is deleted and the
+command exits non-zero. Needs torch; serving the converted files does not.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from app.models.artifacts import SAFETENSORS_SUFFIX, bundle_to_safetensors, read_bundle
+from app.models.inference import load_model, predict_columns
+from app.models.numpy_engine import NUMPY_ENGINE_ATOL
+from app.schemas.validation import sample_inputs
+
+VERIFY_SAMPLES = 4096
+
+
+def convert_bundle(source: str, output_dir: str | None = None) -> str:
+    stem = os.path.splitext(os.path.basename(source))[0]
+    target = os.path.join(output_dir or os.path.dirname(source), stem + SAFETENSORS_SUFFIX)
+    bundle_to_safetensors(read_bundle(source), target)
+    return target
+
+
+def max_abs_difference(source: str, target: str, samples: int = VERIFY_SAMPLES) -> float:
+    """Largest raw-output difference between the original and converted model."""
+    inputs = sample_inputs(samples)
+    original = predict_columns(load_model(source, "torch", "mixed"), inputs)
+    converted = predict_columns(load_model(target, "numpy", "mixed"), inputs)
+    return float(np.max(np.abs(original["raw_outputs"] - converted["raw_outputs"])))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("bundles", nargs="+", help="*_bundle.pt files to convert")
+    parser.add_argument("--output-dir", help="directory for .safetensors files")
+    parser.add_argument("--atol", type=float, default=NUMPY_ENGINE_ATOL)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for source in args.bundles:
+        target = convert_bundle(source, args.output_dir)
+        diff = max_abs_difference(source, target)
+        if diff > args.atol:
+            os.remove(target)
+            failed = True
+            print(f"FAIL {source}: max |diff| {diff:.3g} > {args.atol:g}", file=sys.stderr)
+        else:
+            print(f"ok   {source} -> {target} (max |diff| {diff:.3g})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,60 @@
+"""Multi-fold ensembles with per-field mean and spread.
+
+The fold bundles of one model family are stacked into a ``StackedPredictor`` so
+all K members run in a single batched forward pass. Their raw outputs are
+post-processed together as one (K * N, 6) block and reduced over the member axis,
+so mean and standard deviation are computed in physical units (Da, fraction)
+without a Python loop over members.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.models.inference import OUTPUT_FIELDS, ModelPredictor, postprocess_columns
+from app.models.stacked import StackedPredictor
+
+
+def summarize_members(raw_output: np.ndarray) -> dict[str, dict[str, np.ndarray]]:
+    """(K, N, 6) raw head outputs -> {"mean": columns, "std": columns} over K."""
+    k, n, heads = raw_output.shape
+    columns = postprocess_columns(raw_output.reshape(k * n, heads))
+    stacked = {name: columns[name].reshape(k, n) for name in OUTPUT_FIELDS}
+    return {
+        "mean": {name: values.mean(axis=0) for name, values in stacked.items()},
+        "std": {name: values.std(axis=0) for name, values in stacked.items()},
+    }
+
+
+@dataclass(frozen=True)
+class EnsemblePredictor:
+    family: str
+    stacked: StackedPredictor
+
+    @classmethod
+    def from_predictors(
+        cls, family: str, predictors: Mapping[str, ModelPredictor]
+    ) -> EnsemblePredictor:
+        return cls(family, StackedPredictor.from_predictors(predictors))
+
+    @property
+    def members(self) -> tuple[str, ...]:
+        return self.stacked.names
+
+    def built_from(self, predictors: Mapping[str, ModelPredictor]) -> bool:
+        return self.stacked.built_from(predictors)
+
+    def predict_columns(
+        self, raw_inputs: np.ndarray
+    ) -> dict[str, dict[str, np.ndarray]]:
+        """Ensemble mean and std of every served field for (N, 5) inputs."""
+        return summarize_members(self.stacked.forward(raw_inputs))
+
+    def predict_timeseries_columns(
+        self, recipe: np.ndarray, times: np.ndarray
+    ) -> dict[str, dict[str, np.ndarray]]:
+        """Ensemble mean and std along a time series for a fixed recipe."""
+        return summarize_members(self.stacked.forward_timeseries(recipe, times))
@@ -1,30 +1,131 @@
 from __future__ import annotations
 
+import copy
+import dataclasses
+import time
+import warnings
 from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING
 
 import numpy as np
-import torch
 
-from app.models.nn_model import NNmodel
+from app.config import settings
+from app.models.artifacts import read_bundle
+from app.models.numpy_engine import NumpyMLP
+from app.services import metrics
+
+if TYPE_CHECKING:
+    from app.models.nn_model import NNmodel
+
+INFERENCE_ENGINES = ("torch", "numpy")
+# "mixed" scales inputs in float64 and runs the layers in float32 (the original
+# path); "float32" stays in float32 throughout. "bfloat16" and "int8" (dynamically
+# quantized nn.Linear) need the torch engine. See app/models/precision.py.
+INFERENCE_PRECISIONS = ("mixed", "float32", "bfloat16", "int8")
+
+OUTPUT_FIELDS = ("conversion", "mn", "mw", "mz", "mz_plus_1", "mv", "dispersity")
+# Column names for raw head outputs in tabular (CSV/.npy) responses.
+RAW_OUTPUT_FIELDS = (
+    "raw_x",
+    "raw_log10_mn",
+    "raw_log10_mw",
+    "raw_log10_mz",
+    "raw_log10_mz_plus_1",
+    "raw_log10_mv",
+)
 
 
 @dataclass
 class ModelPredictor:
-    model: NNmodel
+    model: NNmodel | NumpyMLP
     scalerx_min: np.ndarray  # shape (5,)
     scalerx_max: np.ndarray  # shape (5,)
     model_name: str
     fold: int
     final_test_loss: float
     is_best: bool
+    precision: str = "mixed"
+    # fc1 takes raw inputs; see app/models/optimize.py.
+    folded: bool = False
+
+    @cached_property
+    def scaler_float32(self) -> tuple[np.ndarray, np.ndarray]:
+        """(min, 1 / range) as float32 for the ``float32`` precision."""
+        scale_range = self.scalerx_max - self.scalerx_min
+        inv_range = (1.0 / scale_range).astype(np.float32)
+        return self.scalerx_min.astype(np.float32), inv_range
+
+    @cached_property
+    def mlp(self) -> NumpyMLP:
+        """The model weights as a ``NumpyMLP``, whichever engine serves them."""
+        if isinstance(self.model, NumpyMLP):
+            return self.model
+        return NumpyMLP.from_state_dict(self.model.state_dict())
+
 
+def apply_precision(predictor: ModelPredictor, precision: str) -> ModelPredictor:
+    """A copy of ``predictor`` that runs ``predict`` at ``precision``.
 
-def load_model(path: str) -> ModelPredictor:
-    bundle = torch.load(path, map_location="cpu", weights_only=False)
-    model = NNmodel()
-    model.load_state_dict(bundle["model_state_dict"])
-    model.eval()
-    return ModelPredictor(
+    Stacked, Jacobian and inverse-design paths keep using the full-precision
+    float32 weights through ``mlp``.
+    """
+    if precision not in INFERENCE_PRECISIONS:
+        raise ValueError(
+            f"Unknown inference precision '{precision}'. "
+            f"Expected one of: {', '.join(INFERENCE_PRECISIONS)}"
+        )
+    if precision == predictor.precision:
+        return predictor
+    model = predictor.model
+    if precision in ("bfloat16", "int8"):
+        if isinstance(model, NumpyMLP):
+            raise ValueError(f"Precision '{precision}' needs the torch engine")
+        import torch
+
+        model = copy.deepcopy(model)
+        if precision == "bfloat16":
+            model = model.to(torch.bfloat16)
+        else:
+            # torch.ao dynamic quantization still works but warns about its migration.
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                model = torch.ao.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+    reduced = dataclasses.replace(predictor, model=model, precision=precision)
+    reduced.__dict__["mlp"] = predictor.mlp
+    return reduced
+
+
+def load_model(
+    path: str, engine: str | None = None, precision: str | None = None
+) -> ModelPredictor:
+    engine = engine or settings.inference_engine
+    if engine not in INFERENCE_ENGINES:
+        raise ValueError(
+            f"Unknown inference engine '{engine}'. "
+            f"Expected one of: {', '.join(INFERENCE_ENGINES)}"
+        )
+
+    bundle = read_bundle(path)
+    if engine == "numpy":
+        model = NumpyMLP.from_state_dict(bundle["model_state_dict"])
+    else:
+        import torch
+
+        from app.models.nn_model import NNmodel
+
+        model = NNmodel()
+        # safetensors views are read-only memmaps; torch needs its own copy.
+        model.load_state_dict(
+            {
+                key: value if torch.is_tensor(value) else torch.from_numpy(np.array(value))
+                for key, value in bundle["model_state_dict"].items()
+            }
+        )
+        model.eval()
+    predictor = ModelPredictor(
         model=model,
         scalerx_min=np.array(bundle["scalerx_min"], dtype=np.float64),
         scalerx_max=np.array(bundle["scalerx_max"], dtype=np.float64),
@@ -33,54 +134,100 @@ def load_model(path: str) -> ModelPredictor:
         final_test_loss=float(bundle["final_test_loss"]),
         is_best=bool(bundle["is_best"]),
     )
+    return apply_precision(predictor, precision or settings.inference_precision)
 
 
-def predict(predictor: ModelPredictor, raw_inputs: np.ndarray) -> dict | list[dict]:
-    """Run inference. raw_inputs shape: (5,) for single or (N, 5) for batch."""
-    single = raw_inputs.ndim == 1
-    if single:
-        raw_inputs = raw_inputs.reshape(1, -1)
+def _forward(
+    model: NNmodel | NumpyMLP, x_scaled: np.ndarray, precision: str = "mixed"
+) -> np.ndarray:
+    if isinstance(model, NumpyMLP):
+        return model(x_scaled)
 
+    import torch
+
+    with torch.no_grad():
+        x_tensor = torch.as_tensor(x_scaled, dtype=torch.float32)
+        if precision == "bfloat16":
+            return model(x_tensor.to(torch.bfloat16)).float().numpy()
+        return model(x_tensor).numpy()
+
+
+def scale_inputs(predictor: ModelPredictor, raw_inputs: np.ndarray) -> np.ndarray:
     # Min-max scale to [0, 1]
-    x_scaled = (raw_inputs - predictor.scalerx_min) / (
+    if predictor.precision != "mixed":
+        scaler_min, inv_range = predictor.scaler_float32
+        return (raw_inputs.astype(np.float32) - scaler_min) * inv_range
+    return (raw_inputs - predictor.scalerx_min) / (
         predictor.scalerx_max - predictor.scalerx_min
     )
 
-    with torch.no_grad():
-        x_tensor = torch.tensor(x_scaled, dtype=torch.float32)
-        raw_output = predictor.model(x_tensor).numpy()
-
-    results = []
-    for row in raw_output:
-        # The model's conversion head is linear; enforce physical bounds at serving.
-        conversion = float(np.clip(row[0], 0.0, 1.0))
-        mn = float(10 ** row[1])
-        mw = float(10 ** row[2])
-        mz = float(10 ** row[3])
-        mz_plus_1 = float(10 ** row[4])
-        mv = float(10 ** row[5])
-        dispersity = mw / mn if mn > 0 else 0.0
-        dispersity = max(dispersity, 1.0)
-        results.append(
-            {
-                "conversion": conversion,
-                "mn": mn,
-                "mw": mw,
-                "mz": mz,
-                "mz_plus_1": mz_plus_1,
-                "mv": mv,
-                "dispersity": dispersity,
-                "raw_outputs": [float(v) for v in row],
-            }
-        )
 
-    return results[0] if single else results
+def postprocess_columns(raw_output: np.ndarray) -> dict[str, np.ndarray]:
+    """Turn (N, 6) raw head outputs into one float64 array per served field."""
+    raw_output = raw_output.astype(np.float64)
+    # The model's conversion head is linear; enforce physical bounds at serving.
+    conversion = np.clip(raw_output[:, 0], 0.0, 1.0)
+    masses = 10.0 ** raw_output[:, 1:]
+    mn, mw = masses[:, 0], masses[:, 1]
+    dispersity = np.divide(mw, mn, out=np.zeros_like(mw), where=mn > 0)
+    np.maximum(dispersity, 1.0, out=dispersity)
+    return {
+        "conversion": conversion,
+        "mn": mn,
+        "mw": mw,
+        "mz": masses[:, 2],
+        "mz_plus_1": masses[:, 3],
+        "mv": masses[:, 4],
+        "dispersity": dispersity,
+        "raw_outputs": raw_output,
+    }
 
 
-def load_all_models(artifacts_dir: str = "artifacts") -> dict[str, ModelPredictor]:
-    models = {
-        "baseline_nn": f"{artifacts_dir}/baseline_nn_fold8_bundle.pt",
-        "pcinn": f"{artifacts_dir}/pcinn_fold8_bundle.pt",
-        "sa_pcinn": f"{artifacts_dir}/sa_pcinn_fold8_bundle.pt",
-    }
-    return {name: load_model(path) for name, path in models.items()}
+def _model_inputs(predictor: ModelPredictor, raw_inputs: np.ndarray) -> np.ndarray:
+    if predictor.folded:
+        return raw_inputs.astype(np.float32)
+    return scale_inputs(predictor, raw_inputs)
+
+
+def predict_columns(
+    predictor: ModelPredictor, raw_inputs: np.ndarray
+) -> dict[str, np.ndarray]:
+    """Run inference on (N, 5) inputs and return arrays keyed by output field."""
+    start = time.perf_counter()
+    x = _model_inputs(predictor, np.atleast_2d(raw_inputs))
+    scaled = time.perf_counter()
+    raw_output = _forward(predictor.model, x, predictor.precision)
+    forwarded = time.perf_counter()
+    columns = postprocess_columns(raw_output)
+    metrics.record_inference(
+        predictor.model_name,
+        predictor.fold,
+        len(x),
+        start,
+        scaled,
+        forwarded,
+        time.perf_counter(),
+    )
+    return columns
+
+
+def columns_to_rows(columns: dict[str, np.ndarray]) -> list[dict]:
+    values = [columns[name].tolist() for name in OUTPUT_FIELDS]
+    raw_outputs = columns["raw_outputs"].tolist()
+    return [
+        {**dict(zip(OUTPUT_FIELDS, row)), "raw_outputs": raw}
+        for row, raw in zip(zip(*values), raw_outputs)
+    ]
+
+
+def columns_to_matrix(columns: dict[str, np.ndarray]) -> np.ndarray:
+    """(N, 13) float64 matrix: OUTPUT_FIELDS followed by RAW_OUTPUT_FIELDS."""
+    return np.column_stack(
+        [columns[name] for name in OUTPUT_FIELDS] + [columns["raw_outputs"]]
+    )
+
+
+def predict(predictor: ModelPredictor, raw_inputs: np.ndarray) -> dict | list[dict]:
+    """Run inference. raw_inputs shape: (5,) for single or (N, 5) for batch."""
+    results = columns_to_rows(predict_columns(predictor, raw_inputs))
+    return results[0] if raw_inputs.ndim == 1 else results
@@ -0,0 +1,183 @@
+"""Inverse design: search the input domain for recipes that hit target properties.
+
+Every served property is linear in the raw heads once masses are taken in
+log10: conversion is head 0 (before clipping), log10 M is heads 1-5 and log10
+dispersity is head 2 minus head 1. Targets and bounds are mapped into that
+space, so the objective gradient for all start points comes from one
+``NumpyMLP.jacobian`` call per iteration. Starts are a Latin hypercube over the
+``PredictionRequest`` bounds, refined with projected Adam steps until the
+iteration or time budget runs out; the final ranking uses served predictions.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Protocol
+
+import numpy as np
+
+from app.models.inference import ModelPredictor, predict_columns, scale_inputs
+from app.schemas.validation import INPUT_FIELDS, INPUT_LOWER, INPUT_UPPER
+
+_HEADS = np.eye(6)
+
+# Raw-head combination giving each property (log10 for everything but conversion).
+PROPERTY_ROWS: dict[str, np.ndarray] = {
+    "conversion": _HEADS[0],
+    "mn": _HEADS[1],
+    "mw": _HEADS[2],
+    "mz": _HEADS[3],
+    "mz_plus_1": _HEADS[4],
+    "mv": _HEADS[5],
+    "dispersity": _HEADS[2] - _HEADS[1],
+}
+LINEAR_PROPERTIES = {"conversion"}
+
+# Adam step size in units of the normalized [0, 1] input box.
+LEARNING_RATE = 0.02
+_BETA1, _BETA2, _EPS = 0.9, 0.999, 1e-8
+
+# Recipes closer than this in the normalized box count as the same solution.
+DEDUPE_DECIMALS = 3
+
+
+class TargetSpec(Protocol):
+    target: float | None
+    min: float | None
+    max: float | None
+    weight: float
+
+
+def _to_objective_space(name: str, value: float | None, default: float) -> float:
+    if value is None:
+        return default
+    return value if name in LINEAR_PROPERTIES else float(np.log10(value))
+
+
+@dataclass(frozen=True)
+class Objective:
+    names: tuple[str, ...]
+    rows: np.ndarray  # (P, 6)
+    target: np.ndarray  # (P,), NaN where only bounds are given
+    lower: np.ndarray  # (P,)
+    upper: np.ndarray  # (P,)
+    weight: np.ndarray  # (P,)
+
+    @classmethod
+    def from_targets(cls, targets: Mapping[str, TargetSpec]) -> Objective:
+        names = tuple(targets)
+        specs = [targets[name] for name in names]
+        return cls(
+            names=names,
+            rows=np.stack([PROPERTY_ROWS[name] for name in names]),
+            target=np.array(
+                [_to_objective_space(n, s.target, np.nan) for n, s in zip(names, specs)]
+            ),
+            lower=np.array(
+                [_to_objective_space(n, s.min, -np.inf) for n, s in zip(names, specs)]
+            ),
+            upper=np.array(
+                [_to_objective_space(n, s.max, np.inf) for n, s in zip(names, specs)]
+            ),
+            weight=np.array([s.weight for s in specs]),
+        )
+
+    def served_values(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        """(N, P) property values from ``postprocess_columns`` output."""
+        return np.column_stack(
+            [
+                columns[name] if name in LINEAR_PROPERTIES else np.log10(columns[name])
+                for name in self.names
+            ]
+        )
+
+    def evaluate(self, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(N, P) property values -> loss (N,) and d(loss)/d(values) (N, P)."""
+        residual = np.where(np.isnan(self.target), 0.0, values - self.target)
+        residual += np.minimum(values - self.lower, 0.0)
+        residual += np.maximum(values - self.upper, 0.0)
+        return (self.weight * residual**2).sum(axis=1), 2.0 * self.weight * residual
+
+    def feasible(self, values: np.ndarray) -> np.ndarray:
+        return ((values >= self.lower) & (values <= self.upper)).all(axis=1)
+
+
+def latin_hypercube(n: int, dims: int, rng: np.random.Generator) -> np.ndarray:
+    """(n, dims) points in [0, 1) with exactly one point per 1/n stratum per column."""
+    strata = np.argsort(rng.random((dims, n)), axis=1).T
+    return (strata + rng.random((n, dims))) / n
+
+
+@dataclass
+class DesignResult:
+    inputs: np.ndarray  # (K, 5) raw inputs, best first
+    objective: np.ndarray  # (K,)
+    feasible: np.ndarray  # (K,) bool
+    columns: dict[str, np.ndarray]  # served predictions for ``inputs``
+    feasible_count: int
+    iterations: int
+    elapsed_ms: float
+
+
+def inverse_design(
+    predictor: ModelPredictor,
+    objective: Objective,
+    fixed: Mapping[str, float] | None = None,
+    top_k: int = 5,
+    starts: int = 256,
+    max_iterations: int = 200,
+    time_budget_s: float = 1.0,
+    seed: int | None = None,
+) -> DesignResult:
+    start = time.perf_counter()
+    deadline = start + time_budget_s
+    rng = np.random.default_rng(seed)
+    span = INPUT_UPPER - INPUT_LOWER
+    fixed_cols = [INPUT_FIELDS.index(name) for name in fixed or {}]
+
+    u = latin_hypercube(starts, len(INPUT_FIELDS), rng)
+    for name, value in (fixed or {}).items():
+        col = INPUT_FIELDS.index(name)
+        u[:, col] = (value - INPUT_LOWER[col]) / span[col]
+    # d(scaled model input)/du for the normalized search box.
+    du_scale = span / (predictor.scalerx_max - predictor.scalerx_min)
+    m = np.zeros_like(u)
+    v = np.zeros_like(u)
+
+    iterations = 0
+    while iterations < max_iterations and time.perf_counter() < deadline:
+        x = INPUT_LOWER + u * span
+        out, jac = predictor.mlp.jacobian(scale_inputs(predictor, x))
+        _, d_values = objective.evaluate(out @ objective.rows.T)
+        d_heads = d_values @ objective.rows  # (N, 6)
+        grad = np.matmul(d_heads[:, None, :], jac)[:, 0, :] * du_scale
+        grad[:, fixed_cols] = 0.0
+
+        iterations += 1
+        m = _BETA1 * m + (1 - _BETA1) * grad
+        v = _BETA2 * v + (1 - _BETA2) * grad**2
+        m_hat = m / (1 - _BETA1**iterations)
+        v_hat = v / (1 - _BETA2**iterations)
+        u -= LEARNING_RATE * m_hat / (np.sqrt(v_hat) + _EPS)
+        np.clip(u, 0.0, 1.0, out=u)
+
+    x = INPUT_LOWER + u * span
+    x[:, fixed_cols] = [fixed[INPUT_FIELDS[col]] for col in fixed_cols]
+    columns = predict_columns(predictor, x)
+    values = objective.served_values(columns)
+    loss, _ = objective.evaluate(values)
+    feasible = objective.feasible(values)
+
+    _, distinct = np.unique(np.round(u, DEDUPE_DECIMALS), axis=0, return_index=True)
+    ranked = distinct[np.lexsort((loss[distinct], ~feasible[distinct]))][:top_k]
+    return DesignResult(
+        inputs=x[ranked],
+        objective=loss[ranked],
+        feasible=feasible[ranked],
+        columns={name: values[ranked] for name, values in columns.items()},
+        feasible_count=int(feasible[distinct].sum()),
+        iterations=iterations,
+        elapsed_ms=1000 * (time.perf_counter() - start),
+    )
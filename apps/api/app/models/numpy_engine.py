@@ -0,0 +1,93 @@
+"""Torch-free forward pass for ``NNmodel``.
+
+``NumpyMLP`` holds the three ``nn.Linear`` layers as float32 arrays in PyTorch's
+``(out_features, in_features)`` layout and evaluates them with BLAS-backed
+``np.matmul``. Raw outputs agree with ``NNmodel.forward`` to within
+``NUMPY_ENGINE_ATOL``; both engines compute in float32, so the only differences
+come from summation order and ``tanh`` rounding.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+# Max absolute difference on raw head outputs vs. NNmodel.forward (float32).
+NUMPY_ENGINE_ATOL = 1e-5
+
+LAYER_KEYS = (
+    "fc1.weight",
+    "fc1.bias",
+    "fc2.weight",
+    "fc2.bias",
+    "fc3.weight",
+    "fc3.bias",
+)
+
+
+def _as_float32(value: Any) -> np.ndarray:
+    if hasattr(value, "detach"):
+        value = value.detach().cpu().numpy()
+    return np.ascontiguousarray(value, dtype=np.float32)
+
+
+@dataclass(frozen=True)
+class NumpyMLP:
+    fc1_weight: np.ndarray  # (128, 5)
+    fc1_bias: np.ndarray  # (128,)
+    fc2_weight: np.ndarray  # (64, 128)
+    fc2_bias: np.ndarray  # (64,)
+    fc3_weight: np.ndarray  # (6, 64)
+    fc3_bias: np.ndarray  # (6,)
+
+    @classmethod
+    def from_state_dict(cls, state_dict: Mapping[str, Any]) -> NumpyMLP:
+        """Build from an ``NNmodel`` state dict (tensors or arrays)."""
+        return cls(*(_as_float32(state_dict[key]) for key in LAYER_KEYS))
+
+    def state_dict(self) -> dict[str, np.ndarray]:
+        return dict(zip(LAYER_KEYS, self.layers()))
+
+    def layers(self) -> tuple[np.ndarray, ...]:
+        return (
+            self.fc1_weight,
+            self.fc1_bias,
+            self.fc2_weight,
+            self.fc2_bias,
+            self.fc3_weight,
+            self.fc3_bias,
+        )
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        """Forward pass. x shape: (N, 5) scaled inputs -> (N, 6) raw outputs."""
+        x = np.asarray(x, dtype=np.float32)
+        h = x @ self.fc1_weight.T
+        h += self.fc1_bias
+        np.tanh(h, out=h)
+        h = h @ self.fc2_weight.T
+        h += self.fc2_bias
+        np.tanh(h, out=h)
+        out = h @ self.fc3_weight.T
+        out += self.fc3_bias
+        return out
+
+    def jacobian(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(N, 5) scaled inputs -> raw outputs (N, 6) and d(out)/d(x) (N, 6, 5).
+
+        Analytic chain rule through both tanh layers, vectorized over rows and
+        evaluated in float64: J = W3 diag(1 - h2^2) W2 diag(1 - h1^2) W1.
+        """
+        w1, w2, w3 = (
+            w.astype(np.float64)
+            for w in (self.fc1_weight, self.fc2_weight, self.fc3_weight)
+        )
+        h1 = np.tanh(x @ w1.T + self.fc1_bias)
+        h2 = np.tanh(h1 @ w2.T + self.fc2_bias)
+        out = h2 @ w3.T + self.fc3_bias
+        # Forward mode: (N, 128, 5) then (N, 64, 5) tangents, then the linear head.
+        tangent = (1.0 - h1**2)[:, :, None] * w1
+        tangent = (1.0 - h2**2)[:, :, None] * np.matmul(w2, tangent)
+        return out, np.matmul(w3, tangent)
@@ -0,0 +1,112 @@
+"""Load-time optimisation of a ``ModelPredictor``.
+
+``fold_scaler`` removes the per-call min-max scaling. The model sees
+x_s = (x - min) / range, so fc1(x_s) = (W1 / range) x + (b1 - W1 (min / range)).
+With that folded into fc1, ``predict`` feeds raw inputs (as float32) straight to
+the model instead of building a scaled float64 copy first. ``compile_model``
+optionally freezes a TorchScript trace or wraps the module in ``torch.compile``.
+``warmup`` runs representative batch sizes once, so lazy kernel, allocator and
+compilation work happens at load time rather than in the first requests. Its
+passes are captured and dropped, so they never show up in ``/metrics``.
+
+Only ``mixed`` precision is folded. Folding moves the scaler offset into the fc1
+bias, and that larger bias quantizes badly. With int8, conversion errors reach
+1.0 and raw outputs are off by several decades, so reduced-precision modes keep
+the scaler separate.
+"""
+
+from __future__ import annotations
+
+import copy
+import dataclasses
+import time
+import warnings
+from collections.abc import Iterable
+
+import numpy as np
+
+from app.models.inference import ModelPredictor, apply_precision, predict_columns
+from app.models.numpy_engine import NumpyMLP
+from app.schemas.validation import sample_inputs
+from app.services import metrics
+
+TORCH_COMPILE_MODES = ("none", "trace", "compile")
+# Precisions the folded fc1 is served at; others keep the explicit scaler.
+FOLDABLE_PRECISIONS = ("mixed",)
+
+
+def folded_fc1(predictor: ModelPredictor) -> tuple[np.ndarray, np.ndarray]:
+    """fc1 weight (128, 5) and bias (128,) that take raw, unscaled inputs."""
+    mlp = predictor.mlp
+    scale_range = predictor.scalerx_max - predictor.scalerx_min
+    weight = mlp.fc1_weight.astype(np.float64) / scale_range
+    bias = mlp.fc1_bias - weight @ predictor.scalerx_min
+    return weight.astype(np.float32), bias.astype(np.float32)
+
+
+def fold_scaler(predictor: ModelPredictor) -> ModelPredictor:
+    if predictor.folded:
+        return predictor
+    if predictor.precision in ("bfloat16", "int8"):
+        raise ValueError("Fold the scaler before reducing precision")
+    weight, bias = folded_fc1(predictor)
+    if isinstance(predictor.model, NumpyMLP):
+        model = dataclasses.replace(predictor.model, fc1_weight=weight, fc1_bias=bias)
+    else:
+        import torch
+
+        model = copy.deepcopy(predictor.model)
+        with torch.no_grad():
+            model.fc1.weight.copy_(torch.from_numpy(weight))
+            model.fc1.bias.copy_(torch.from_numpy(bias))
+    folded = dataclasses.replace(predictor, model=model, folded=True)
+    # ``mlp`` stays the unfolded network for the stacked and Jacobian paths.
+    folded.__dict__["mlp"] = predictor.mlp
+    return folded
+
+
+def compile_model(predictor: ModelPredictor, mode: str) -> ModelPredictor:
+    if mode not in TORCH_COMPILE_MODES:
+        raise ValueError(
+            f"Unknown compile mode '{mode}'. "
+            f"Expected one of: {', '.join(TORCH_COMPILE_MODES)}"
+        )
+    if mode == "none" or isinstance(predictor.model, NumpyMLP):
+        return predictor
+
+    import torch
+
+    if mode == "trace":
+        example = torch.zeros((8, 5))
+        if predictor.precision == "bfloat16":
+            example = example.to(torch.bfloat16)
+        # torch.jit still works but warns that it is deprecated.
+        with warnings.catch_warnings(), torch.no_grad():
+            warnings.simplefilter("ignore")
+            model = torch.jit.freeze(torch.jit.trace(predictor.model, example))
+    else:
+        model = torch.compile(predictor.model, dynamic=True)
+    compiled = dataclasses.replace(predictor, model=model)
+    compiled.__dict__["mlp"] = predictor.mlp
+    return compiled
+
+
+def optimize_predictor(
+    predictor: ModelPredictor,
+    fold: bool = True,
+    precision: str = "mixed",
+    compile_mode: str = "none",
+) -> ModelPredictor:
+    """Fold the scaler (``mixed`` only), then reduce precision, then compile."""
+    if fold and precision in FOLDABLE_PRECISIONS:
+        predictor = fold_scaler(predictor)
+    predictor = apply_precision(predictor, precision)
+    return compile_model(predictor, compile_mode)
+
+
+def warmup(predictor: ModelPredictor, batch_sizes: Iterable[int]) -> float:
+    """Run one forward pass per batch size; returns the elapsed milliseconds."""
+    start = time.perf_counter()
+    for size in batch_sizes:
+        metrics.capture(predict_columns, predictor, sample_inputs(size))
+    return 1000 * (time.perf_counter() - start)
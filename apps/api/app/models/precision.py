@@ -0,0 +1,129 @@
+"""Accuracy and speed of each inference precision against the default path.
+
+Usage (from apps/api)::
+
+    python -m app.models.precision artifacts/*_bundle.safetensors [--points-per-axis 6]
+
+Each model is built with the torch engine in every precision through
+``optimize_predictor`` with the registry's settings (``FOLD_SCALER``,
+``TORCH_COMPILE``), so the report describes the predictor that is actually
+served. It runs on a full-factorial grid spanning the ``PredictionRequest``
+domain and is compared with the unoptimized ``mixed`` model (float64 scaling,
+float32 layers). Per output the report gives the max
+and mean absolute error and the max relative error (denominators floored at 0.1%
+of the field's largest value): raw heads in their own units (X_raw, log10
+masses) and served fields after clipping and ``10 **``.
+``ms/10k`` is the time per 10,000 rows of ``predict_columns``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Sequence
+
+import numpy as np
+
+from app.config import settings
+from app.models.inference import (
+    INFERENCE_PRECISIONS,
+    OUTPUT_FIELDS,
+    RAW_OUTPUT_FIELDS,
+    load_model,
+    predict_columns,
+)
+from app.models.optimize import optimize_predictor
+from app.schemas.validation import INPUT_LOWER, INPUT_UPPER
+from app.services.sweep import grid_chunk
+
+REPORT_FIELDS = RAW_OUTPUT_FIELDS + OUTPUT_FIELDS
+REL_FLOOR = 1e-3
+
+
+def reference_grid(points_per_axis: int = 6) -> np.ndarray:
+    """(points_per_axis**5, 5) full-factorial grid over the input bounds."""
+    axes = [
+        np.linspace(lo, hi, points_per_axis) for lo, hi in zip(INPUT_LOWER, INPUT_UPPER)
+    ]
+    return grid_chunk(axes, 0, points_per_axis ** len(axes))
+
+
+def _report_columns(columns: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    raw = columns["raw_outputs"]
+    return {
+        **{name: raw[:, i] for i, name in enumerate(RAW_OUTPUT_FIELDS)},
+        **{name: columns[name] for name in OUTPUT_FIELDS},
+    }
+
+
+def _ms_per_10k(predictor, inputs: np.ndarray, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predict_columns(predictor, inputs)
+        best = min(best, time.perf_counter() - start)
+    return 1000 * best * 10_000 / len(inputs)
+
+
+def accuracy_report(
+    path: str,
+    precisions: Sequence[str] = INFERENCE_PRECISIONS,
+    inputs: np.ndarray | None = None,
+    fold: bool | None = None,
+    compile_mode: str | None = None,
+) -> dict[str, dict]:
+    """Per precision: ``ms_per_10k`` and {field: max_abs, mean_abs, max_rel}.
+
+    ``fold`` and ``compile_mode`` default to ``settings.fold_scaler`` and
+    ``settings.torch_compile``, as in ``ModelRegistry``.
+    """
+    inputs = reference_grid() if inputs is None else inputs
+    fold = settings.fold_scaler if fold is None else fold
+    compile_mode = compile_mode or settings.torch_compile
+    baseline = load_model(path, engine="torch", precision="mixed")
+    reference = _report_columns(predict_columns(baseline, inputs))
+    report = {}
+    for precision in precisions:
+        predictor = optimize_predictor(
+            baseline, fold=fold, precision=precision, compile_mode=compile_mode
+        )
+        candidate = _report_columns(predict_columns(predictor, inputs))
+        errors = {}
+        for name in REPORT_FIELDS:
+            diff = np.abs(candidate[name] - reference[name])
+            magnitude = np.abs(reference[name])
+            # Floor the denominator so near-zero (clipped) values stay meaningful.
+            scale = np.maximum(magnitude, REL_FLOOR * magnitude.max())
+            errors[name] = {
+                "max_abs": float(diff.max()),
+                "mean_abs": float(diff.mean()),
+                "max_rel": float((diff / scale).max()),
+            }
+        report[precision] = {
+            "ms_per_10k": _ms_per_10k(predictor, inputs),
+            "errors": errors,
+        }
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("artifacts", nargs="+", help="model bundles to evaluate")
+    parser.add_argument("--points-per-axis", type=int, default=6)
+    args = parser.parse_args(argv)
+
+    inputs = reference_grid(args.points_per_axis)
+    for path in args.artifacts:
+        print(f"{path} ({len(inputs)} grid points)")
+        for precision, result in accuracy_report(path, inputs=inputs).items():
+            print(f"  {precision:<9} {result['ms_per_10k']:8.2f} ms/10k")
+            for name, error in result["errors"].items():
+                print(
+                    f"    {name:<20} max {error['max_abs']:10.3g}  "
+                    f"mean {error['mean_abs']:10.3g}  rel {error['max_rel']:10.3g}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
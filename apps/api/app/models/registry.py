@@ -0,0 +1,326 @@
+"""Config-driven model registry with lazy loading and LRU eviction.
+
+Bundles are discovered in ``settings.artifacts_dir`` by file name:
+``<family>_fold<k>_bundle.{safetensors,pt}``. A bundle from
+``settings.primary_fold`` is served under its family name (``sa_pcinn``); other
+folds are served as ``<family>_fold<k>``. Discovery reads the test loss of
+``.safetensors`` bundles from their header; for ``.pt`` bundles it is known
+once the model has loaded. Models load on first access and at
+most ``registry_max_models`` (and ``registry_max_mb``) stay resident, evicting
+the least recently used. With hot reload on, an artifact whose mtime changed is
+reloaded on its next access, checked at most every ``registry_reload_interval_s``.
+
+Loading, optimising and warming a model takes a while under the registry lock,
+so async code uses ``get_async`` and ``refresh_async``. They return resident
+models directly and run any load, reload check or rescan in a worker thread,
+so the event loop never waits on one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+
+from app.config import settings
+from app.models.artifacts import SAFETENSORS_SUFFIX, read_metadata
+from app.models.inference import ModelPredictor, load_model
+from app.models.optimize import optimize_predictor, warmup
+from app.models.numpy_engine import NumpyMLP
+
+ARTIFACT_PATTERN = re.compile(
+    r"^(?P<family>.+)_fold(?P<fold>\d+)_bundle(?P<suffix>\.safetensors|\.pt)$"
+)
+
+
+@dataclass
+class ArtifactEntry:
+    name: str
+    family: str
+    fold: int
+    path: str
+    loads: int = 0
+    last_load_ms: float = 0.0
+    last_warmup_ms: float = 0.0
+    final_test_loss: float | None = None
+    is_best: bool | None = None
+
+
+@dataclass
+class _Resident:
+    predictor: ModelPredictor
+    mtime: float
+    nbytes: int
+
+
+def predictor_nbytes(predictor: ModelPredictor) -> int:
+    if isinstance(predictor.model, NumpyMLP):
+        return sum(layer.nbytes for layer in predictor.model.layers())
+    return sum(p.numel() * p.element_size() for p in predictor.model.parameters())
+
+
+def discover_artifacts(
+    artifacts_dir: str, primary_fold: int
+) -> dict[str, ArtifactEntry]:
+    entries: dict[str, ArtifactEntry] = {}
+    for filename in sorted(os.listdir(artifacts_dir)):
+        match = ARTIFACT_PATTERN.match(filename)
+        if match is None:
+            continue
+        family, fold = match["family"], int(match["fold"])
+        name = family if fold == primary_fold else f"{family}_fold{fold}"
+        path = os.path.join(artifacts_dir, filename)
+        existing = entries.get(name)
+        # Prefer the memory-mappable artifact when both formats are present.
+        if existing is None or match["suffix"] == SAFETENSORS_SUFFIX:
+            entries[name] = _entry(name, family, fold, path)
+    return entries
+
+
+def _entry(name: str, family: str, fold: int, path: str) -> ArtifactEntry:
+    entry = ArtifactEntry(name, family, fold, path)
+    if path.endswith(SAFETENSORS_SUFFIX):
+        metadata = read_metadata(path)
+        if "final_test_loss" in metadata:
+            entry.final_test_loss = float(metadata["final_test_loss"])
+        if "is_best" in metadata:
+            entry.is_best = metadata["is_best"] == "true"
+    return entry
+
+
+def parse_model_precisions(spec: str) -> dict[str, str]:
+    """``"pcinn=int8,sa_pcinn=float32"`` -> ``{"pcinn": "int8", ...}``."""
+    precisions = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, sep, precision = item.partition("=")
+        if not sep:
+            raise ValueError(f"Expected <model>=<precision>, got '{item}'")
+        precisions[name.strip()] = precision.strip()
+    return precisions
+
+
+class ModelRegistry(Mapping[str, ModelPredictor]):
+    def __init__(
+        self,
+        artifacts_dir: str | None = None,
+        engine: str | None = None,
+        max_models: int | None = None,
+        max_mb: float | None = None,
+        primary_fold: int | None = None,
+        hot_reload: bool | None = None,
+        precisions: Mapping[str, str] | None = None,
+        fold_scaler: bool | None = None,
+        compile_mode: str | None = None,
+        warmup_batch_sizes: Iterable[int] | None = None,
+    ):
+        self.artifacts_dir = artifacts_dir or settings.artifacts_dir
+        self.engine = engine
+        self.max_models = max_models or settings.registry_max_models
+        self.max_mb = max_mb if max_mb is not None else settings.registry_max_mb
+        self.primary_fold = primary_fold or settings.primary_fold
+        self.hot_reload = (
+            hot_reload if hot_reload is not None else settings.registry_hot_reload
+        )
+        self.precisions = (
+            dict(precisions)
+            if precisions is not None
+            else parse_model_precisions(settings.model_precisions)
+        )
+        self.fold_scaler = (
+            fold_scaler if fold_scaler is not None else settings.fold_scaler
+        )
+        self.compile_mode = compile_mode or settings.torch_compile
+        self.warmup_batch_sizes = tuple(
+            warmup_batch_sizes
+            if warmup_batch_sizes is not None
+            else (int(size) for size in settings.warmup_batch_sizes.split(",") if size)
+        )
+        self.evictions = 0
+        self.last_evict_ms = 0.0
+        self.evict_ms_total = 0.0
+        self.reloads = 0
+        self._entries = discover_artifacts(self.artifacts_dir, self.primary_fold)
+        self._resident: OrderedDict[str, _Resident] = OrderedDict()
+        self._last_checked: dict[str, float] = {}
+        self._reload_listeners: list[Callable[[str], object]] = []
+        self._lock = threading.RLock()
+
+    def __getitem__(self, name: str) -> ModelPredictor:
+        entry = self._entries[name]
+        with self._lock:
+            resident = self._resident.get(name)
+            if resident is not None and self._is_stale(entry, resident):
+                self._unload_changed(name)
+                resident = None
+            if resident is None:
+                resident = self._load(entry)
+            self._resident.move_to_end(name)
+            return resident.predictor
+
+    async def get_async(self, name: str) -> ModelPredictor:
+        """``self[name]``, loading or reloading the model in a worker thread."""
+        entry = self._entries[name]
+        # Never block the event loop on the lock while another thread loads.
+        if self._lock.acquire(blocking=False):
+            try:
+                resident = self._resident.get(name)
+                if resident is not None and not self._check_due(entry):
+                    self._resident.move_to_end(name)
+                    return resident.predictor
+            finally:
+                self._lock.release()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.__getitem__, name)
+
+    async def refresh_async(self) -> dict:
+        """``refresh`` in a worker thread."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.refresh)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    def entry(self, name: str) -> ArtifactEntry:
+        return self._entries[name]
+
+    def families(self) -> list[str]:
+        return sorted({e.family for e in self._entries.values()})
+
+    def family_members(self, family: str) -> list[str]:
+        """Names of every fold of ``family``, ordered by fold."""
+        members = [e for e in self._entries.values() if e.family == family]
+        return [e.name for e in sorted(members, key=lambda e: e.fold)]
+
+    def resident(self) -> list[str]:
+        return list(self._resident)
+
+    def preload(self, names: Iterable[str]) -> None:
+        for name in names:
+            if name in self._entries:
+                self[name]
+
+    def on_reload(self, listener: Callable[[str], object]) -> None:
+        """Call ``listener(name)`` whenever a changed artifact is reloaded."""
+        self._reload_listeners.append(listener)
+
+    def refresh(self) -> dict:
+        """Rescan the artifacts directory and reload models whose files changed."""
+        with self._lock:
+            discovered = discover_artifacts(self.artifacts_dir, self.primary_fold)
+            added = sorted(set(discovered) - set(self._entries))
+            removed = sorted(set(self._entries) - set(discovered))
+            for name in removed:
+                self._resident.pop(name, None)
+                for listener in self._reload_listeners:
+                    listener(name)
+            for name, entry in discovered.items():
+                old = self._entries.get(name)
+                if old is not None and old.path == entry.path:
+                    discovered[name] = old
+            self._entries = discovered
+            reloaded = [
+                name
+                for name, resident in self._resident.items()
+                if self._file_changed(self._entries[name], resident)
+            ]
+            for name in reloaded:
+                self._unload_changed(name)
+                self._load(self._entries[name])
+            return {"added": added, "removed": removed, "reloaded": reloaded}
+
+    def _unload_changed(self, name: str) -> None:
+        del self._resident[name]
+        self.reloads += 1
+        for listener in self._reload_listeners:
+            listener(name)
+
+    def _check_due(self, entry: ArtifactEntry) -> bool:
+        """Whether hot reload should stat ``entry``'s file on this access."""
+        if not self.hot_reload:
+            return False
+        last_checked = self._last_checked.get(entry.name, 0.0)
+        return time.monotonic() - last_checked >= settings.registry_reload_interval_s
+
+    def _is_stale(self, entry: ArtifactEntry, resident: _Resident) -> bool:
+        if not self._check_due(entry):
+            return False
+        self._last_checked[entry.name] = time.monotonic()
+        return self._file_changed(entry, resident)
+
+    def _file_changed(self, entry: ArtifactEntry, resident: _Resident) -> bool:
+        try:
+            return os.stat(entry.path).st_mtime != resident.mtime
+        except FileNotFoundError:
+            return False
+
+    def _load(self, entry: ArtifactEntry) -> _Resident:
+        mtime = os.stat(entry.path).st_mtime
+        start = time.perf_counter()
+        predictor = optimize_predictor(
+            load_model(entry.path, self.engine, "mixed"),
+            fold=self.fold_scaler,
+            precision=self.precisions.get(entry.name, settings.inference_precision),
+            compile_mode=self.compile_mode,
+        )
+        entry.last_load_ms = 1000 * (time.perf_counter() - start)
+        entry.last_warmup_ms = warmup(predictor, self.warmup_batch_sizes)
+        entry.loads += 1
+        entry.final_test_loss = predictor.final_test_loss
+        entry.is_best = predictor.is_best
+        resident = _Resident(predictor, mtime, predictor_nbytes(predictor))
+        self._resident[entry.name] = resident
+        self._last_checked[entry.name] = time.monotonic()
+        self._evict(keep=entry.name)
+        return resident
+
+    def _evict(self, keep: str) -> None:
+        start = time.perf_counter()
+        max_bytes = self.max_mb * 1024 * 1024
+        evicted = 0
+        while len(self._resident) > 1:
+            total = sum(r.nbytes for r in self._resident.values())
+            over_bytes = bool(max_bytes) and total > max_bytes
+            if len(self._resident) <= self.max_models and not over_bytes:
+                break
+            oldest = next(name for name in self._resident if name != keep)
+            del self._resident[oldest]
+            self.evictions += 1
+            evicted += 1
+        if evicted:
+            self.last_evict_ms = 1000 * (time.perf_counter() - start)
+            self.evict_ms_total += self.last_evict_ms
+
+    def stats(self) -> dict:
+        return {
+            "artifacts_dir": self.artifacts_dir,
+            "available": len(self._entries),
+            "resident": self.resident(),
+            "resident_mb": sum(r.nbytes for r in self._resident.values()) / 2**20,
+            "max_models": self.max_models,
+            "max_mb": self.max_mb,
+            "evictions": self.evictions,
+            "last_evict_ms": self.last_evict_ms,
+            "evict_ms_total": self.evict_ms_total,
+            "reloads": self.reloads,
+            # The stacked and Jacobian paths ignore precision, engine and folding.
+            "stacked": {"engine": "numpy", "precision": "mixed", "folded": False},
+            "models": {
+                name: {
+                    "loads": e.loads,
+                    "last_load_ms": e.last_load_ms,
+                    "last_warmup_ms": e.last_warmup_ms,
+                    "precision": self.precisions.get(name, settings.inference_precision),
+                }
+                for name, e in self._entries.items()
+            },
+        }
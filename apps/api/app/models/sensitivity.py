@@ -0,0 +1,62 @@
+"""Input sensitivities: the 6 x 5 Jacobian of the model heads per operating point.
+
+``NumpyMLP.jacobian`` differentiates with respect to the min-max scaled inputs;
+dividing column j by the scaler range of input j turns that into a derivative
+with respect to the physical input (per mol/L, per K, per s). In the
+``physical`` space the mass rows are further converted from log10 units to Da
+via dM/dx = M ln(10) d(log10 M)/dx, and the conversion row is zeroed where the
+served conversion is clipped to [0, 1].
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from app.models.inference import ModelPredictor, scale_inputs
+
+JACOBIAN_SPACES = ("physical", "raw")
+JACOBIAN_OUTPUTS = {
+    "physical": ("conversion", "mn", "mw", "mz", "mz_plus_1", "mv"),
+    "raw": ("raw_x", "log10_mn", "log10_mw", "log10_mz", "log10_mz_plus_1", "log10_mv"),
+}
+
+# Rows per vectorized pass; bounds the (rows, 128, 5) float64 tangent buffer.
+JACOBIAN_CHUNK_ROWS = 4096
+
+
+def _jacobian_chunk(
+    predictor: ModelPredictor, raw_inputs: np.ndarray, space: str
+) -> tuple[np.ndarray, np.ndarray]:
+    x_scaled = scale_inputs(predictor, raw_inputs)
+    out, jac = predictor.mlp.jacobian(x_scaled)
+    jac /= predictor.scalerx_max - predictor.scalerx_min
+    if space == "raw":
+        return out, jac
+
+    values = np.empty_like(out)
+    values[:, 0] = np.clip(out[:, 0], 0.0, 1.0)
+    jac[:, 0] *= ((out[:, 0] > 0.0) & (out[:, 0] < 1.0))[:, None]
+    values[:, 1:] = 10.0 ** out[:, 1:]
+    jac[:, 1:] *= (values[:, 1:] * np.log(10.0))[:, :, None]
+    return values, jac
+
+
+def predict_jacobian(
+    predictor: ModelPredictor, raw_inputs: np.ndarray, space: str = "physical"
+) -> tuple[np.ndarray, np.ndarray]:
+    """(N, 5) raw inputs -> outputs (N, 6) and Jacobian (N, 6, 5), float64.
+
+    Rows of both follow ``JACOBIAN_OUTPUTS[space]``; Jacobian columns follow the
+    input order m_molar, s_molar, i_molar, temperature_k, time_s.
+    """
+    if space not in JACOBIAN_SPACES:
+        raise ValueError(f"Unknown Jacobian space '{space}'")
+    raw_inputs = np.atleast_2d(raw_inputs)
+    values = np.empty((len(raw_inputs), 6))
+    jacobian = np.empty((len(raw_inputs), 6, raw_inputs.shape[1]))
+    for start in range(0, len(raw_inputs), JACOBIAN_CHUNK_ROWS):
+        stop = start + JACOBIAN_CHUNK_ROWS
+        values[start:stop], jacobian[start:stop] = _jacobian_chunk(
+            predictor, raw_inputs[start:stop], space
+        )
+    return values, jacobian
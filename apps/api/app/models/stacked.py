@@ -0,0 +1,137 @@
+"""Fused forward pass over several ``NNmodel`` predictors.
+
+Every served model shares the 5 -> 128 -> 64 -> 6 architecture, so K weight sets
+can be stacked into (K, in, out) arrays and evaluated with one batched
+``np.matmul`` per layer instead of K separate forward passes. Each model still
+applies its own min-max scaler. Used by ``/predict/compare``; any endpoint that
+needs several models on the same inputs can build one with ``from_predictors``.
+
+``forward_timeseries`` is the fast path for a fixed recipe swept over time: the
+fc1 contribution of the four constant inputs is computed once and only the
+scaled time column times fc1's time weights is added per step.
+
+The stack is built from each member's unfolded ``mlp``, so it always runs at
+``mixed`` precision in numpy, whatever precision, engine, folding or compile
+mode the member's own ``predict`` was optimised with.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.models.inference import ModelPredictor, postprocess_columns
+from app.services import metrics
+
+
+@dataclass(frozen=True)
+class StackedPredictor:
+    names: tuple[str, ...]
+    scalerx_min: np.ndarray  # (K, 5)
+    scalerx_range: np.ndarray  # (K, 5)
+    fc1_weight: np.ndarray  # (K, 5, 128), transposed for x @ W
+    fc1_bias: np.ndarray  # (K, 1, 128)
+    fc2_weight: np.ndarray  # (K, 128, 64)
+    fc2_bias: np.ndarray  # (K, 1, 64)
+    fc3_weight: np.ndarray  # (K, 64, 6)
+    fc3_bias: np.ndarray  # (K, 1, 6)
+    members: tuple[ModelPredictor, ...] = field(repr=False, compare=False)
+
+    @classmethod
+    def from_predictors(cls, predictors: Mapping[str, ModelPredictor]) -> StackedPredictor:
+        members = tuple(predictors.values())
+        if not members:
+            raise ValueError("StackedPredictor needs at least one predictor")
+        mlps = [p.mlp for p in members]
+
+        def weights(attr: str) -> np.ndarray:
+            return np.ascontiguousarray(
+                np.stack([getattr(m, attr).T for m in mlps]), dtype=np.float32
+            )
+
+        def biases(attr: str) -> np.ndarray:
+            return np.stack([getattr(m, attr) for m in mlps])[:, None, :]
+
+        return cls(
+            names=tuple(predictors),
+            scalerx_min=np.stack([p.scalerx_min for p in members]),
+            scalerx_range=np.stack([p.scalerx_max - p.scalerx_min for p in members]),
+            fc1_weight=weights("fc1_weight"),
+            fc1_bias=biases("fc1_bias"),
+            fc2_weight=weights("fc2_weight"),
+            fc2_bias=biases("fc2_bias"),
+            fc3_weight=weights("fc3_weight"),
+            fc3_bias=biases("fc3_bias"),
+            members=members,
+        )
+
+    def built_from(self, predictors: Mapping[str, ModelPredictor]) -> bool:
+        """True if this stack was built from exactly these predictor objects."""
+        return tuple(predictors) == self.names and all(
+            a is b for a, b in zip(predictors.values(), self.members)
+        )
+
+    def scale(self, raw_inputs: np.ndarray) -> np.ndarray:
+        """(N, 5) raw inputs -> (K, N, 5) float32 inputs, one scaler per model."""
+        x_scaled = (raw_inputs[None] - self.scalerx_min[:, None]) / self.scalerx_range[
+            :, None
+        ]
+        return x_scaled.astype(np.float32)
+
+    def _hidden_to_output(self, h: np.ndarray) -> np.ndarray:
+        """fc1 pre-activations (K, N, 128) -> raw head outputs (K, N, 6)."""
+        np.tanh(h, out=h)
+        h = np.matmul(h, self.fc2_weight)
+        h += self.fc2_bias
+        np.tanh(h, out=h)
+        out = np.matmul(h, self.fc3_weight)
+        out += self.fc3_bias
+        return out
+
+    def forward(self, raw_inputs: np.ndarray) -> np.ndarray:
+        """(N, 5) raw inputs -> (K, N, 6) raw head outputs."""
+        h = np.matmul(self.scale(np.atleast_2d(raw_inputs)), self.fc1_weight)
+        h += self.fc1_bias
+        return self._hidden_to_output(h)
+
+    def forward_timeseries(self, recipe: np.ndarray, times: np.ndarray) -> np.ndarray:
+        """(4,) raw [M], [S], [I], T and (T,) times -> (K, T, 6) raw head outputs."""
+        recipe_scaled = (recipe - self.scalerx_min[:, :4]) / self.scalerx_range[:, :4]
+        t_scaled = (times[None] - self.scalerx_min[:, 4:]) / self.scalerx_range[:, 4:]
+        # (K, 1, 128): the time-invariant part of fc1, computed once per model.
+        h_recipe = np.matmul(
+            recipe_scaled.astype(np.float32)[:, None, :], self.fc1_weight[:, :4]
+        )
+        h_recipe += self.fc1_bias
+        h = t_scaled.astype(np.float32)[:, :, None] * self.fc1_weight[:, 4:]
+        h += h_recipe
+        return self._hidden_to_output(h)
+
+    def _postprocess(
+        self, raw_output: np.ndarray, start: float
+    ) -> dict[str, dict[str, np.ndarray]]:
+        # The fused pass (scaling included) is timed once for all member models.
+        metrics.record_stage("forward", time.perf_counter() - start, "+".join(self.names))
+        rows = raw_output.shape[1]
+        columns = {}
+        for k, (name, member) in enumerate(zip(self.names, self.members)):
+            start = time.perf_counter()
+            columns[name] = postprocess_columns(raw_output[k])
+            metrics.record_stage("postprocess", time.perf_counter() - start, name)
+            metrics.record_batch_rows(member.model_name, member.fold, rows)
+        return columns
+
+    def predict_timeseries_columns(
+        self, recipe: np.ndarray, times: np.ndarray
+    ) -> dict[str, dict[str, np.ndarray]]:
+        """Per-model ``postprocess_columns`` output along a time series."""
+        start = time.perf_counter()
+        return self._postprocess(self.forward_timeseries(recipe, times), start)
+
+    def predict_columns(self, raw_inputs: np.ndarray) -> dict[str, dict[str, np.ndarray]]:
+        """Per-model ``postprocess_columns`` output for the same (N, 5) inputs."""
+        start = time.perf_counter()
+        return self._postprocess(self.forward(raw_inputs), start)
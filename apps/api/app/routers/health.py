@@ -1,27 +1,44 @@
+from importlib.metadata import PackageNotFoundError, version
+
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
-import torch
+
+from app.config import settings
+from app.schemas.prediction import COMPARE_MODELS
 
 router = APIRouter(tags=["health"])
 
 
+def _pytorch_version() -> str:
+    # Read package metadata so the numpy engine never has to import torch.
+    try:
+        return version("torch")
+    except PackageNotFoundError:
+        return "not installed"
+
+
 @router.get("/health")
 async def health(request: Request):
     predictors = request.app.state.predictors
-    first_predictor = next(iter(predictors.values()))
+    default_model = request.app.state.default_model
+    # Report from registry metadata; health must never load a model or wait on
+    # the registry lock.
     return {
         "status": "healthy",
-        "models_loaded": len(predictors),
-        "available_models": list(predictors.keys()),
-        "default_model": request.app.state.default_model,
-        "pytorch_version": torch.__version__,
-        "fold": first_predictor.fold,
+        "models_loaded": len(predictors.resident()),
+        "available_models": list(predictors),
+        "default_model": default_model,
+        "pytorch_version": _pytorch_version(),
+        "inference_engine": predictors.engine or settings.inference_engine,
+        "fold": predictors.entry(default_model).fold,
     }
 
 
 @router.get("/health/ready")
 async def ready(request: Request):
     predictors = getattr(request.app.state, "predictors", None)
-    if not predictors or len(predictors) < 3:
+    default_model = getattr(request.app.state, "default_model", None)
+    required = (default_model, *COMPARE_MODELS)
+    if predictors is None or not all(name in predictors for name in required):
         return JSONResponse(status_code=503, content={"status": "not ready"})
     return {"status": "ready"}
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.config import settings
+from app.schemas.jobs import JobResponse
+from app.schemas.validation import bounds_errors
+from app.services import jobs, npy, streaming
+
+router = APIRouter(tags=["jobs"])
+
+RESULT_EXTENSIONS = {streaming.CSV: "csv", streaming.NDJSON: "ndjson", "npy": "npy"}
+
+
+async def _get_job(request: Request, job_id: str) -> jobs.Job:
+    job = await asyncio.to_thread(request.app.state.jobs.store.get, job_id)
+    if job is None:
+        raise HTTPException(404, f"No job '{job_id}' (unknown or expired)")
+    return job
+
+
+def _check_rows(rows: int) -> None:
+    if rows > settings.job_max_rows:
+        raise HTTPException(413, f"At most {settings.job_max_rows} rows per job")
+
+
+async def _upload_chunks(request: Request) -> AsyncIterator[np.ndarray]:
+    """Validated (rows, 5) chunks of an ``.npy``, CSV or NDJSON upload."""
+    content_type = request.headers.get("content-type", "")
+    if content_type.split(";")[0].strip() == npy.NPY_MEDIA_TYPE:
+        stream = request.stream()
+        try:
+            shape, rest = await npy.read_header(stream)
+            # The header gives the row count before any of the payload is read.
+            _check_rows(shape[0])
+            offset = 0
+            async for inputs in npy.iter_rows(
+                stream, shape, rest, settings.job_chunk_rows
+            ):
+                if errors := bounds_errors(inputs, offset):
+                    raise HTTPException(422, errors)
+                offset += len(inputs)
+                yield inputs
+        except npy.NpyFormatError as exc:
+            raise HTTPException(422, str(exc)) from exc
+        return
+
+    fmt = streaming.format_from_media_type(content_type)
+    if fmt is None:
+        raise HTTPException(
+            415,
+            "Content-Type must be application/x-npy, application/x-ndjson or text/csv",
+        )
+    chunks = streaming.iter_input_chunks(
+        request.stream(),
+        fmt,
+        settings.job_chunk_rows,
+        run=request.app.state.jobs.executor.run,
+    )
+    try:
+        async for offset, inputs in chunks:
+            _check_rows(offset + len(inputs))
+            if errors := bounds_errors(inputs, offset):
+                raise HTTPException(422, errors)
+            yield inputs
+    except streaming.StreamInputError as exc:
+        raise HTTPException(422, exc.detail()) from exc
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(request: Request, model: str | None = Query(None)):
+    """Queue an uploaded input file for background scoring.
+
+    The body is an (N, 5) ``.npy`` matrix or a CSV/NDJSON file as accepted by
+    ``/predict/stream``. It is validated and written to ``JOBS_DIR`` in chunks as
+    it arrives, and an ``.npy`` upload over ``JOB_MAX_ROWS`` is refused from its
+    header alone. The job runs once the upload completes.
+    """
+    name = model or request.app.state.default_model
+    predictors = request.app.state.predictors
+    if name not in predictors:
+        raise HTTPException(
+            400, f"Unknown model '{name}'. Available: {', '.join(sorted(predictors))}"
+        )
+    runner = request.app.state.jobs
+    job_id = runner.store.new_id()
+    try:
+        rows = await jobs.write_inputs(runner.store, job_id, _upload_chunks(request))
+        if rows == 0:
+            raise HTTPException(422, "The upload contains no input rows")
+    except BaseException:
+        await asyncio.to_thread(runner.store.remove_files, job_id)
+        raise
+    job = await asyncio.to_thread(runner.store.create, job_id, name)
+    runner.notify()
+    return JSONResponse(
+        job.as_dict(), status_code=202, headers={"Location": f"/api/v1/jobs/{job_id}"}
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def job_status(request: Request, job_id: str):
+    return (await _get_job(request, job_id)).as_dict()
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(request: Request, job_id: str):
+    """Stop a queued or running job; results scored so far are discarded on expiry."""
+    await _get_job(request, job_id)
+    job = await asyncio.to_thread(request.app.state.jobs.store.cancel, job_id)
+    return job.as_dict()
+
+
+def _encode_results(inputs: np.ndarray, results: np.ndarray, fmt: str) -> bytes:
+    if fmt == "npy":
+        return np.ascontiguousarray(results).tobytes()
+    return streaming.encode_chunk(jobs.matrix_columns(results), fmt, inputs)
+
+
+@router.get("/jobs/{job_id}/result")
+async def job_result(request: Request, job_id: str):
+    """Results of a finished job, streamed from disk.
+
+    CSV by default (input columns followed by outputs); ``Accept:
+    application/x-ndjson`` gives NDJSON records and ``application/x-npy`` an
+    (N, 13) float64 matrix whose columns are listed in ``X-Columns``.
+    """
+    job = await _get_job(request, job_id)
+    if job.status != "done":
+        raise HTTPException(409, f"Job '{job_id}' is {job.status}, not done")
+    accept = request.headers.get("accept", "")
+    if npy.NPY_MEDIA_TYPE in accept:
+        fmt, media_type = "npy", npy.NPY_MEDIA_TYPE
+    else:
+        fmt = streaming.format_from_media_type(accept) or streaming.CSV
+        media_type = streaming.MEDIA_TYPES[fmt]
+    runner = request.app.state.jobs
+
+    async def body():
+        if fmt == "npy":
+            yield npy.encode_header((job.rows, len(npy.OUTPUT_COLUMNS)))
+        elif fmt == streaming.CSV:
+            yield streaming.CSV_HEADER_WITH_INPUTS
+        chunks = jobs.read_results(runner.store, job, settings.job_chunk_rows)
+        for inputs, results in chunks:
+            yield await runner.executor.run(_encode_results, inputs, results, fmt)
+
+    filename = f"{job_id}.{RESULT_EXTENSIONS[fmt]}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if fmt == "npy":
+        headers["X-Columns"] = ",".join(npy.OUTPUT_COLUMNS)
+    return StreamingResponse(body(), media_type=media_type, headers=headers)
@@ -0,0 +1,100 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from app.services import metrics
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _state_samples(state) -> list[str]:
+    """Cache, batcher, single-flight, admission and registry stats at scrape time."""
+    cache = state.cache.as_dict()
+    batchers = state.batchers.stats()["models"]
+    registry = state.predictors.stats()
+    lanes = state.admission.stats()["lanes"]
+    single_flight = state.single_flight.as_dict()
+    return [
+        *metrics.sample_lines(
+            "pcinn_cache_events_total",
+            "Response cache lookups and removals by outcome.",
+            [
+                ({"event": event}, cache[event])
+                for event in ("hits", "misses", "evictions", "expirations", "invalidations")
+            ],
+            "counter",
+        ),
+        *metrics.sample_lines(
+            "pcinn_cache_entries", "Responses held in the cache.", [({}, cache["entries"])]
+        ),
+        *metrics.sample_lines(
+            "pcinn_cache_bytes", "Bytes held in the cache.", [({}, cache["bytes"])]
+        ),
+        *metrics.sample_lines(
+            "pcinn_batcher_requests_total",
+            "Single-point requests coalesced by the micro-batcher.",
+            [({"model": name}, stats["requests"]) for name, stats in batchers.items()],
+            "counter",
+        ),
+        *metrics.sample_lines(
+            "pcinn_batcher_batches_total",
+            "Forward passes run by the micro-batcher.",
+            [({"model": name}, stats["batches"]) for name, stats in batchers.items()],
+            "counter",
+        ),
+        *metrics.sample_lines(
+            "pcinn_single_flight_total",
+            "Single-flight outcomes: computations started, callers sharing one, "
+            "computations that failed or were abandoned.",
+            [
+                ({"event": event}, single_flight[event])
+                for event in ("leaders", "shared", "errors", "cancelled")
+            ],
+            "counter",
+        ),
+        *metrics.sample_lines(
+            "pcinn_admission_requests_total",
+            "Admission outcomes per lane: admitted, rejected (429) or timed_out (503).",
+            [
+                ({"lane": lane, "outcome": outcome}, stats[outcome])
+                for lane, stats in lanes.items()
+                for outcome in ("admitted", "rejected", "timed_out")
+            ],
+            "counter",
+        ),
+        *metrics.sample_lines(
+            "pcinn_admission_in_flight_cost",
+            "Admitted work in flight per lane, in rows x models.",
+            [({"lane": lane}, stats["in_flight"]) for lane, stats in lanes.items()],
+        ),
+        *metrics.sample_lines(
+            "pcinn_admission_queued",
+            "Requests waiting for admission per lane.",
+            [({"lane": lane}, stats["queued"]) for lane, stats in lanes.items()],
+        ),
+        *metrics.sample_lines(
+            "pcinn_registry_resident_models",
+            "Models currently loaded in memory.",
+            [({}, len(registry["resident"]))],
+        ),
+        *metrics.sample_lines(
+            "pcinn_registry_resident_bytes",
+            "Approximate memory held by loaded models.",
+            [({}, registry["resident_mb"] * 2**20)],
+        ),
+        *metrics.sample_lines(
+            "pcinn_registry_loads_total",
+            "Artifact loads per model, including reloads.",
+            [({"model": name}, m["loads"]) for name, m in registry["models"].items()],
+            "counter",
+        ),
+    ]
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics(request: Request):
+    return PlainTextResponse(
+        metrics.render(_state_samples(request.app.state)),
+        media_type=PROMETHEUS_MEDIA_TYPE,
+    )
@@ -1,13 +1,47 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query, Request
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.exceptions import RequestValidationError
 import numpy as np
+from pydantic import BaseModel, ValidationError
 
-from app.models.inference import predict
+from app.config import settings
+from app.middleware.metrics import TimedRoute
+from app.models.inference import (
+    OUTPUT_FIELDS,
+    RAW_OUTPUT_FIELDS,
+    ModelPredictor,
+    columns_to_matrix,
+    columns_to_rows,
+    predict,
+    predict_columns,
+)
+from app.models.ensemble import EnsemblePredictor
+from app.models.inverse import Objective, inverse_design
+from app.models.sensitivity import JACOBIAN_OUTPUTS, predict_jacobian
+from app.models.stacked import StackedPredictor
+from app.routers.stats import require_profile_token
+from app.schemas.validation import INPUT_FIELDS, bounds_errors
+from app.services import metrics, npy, sampling, streaming, sweep, tracing
+from app.services.admission import AdmissionRejected
+from app.services.cache import CacheKey
+from app.schemas.columnar import ColumnarBatchRequest, ColumnarBatchResponse
+from app.schemas.inverse import InverseDesignRequest, InverseDesignResponse
+from app.schemas.sweep import SweepRequest, SweepResponse
 from app.schemas.prediction import (
     BatchPredictionRequest,
     BatchPredictionResponse,
+    COMPARE_MODELS,
     CompareResponse,
+    EnsembleBatchResponse,
+    EnsembleTimeSeriesResponse,
+    JacobianResponse,
     ModelInfo,
     ModelsResponse,
     PredictionRequest,
@@ -16,9 +50,7 @@ from app.schemas.prediction import (
     TimeSeriesResponse,
 )
 
-router = APIRouter(tags=["prediction"])
-
-VALID_MODELS = {"baseline_nn", "pcinn", "sa_pcinn"}
+router = APIRouter(tags=["prediction"], route_class=TimedRoute)
 
 MODEL_DISPLAY: dict[str, tuple[str, str]] = {
     "baseline_nn": ("Baseline NN", "Data-only MSE training, no Jacobian guidance"),
@@ -30,14 +62,26 @@ MODEL_DISPLAY: dict[str, tuple[str, str]] = {
 }
 
 
-def _get_predictor(request: Request, model: str | None = None):
-    model = model or request.app.state.default_model
-    if model not in VALID_MODELS:
+def _display(family: str, fold: int) -> tuple[str, str]:
+    display_name, description = MODEL_DISPLAY.get(family, (family, ""))
+    if fold != settings.primary_fold:
+        display_name = f"{display_name} (fold {fold})"
+    return display_name, description
+
+
+def _model_name(request: Request, model: str | None = None) -> str:
+    return model or request.app.state.default_model
+
+
+async def _get_predictor(request: Request, model: str | None = None):
+    model = _model_name(request, model)
+    predictors = request.app.state.predictors
+    if model not in predictors:
         raise HTTPException(
             400,
-            f"Unknown model '{model}'. Available: {', '.join(sorted(VALID_MODELS))}",
+            f"Unknown model '{model}'. Available: {', '.join(sorted(predictors))}",
         )
-    return request.app.state.predictors[model]
+    return await predictors.get_async(model)
 
 
 def _request_to_array(body: PredictionRequest) -> np.ndarray:
@@ -46,98 +90,766 @@ def _request_to_array(body: PredictionRequest) -> np.ndarray:
     )
 
 
-def _build_timeseries_inputs(body: TimeSeriesRequest, times: np.ndarray) -> np.ndarray:
-    base = np.array([body.m_molar, body.s_molar, body.i_molar, body.temperature_k, 0.0])
-    inputs = np.tile(base, (len(times), 1))
-    inputs[:, 4] = times
-    return inputs
+def _timeseries_recipe(body: TimeSeriesRequest) -> np.ndarray:
+    return np.array([body.m_molar, body.s_molar, body.i_molar, body.temperature_k])
+
+
+def _extract_timeseries(columns: dict[str, np.ndarray]) -> dict:
+    return {name: columns[name].tolist() for name in OUTPUT_FIELDS}
+
+
+def _timeseries_key_values(body: TimeSeriesRequest) -> tuple[float, ...]:
+    return (
+        body.m_molar,
+        body.s_molar,
+        body.i_molar,
+        body.temperature_k,
+        body.time_start_s,
+        body.time_end_s,
+        body.time_steps,
+        float(body.spacing == "log"),
+        float(body.sampling == "adaptive"),
+        body.tolerance,
+    )
+
+
+def _sample_timeseries(
+    predict_series: Callable[[np.ndarray, np.ndarray], sampling.Series],
+    body: TimeSeriesRequest,
+) -> tuple[np.ndarray, sampling.Series]:
+    """Times and ``predict_series`` output on the grid ``body`` asks for."""
+    recipe = _timeseries_recipe(body)
+    start, end = body.time_start_s, body.time_end_s
+    if body.sampling == "adaptive":
+        steps = min(body.time_steps, settings.adaptive_initial_steps)
+        return sampling.refine(
+            lambda times: predict_series(recipe, times),
+            sampling.time_grid(start, end, steps, body.spacing),
+            body.time_steps,
+            body.tolerance,
+        )
+    times = sampling.time_grid(start, end, body.time_steps, body.spacing)
+    return times, predict_series(recipe, times)
+
+
+def _json_bytes(response_model: type[BaseModel], payload: Any) -> bytes:
+    start = time.perf_counter()
+    content = response_model.model_validate(payload).model_dump_json().encode()
+    metrics.record_stage("serialization", time.perf_counter() - start)
+    return content
+
+
+def _render(
+    response_model: type[BaseModel], build: Callable[..., Any], *args: Any
+) -> bytes:
+    """Build a payload and serialize it; runs inside the inference executor."""
+    return _json_bytes(response_model, build(*args))
+
+
+async def _cached_response(
+    request: Request,
+    key: CacheKey,
+    compute: Callable[[], Awaitable[bytes]],
+    single_flight: bool = False,
+) -> Response:
+    """Serve ``key`` from the cache, or compute it and cache the result.
+
+    With ``single_flight``, identical requests that miss while a computation for
+    ``key`` is running wait for it and share its bytes instead of starting their own.
+    """
+    cache = request.app.state.cache
+    trace = tracing.current()
+    headers = {}
+    content = cache.get(key) if settings.cache_enabled else None
+    status = "HIT"
+    if content is None:
+        status = "MISS"
+        shared = False
+        if single_flight and settings.single_flight_enabled:
+            content, shared = await request.app.state.single_flight.do(key, compute)
+        else:
+            content = await compute()
+        if shared:
+            headers["X-Single-Flight"] = "shared"
+            if trace is not None:
+                trace.add("singleflight", None, description="shared")
+        elif settings.cache_enabled:
+            cache.put(key, content)
+    if settings.cache_enabled:
+        headers["X-Cache"] = status
+        if trace is not None:
+            trace.add("cache", None, description=status)
+    return Response(content, media_type="application/json", headers=headers)
+
+
+def _rejected(exc: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        exc.status_code, exc.detail, headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+@asynccontextmanager
+async def _admitted(
+    request: Request, cost: int, reject: bool = True
+) -> AsyncIterator[None]:
+    """Hold ``cost`` (rows x models) units of the admission budget."""
+    if not settings.admission_enabled:
+        yield
+        return
+    admission = request.app.state.admission
+    try:
+        ticket = await admission.acquire(cost, reject)
+    except AdmissionRejected as exc:
+        raise _rejected(exc) from None
+    trace = tracing.current()
+    if trace is not None:
+        trace.add("admission", ticket.wait_s, description=ticket.lane)
+    try:
+        yield
+    finally:
+        admission.release(ticket)
+
+
+def _check_admission(request: Request, cost: int) -> None:
+    """Fail fast before a streamed response starts; its chunks are admitted later."""
+    if settings.admission_enabled:
+        try:
+            request.app.state.admission.check(cost)
+        except AdmissionRejected as exc:
+            raise _rejected(exc) from None
+
+
+async def _run_admitted(
+    request: Request, cost: int, fn: Callable[..., Any], *args: Any
+) -> Any:
+    async with _admitted(request, cost):
+        return await request.app.state.executor.run(fn, *args)
+
+
+async def _get_stacked(request: Request, names: tuple[str, ...]) -> StackedPredictor:
+    """Cached ``StackedPredictor`` for ``names``, rebuilt when a model is reloaded."""
+    predictors = {name: await _get_predictor(request, name) for name in names}
+    engines = getattr(request.app.state, "stacked_engines", None)
+    if engines is None:
+        engines = request.app.state.stacked_engines = {}
+    engine = engines.get(names)
+    if engine is None or not engine.built_from(predictors):
+        engine = engines[names] = StackedPredictor.from_predictors(predictors)
+    return engine
+
+
+async def _get_ensemble(request: Request, family: str | None) -> EnsemblePredictor:
+    """Cached ``EnsemblePredictor`` over every fold of ``family``."""
+    registry = request.app.state.predictors
+    family = family or registry.entry(request.app.state.default_model).family
+    names = registry.family_members(family)
+    if not names:
+        raise HTTPException(
+            400,
+            f"Unknown model family '{family}'. "
+            f"Available: {', '.join(registry.families())}",
+        )
+    predictors = {name: await registry.get_async(name) for name in names}
+    ensembles = getattr(request.app.state, "ensembles", None)
+    if ensembles is None:
+        ensembles = request.app.state.ensembles = {}
+    ensemble = ensembles.get(family)
+    if ensemble is None or not ensemble.built_from(predictors):
+        ensemble = ensembles[family] = EnsemblePredictor.from_predictors(
+            family, predictors
+        )
+    return ensemble
 
 
-def _extract_timeseries(results: list[dict]) -> dict:
+def _ensemble_payload(
+    ensemble: EnsemblePredictor, summary: dict[str, dict[str, np.ndarray]]
+) -> dict:
     return {
-        "conversion": [r["conversion"] for r in results],
-        "mn": [r["mn"] for r in results],
-        "mw": [r["mw"] for r in results],
-        "mz": [r["mz"] for r in results],
-        "mz_plus_1": [r["mz_plus_1"] for r in results],
-        "mv": [r["mv"] for r in results],
-        "dispersity": [r["dispersity"] for r in results],
+        "family": ensemble.family,
+        "members": list(ensemble.members),
+        **{
+            stat: {name: values.tolist() for name, values in columns.items()}
+            for stat, columns in summary.items()
+        },
     }
 
 
+def _ensemble_batch_payload(ensemble: EnsemblePredictor, inputs: np.ndarray) -> dict:
+    return _ensemble_payload(ensemble, ensemble.predict_columns(inputs))
+
+
+def _ensemble_timeseries_payload(
+    ensemble: EnsemblePredictor, body: TimeSeriesRequest
+) -> dict:
+    times, summary = _sample_timeseries(ensemble.predict_timeseries_columns, body)
+    return {"times": times.tolist(), **_ensemble_payload(ensemble, summary)}
+
+
+def _timeseries_payload(engine: StackedPredictor, body: TimeSeriesRequest) -> dict:
+    times, columns = _sample_timeseries(engine.predict_timeseries_columns, body)
+    (series,) = columns.values()
+    return {"times": times.tolist(), **_extract_timeseries(series)}
+
+
+def _compare_payload(engine: StackedPredictor, body: TimeSeriesRequest) -> dict:
+    times, columns = _sample_timeseries(engine.predict_timeseries_columns, body)
+    response: dict = {"times": times.tolist()}
+    for name, series in columns.items():
+        response[name] = _extract_timeseries(series)
+    return response
+
+
 @router.post("/predict", response_model=PredictionResponse)
 async def predict_single(
     body: PredictionRequest,
     request: Request,
     model: str | None = Query(None),
 ):
-    predictor = _get_predictor(request, model)
+    name = _model_name(request, model)
+    predictor = await _get_predictor(request, name)
     inputs = _request_to_array(body)
-    return predict(predictor, inputs)
 
+    async def compute() -> bytes:
+        async with _admitted(request, 1):
+            # A traced request runs its own forward pass so its timings are its own.
+            if settings.batching_enabled and tracing.current() is None:
+                batcher = request.app.state.batchers.get(name, predictor)
+                row = await batcher.submit(inputs)
+            else:
+                row = await request.app.state.executor.run(predict, predictor, inputs)
+        return _json_bytes(PredictionResponse, row)
 
-@router.post("/predict/batch", response_model=BatchPredictionResponse)
-async def predict_batch(
-    body: BatchPredictionRequest,
-    request: Request,
-    model: str | None = Query(None),
-):
-    predictor = _get_predictor(request, model)
-    inputs = np.array(
+    key = request.app.state.cache.key("predict", (name,), inputs)
+    return await _cached_response(request, key, compute)
+
+
+def _batch_request_body_schema() -> dict:
+    schema = BatchPredictionRequest.model_json_schema(
+        ref_template="#/components/schemas/{model}"
+    )
+    schema.pop("$defs", None)
+    return {
+        "required": True,
+        "content": {
+            "application/json": {"schema": schema},
+            npy.NPY_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+        },
+    }
+
+
+async def _batch_inputs(request: Request) -> np.ndarray:
+    # Routes that parse their own body bypass FastAPI's validation timing.
+    start = time.perf_counter()
+    content_type = request.headers.get("content-type", "")
+    if content_type.split(";")[0].strip() == npy.NPY_MEDIA_TYPE:
+        inputs = await _read_npy_batch(request)
+    else:
+        inputs = _parse_batch_inputs(await request.body())
+    metrics.record_stage("validation", time.perf_counter() - start)
+    return inputs
+
+
+async def _read_npy_batch(request: Request) -> np.ndarray:
+    """(N, 5) ``.npy`` body, refused from its header alone if it has too many rows."""
+    stream = request.stream()
+    try:
+        shape, rest = await npy.read_header(stream)
+        if shape[0] > settings.binary_batch_max_rows:
+            raise HTTPException(
+                413, f"At most {settings.binary_batch_max_rows} rows per .npy batch"
+            )
+        inputs = await npy.read_payload(stream, shape, rest)
+    except npy.NpyFormatError as exc:
+        raise HTTPException(422, str(exc)) from exc
+    errors = bounds_errors(inputs)
+    if errors:
+        raise RequestValidationError(errors)
+    return inputs
+
+
+def _parse_batch_inputs(body: bytes) -> np.ndarray:
+    try:
+        parsed = BatchPredictionRequest.model_validate_json(body)
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in exc.errors()]
+        ) from exc
+    # reshape keeps an empty batch (0, 5) rather than (0,).
+    return np.array(
         [
             [r.m_molar, r.s_molar, r.i_molar, r.temperature_k, r.time_s]
-            for r in body.inputs
+            for r in parsed.inputs
         ]
-    )
-    results = predict(predictor, inputs)
+    ).reshape(-1, len(INPUT_FIELDS))
+
+
+def _batch_npy(predictor: ModelPredictor, inputs: np.ndarray) -> bytes:
+    columns = predict_columns(predictor, inputs)
+    start = time.perf_counter()
+    content = npy.encode_outputs(columns_to_matrix(columns))
+    metrics.record_stage("serialization", time.perf_counter() - start)
+    return content
+
+
+@router.post(
+    "/predict/batch",
+    response_model=BatchPredictionResponse,
+    openapi_extra={"requestBody": _batch_request_body_schema()},
+    responses={200: {"content": {npy.NPY_MEDIA_TYPE: {}}}},
+)
+async def predict_batch(request: Request, model: str | None = Query(None)):
+    """Batch predictions as JSON or ``.npy``, negotiated by Content-Type and Accept.
+
+    An ``application/x-npy`` body is an (N, 5) ``<f8`` matrix in the order
+    m_molar, s_molar, i_molar, temperature_k, time_s, range-checked like
+    ``PredictionRequest``. With ``Accept: application/x-npy`` the response is an
+    (N, 13) ``<f8`` matrix whose columns are listed in ``X-Columns``.
+    """
+    predictor = await _get_predictor(request, model)
+    inputs = await _batch_inputs(request)
+    if npy.NPY_MEDIA_TYPE in request.headers.get("accept", ""):
+        content = await _run_admitted(
+            request, len(inputs), _batch_npy, predictor, inputs
+        )
+        return Response(
+            content,
+            media_type=npy.NPY_MEDIA_TYPE,
+            headers={"X-Columns": ",".join(npy.OUTPUT_COLUMNS)},
+        )
+    results = await _run_admitted(request, len(inputs), predict, predictor, inputs)
     return {"predictions": results}
 
 
+def _columnar_payload(predictor: ModelPredictor, inputs: np.ndarray) -> dict:
+    columns = predict_columns(predictor, inputs)
+    payload = {name: columns[name].tolist() for name in OUTPUT_FIELDS}
+    raw_outputs = columns["raw_outputs"]
+    for i, name in enumerate(RAW_OUTPUT_FIELDS):
+        payload[name] = raw_outputs[:, i].tolist()
+    return payload
+
+
+@router.post("/predict/batch/columnar", response_model=ColumnarBatchResponse)
+async def predict_batch_columnar(
+    body: ColumnarBatchRequest,
+    request: Request,
+    model: str | None = Query(None),
+):
+    predictor = await _get_predictor(request, model)
+    inputs = body.to_array()
+    content = await _run_admitted(
+        request,
+        len(inputs),
+        _render,
+        ColumnarBatchResponse,
+        _columnar_payload,
+        predictor,
+        inputs,
+    )
+    return Response(content, media_type="application/json")
+
+
+def _jacobian_payload(
+    predictor: ModelPredictor, inputs: np.ndarray, space: str
+) -> dict:
+    values, jacobian = predict_jacobian(predictor, inputs, space)
+    return {
+        "space": space,
+        "outputs": list(JACOBIAN_OUTPUTS[space]),
+        "inputs": list(INPUT_FIELDS),
+        "values": values.tolist(),
+        "jacobian": jacobian.tolist(),
+    }
+
+
+@router.post(
+    "/predict/jacobian",
+    response_model=JacobianResponse,
+    openapi_extra={"requestBody": _batch_request_body_schema()},
+)
+async def predict_jacobian_batch(
+    request: Request,
+    model: str | None = Query(None),
+    space: Literal["physical", "raw"] = Query("physical"),
+):
+    """d(output)/d(input) for each of the six heads at a batch of points.
+
+    Takes the same JSON or ``.npy`` body as ``/predict/batch``. Derivatives are
+    analytic through the tanh layers and the min-max scaler, so they are per
+    physical input unit. ``space=raw`` differentiates the raw heads (X_raw and
+    log10 masses) instead of the served conversion and masses in Da.
+    """
+    predictor = await _get_predictor(request, model)
+    inputs = await _batch_inputs(request)
+    content = await _run_admitted(
+        request,
+        len(inputs),
+        _render,
+        JacobianResponse,
+        _jacobian_payload,
+        predictor,
+        inputs,
+        space,
+    )
+    return Response(content, media_type="application/json")
+
+
+def _inverse_payload(predictor: ModelPredictor, body: InverseDesignRequest) -> dict:
+    result = inverse_design(
+        predictor,
+        Objective.from_targets(body.targets),
+        fixed=body.fixed,
+        top_k=body.top_k,
+        starts=body.starts,
+        max_iterations=body.max_iterations,
+        time_budget_s=body.time_budget_ms / 1000,
+        seed=body.seed,
+    )
+    predictions = columns_to_rows(result.columns)
+    return {
+        "solutions": [
+            {
+                "inputs": dict(zip(INPUT_FIELDS, inputs)),
+                "prediction": prediction,
+                "objective": objective,
+                "feasible": feasible,
+            }
+            for inputs, prediction, objective, feasible in zip(
+                result.inputs.tolist(),
+                predictions,
+                result.objective.tolist(),
+                result.feasible.tolist(),
+            )
+        ],
+        "feasible_count": result.feasible_count,
+        "iterations": result.iterations,
+        "elapsed_ms": result.elapsed_ms,
+    }
+
+
+@router.post("/predict/inverse", response_model=InverseDesignResponse)
+async def predict_inverse(
+    body: InverseDesignRequest,
+    request: Request,
+    model: str | None = Query(None),
+):
+    """Recipes within the input bounds whose predictions best meet ``targets``.
+
+    Runs ``starts`` Latin-hypercube points as one batch, refines them with
+    gradient steps through the model, and stops after ``max_iterations`` or
+    ``time_budget_ms``. Returns the best ``top_k`` distinct recipes, feasible
+    ones (all min/max bounds met) first.
+    """
+    predictor = await _get_predictor(request, model)
+    # Each refinement step is one forward pass over all starts.
+    content = await _run_admitted(
+        request,
+        body.starts,
+        _render,
+        InverseDesignResponse,
+        _inverse_payload,
+        predictor,
+        body,
+    )
+    return Response(content, media_type="application/json")
+
+
 @router.post("/predict/timeseries", response_model=TimeSeriesResponse)
 async def predict_timeseries(
     body: TimeSeriesRequest,
     request: Request,
     model: str | None = Query(None),
 ):
-    predictor = _get_predictor(request, model)
-    times = np.linspace(body.time_start_s, body.time_end_s, body.time_steps)
-    inputs = _build_timeseries_inputs(body, times)
-    results = predict(predictor, inputs)
-    return {"times": times.tolist(), **_extract_timeseries(results)}
+    names = (_model_name(request, model),)
+    engine = await _get_stacked(request, names)
+    key = request.app.state.cache.key("timeseries", names, _timeseries_key_values(body))
+    return await _cached_response(
+        request,
+        key,
+        lambda: _run_admitted(
+            request,
+            body.time_steps,
+            _render,
+            TimeSeriesResponse,
+            _timeseries_payload,
+            engine,
+            body,
+        ),
+        single_flight=True,
+    )
 
 
 @router.post("/predict/compare", response_model=CompareResponse)
 async def predict_compare(body: TimeSeriesRequest, request: Request):
-    times = np.linspace(body.time_start_s, body.time_end_s, body.time_steps)
-    inputs = _build_timeseries_inputs(body, times)
-    response: dict = {"times": times.tolist()}
-    for name, predictor in request.app.state.predictors.items():
-        results = predict(predictor, inputs)
-        response[name] = _extract_timeseries(results)
-    return response
+    engine = await _get_stacked(request, COMPARE_MODELS)
+    key = request.app.state.cache.key(
+        "compare", COMPARE_MODELS, _timeseries_key_values(body)
+    )
+    return await _cached_response(
+        request,
+        key,
+        lambda: _run_admitted(
+            request,
+            body.time_steps * len(COMPARE_MODELS),
+            _render,
+            CompareResponse,
+            _compare_payload,
+            engine,
+            body,
+        ),
+        single_flight=True,
+    )
+
+
+@router.post(
+    "/predict/ensemble/batch",
+    response_model=EnsembleBatchResponse,
+    openapi_extra={"requestBody": _batch_request_body_schema()},
+)
+async def predict_ensemble_batch(request: Request, family: str | None = Query(None)):
+    """Mean and spread across all fold models of ``family`` for a batch of inputs.
+
+    Takes the same JSON or ``.npy`` body as ``/predict/batch``. The members run
+    as one stacked forward pass.
+    """
+    ensemble = await _get_ensemble(request, family)
+    inputs = await _batch_inputs(request)
+    content = await _run_admitted(
+        request,
+        len(inputs) * len(ensemble.members),
+        _render,
+        EnsembleBatchResponse,
+        _ensemble_batch_payload,
+        ensemble,
+        inputs,
+    )
+    return Response(content, media_type="application/json")
+
+
+@router.post("/predict/ensemble/timeseries", response_model=EnsembleTimeSeriesResponse)
+async def predict_ensemble_timeseries(
+    body: TimeSeriesRequest,
+    request: Request,
+    family: str | None = Query(None),
+):
+    ensemble = await _get_ensemble(request, family)
+    key = request.app.state.cache.key(
+        "ensemble_timeseries", ensemble.members, _timeseries_key_values(body)
+    )
+    return await _cached_response(
+        request,
+        key,
+        lambda: _run_admitted(
+            request,
+            body.time_steps * len(ensemble.members),
+            _render,
+            EnsembleTimeSeriesResponse,
+            _ensemble_timeseries_payload,
+            ensemble,
+            body,
+        ),
+        single_flight=True,
+    )
+
+
+def _stream_chunk(predictor: ModelPredictor, inputs: np.ndarray, fmt: str) -> bytes:
+    return streaming.encode_chunk(predict_columns(predictor, inputs), fmt)
+
+
+@router.post("/predict/stream")
+async def predict_stream(request: Request, model: str | None = Query(None)):
+    """Score an NDJSON or CSV body of any length, streaming results as they finish.
+
+    Rows are read and evaluated in chunks of ``STREAM_CHUNK_ROWS``. Problems in
+    the first chunk return 422; later ones end the stream with an in-band error
+    record (an ``{"error": ...}`` line, or a ``# error:`` line for CSV).
+    """
+    predictor = await _get_predictor(request, model)
+    input_format = streaming.format_from_media_type(request.headers.get("content-type"))
+    if input_format is None:
+        raise HTTPException(
+            415, "Content-Type must be application/x-ndjson or text/csv"
+        )
+    output_format = streaming.format_from_media_type(
+        request.headers.get("accept")
+    ) or input_format
+
+    chunks = streaming.iter_input_chunks(
+        request.stream(),
+        input_format,
+        settings.stream_chunk_rows,
+        run=request.app.state.executor.run,
+    )
+    try:
+        first = await anext(chunks, None)
+    except streaming.StreamInputError as exc:
+        raise HTTPException(422, exc.detail()) from exc
+    if first is not None and (errors := bounds_errors(first[1], first[0])):
+        raise HTTPException(422, errors)
+    _check_admission(request, settings.stream_chunk_rows)
+
+    async def body():
+        if output_format == streaming.CSV:
+            yield streaming.CSV_HEADER
+        chunk = first
+        while chunk is not None:
+            offset, inputs = chunk
+            errors = bounds_errors(inputs, offset)
+            if errors:
+                yield streaming.encode_error(errors, output_format)
+                return
+            async with _admitted(request, len(inputs), reject=False):
+                content = await request.app.state.executor.run(
+                    _stream_chunk, predictor, inputs, output_format
+                )
+            yield content
+            try:
+                chunk = await anext(chunks, None)
+            except streaming.StreamInputError as exc:
+                yield streaming.encode_error(exc.detail(), output_format)
+                return
+
+    return streaming.DuplexStreamingResponse(
+        body(), media_type=streaming.MEDIA_TYPES[output_format]
+    )
+
+
+def _sweep_chunk(
+    predictor: ModelPredictor,
+    axes: list[np.ndarray],
+    start: int,
+    stop: int,
+    fmt: str,
+) -> bytes:
+    inputs = sweep.grid_chunk(axes, start, stop)
+    columns = predict_columns(predictor, inputs)
+    if fmt == npy.NPY_MEDIA_TYPE:
+        matrix = columns_to_matrix(columns)
+        return np.ascontiguousarray(matrix, dtype=npy.INPUT_DTYPE).tobytes()
+    return streaming.encode_chunk(columns, fmt, inputs)
+
+
+def _sweep_payload(predictor: ModelPredictor, body: SweepRequest) -> dict:
+    axes = body.axes()
+    outputs = {name: np.empty(body.size) for name in OUTPUT_FIELDS}
+    for start, stop in sweep.chunk_ranges(body.size, settings.sweep_chunk_rows):
+        columns = predict_columns(predictor, sweep.grid_chunk(axes, start, stop))
+        for name in OUTPUT_FIELDS:
+            outputs[name][start:stop] = columns[name]
+    return {
+        "shape": list(body.shape),
+        "axes": {name: axis.tolist() for name, axis in zip(INPUT_FIELDS, axes)},
+        **{name: values.tolist() for name, values in outputs.items()},
+    }
+
+
+@router.post(
+    "/predict/sweep",
+    response_model=SweepResponse,
+    responses={
+        200: {
+            "content": {
+                npy.NPY_MEDIA_TYPE: {},
+                **{media_type: {} for media_type in streaming.MEDIA_TYPES.values()},
+            }
+        }
+    },
+)
+async def predict_sweep(
+    body: SweepRequest, request: Request, model: str | None = Query(None)
+):
+    """Evaluate a full-factorial grid built server-side from per-input axes.
+
+    Each input is a fixed value or an axis (``start``, ``stop``, ``steps``,
+    linear or log ``spacing``). Rows are generated and evaluated in chunks of
+    ``SWEEP_CHUNK_ROWS`` in C order of the grid (``time_s`` varies fastest).
+    The default JSON response is columnar and limited to
+    ``SWEEP_JSON_MAX_POINTS``; ``Accept: application/x-ndjson``, ``text/csv``
+    (rows include their inputs) or ``application/x-npy`` (an (N, 13) matrix)
+    streams grids of any allowed size.
+    """
+    predictor = await _get_predictor(request, model)
+    accept = request.headers.get("accept", "")
+    if npy.NPY_MEDIA_TYPE in accept:
+        fmt = npy.NPY_MEDIA_TYPE
+    else:
+        fmt = streaming.format_from_media_type(accept)
+
+    if fmt is None:
+        if body.size > settings.sweep_json_max_points:
+            raise HTTPException(
+                413,
+                f"Grids over {settings.sweep_json_max_points} points must be "
+                "streamed: send Accept: application/x-ndjson, text/csv or "
+                f"{npy.NPY_MEDIA_TYPE}",
+            )
+        # The grid is evaluated one chunk at a time, so that is the work in flight.
+        content = await _run_admitted(
+            request,
+            min(body.size, settings.sweep_chunk_rows),
+            _render,
+            SweepResponse,
+            _sweep_payload,
+            predictor,
+            body,
+        )
+        return Response(content, media_type="application/json")
+
+    _check_admission(request, min(body.size, settings.sweep_chunk_rows))
+    axes = body.axes()
+    headers = {"X-Sweep-Shape": ",".join(map(str, body.shape))}
+    if fmt == npy.NPY_MEDIA_TYPE:
+        media_type = npy.NPY_MEDIA_TYPE
+        headers["X-Columns"] = ",".join(npy.OUTPUT_COLUMNS)
+    else:
+        media_type = streaming.MEDIA_TYPES[fmt]
+
+    async def content():
+        if fmt == npy.NPY_MEDIA_TYPE:
+            yield npy.encode_header((body.size, len(npy.OUTPUT_COLUMNS)))
+        elif fmt == streaming.CSV:
+            yield streaming.CSV_HEADER_WITH_INPUTS
+        for start, stop in sweep.chunk_ranges(body.size, settings.sweep_chunk_rows):
+            async with _admitted(request, stop - start, reject=False):
+                chunk = await request.app.state.executor.run(
+                    _sweep_chunk, predictor, axes, start, stop, fmt
+                )
+            yield chunk
+
+    return StreamingResponse(content(), media_type=media_type, headers=headers)
 
 
 @router.get("/models", response_model=ModelsResponse)
 async def list_models(request: Request):
+    registry = request.app.state.predictors
     models = []
-    for name, predictor in request.app.state.predictors.items():
-        display_name, description = MODEL_DISPLAY[name]
+    for name in registry:
+        # Never loads a model: the loss is null for a .pt bundle not yet used.
+        entry = registry.entry(name)
+        display_name, description = _display(entry.family, entry.fold)
         models.append(
             ModelInfo(
                 name=name,
                 display_name=display_name,
                 description=description,
                 is_default=(name == request.app.state.default_model),
-                final_test_loss=predictor.final_test_loss,
+                fold=entry.fold,
+                final_test_loss=entry.final_test_loss,
             )
         )
     return {"models": models}
 
 
+@router.post("/models/reload", dependencies=[Depends(require_profile_token)])
+async def reload_models(request: Request):
+    """Rescan the artifacts directory and reload models whose files changed."""
+    return await request.app.state.predictors.refresh_async()
+
+
 @router.get("/model/info")
 async def model_info(request: Request, model: str | None = Query(None)):
-    predictor = _get_predictor(request, model)
-    display_name, description = MODEL_DISPLAY[predictor.model_name]
+    predictor = await _get_predictor(request, model)
+    display_name, description = _display(predictor.model_name, predictor.fold)
     return {
         "model_name": predictor.model_name,
         "model_class": "NNmodel",
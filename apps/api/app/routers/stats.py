@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+
+from app.services import tracing
+
+router = APIRouter(tags=["stats"])
+
+
+def require_profile_token(x_profile_token: str | None = Header(None)) -> None:
+    """Dependency for admin routes: 403 without a valid ``X-Profile-Token``."""
+    if not tracing.authorized(x_profile_token):
+        raise HTTPException(403, "A valid X-Profile-Token header is required")
+
+
+@router.get("/stats")
+async def stats(request: Request):
+    return {
+        "executor": request.app.state.executor.stats(),
+        "batcher": request.app.state.batchers.stats(),
+        "cache": request.app.state.cache.as_dict(),
+        "admission": request.app.state.admission.stats(),
+        "single_flight": request.app.state.single_flight.as_dict(),
+        "registry": request.app.state.predictors.stats(),
+    }
+
+
+@router.delete("/cache", dependencies=[Depends(require_profile_token)])
+async def invalidate_cache(request: Request, model: str | None = Query(None)):
+    return {"invalidated": request.app.state.cache.invalidate(model)}
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_profile_token)],
+)
+async def profile(profile_id: str):
+    """cProfile summary of a request sent with a valid ``X-Profile-Token``."""
+    summary = tracing.PROFILES.get(profile_id)
+    if summary is None:
+        raise HTTPException(404, f"No profile '{profile_id}' (expired or still running)")
+    return summary
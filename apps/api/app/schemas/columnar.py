@@ -0,0 +1,82 @@
+"""Column-oriented batch schemas.
+
+``ColumnarBatchRequest`` carries one array per input instead of one
+``PredictionRequest`` per row, so validation is a handful of whole-array
+comparisons against the ``PredictionRequest`` bounds rather than N model
+instances.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+
+from app.schemas.validation import (
+    INPUT_FIELDS,
+    INPUT_LOWER,
+    INPUT_UPPER,
+    out_of_bounds_rows,
+)
+
+COLUMNAR_MAX_ROWS = 100_000
+
+# Offending row indices listed per field in a validation error message.
+MAX_REPORTED_ROWS = 10
+
+
+class ColumnarBatchRequest(BaseModel):
+    m_molar: list[float] = Field(..., min_length=1, max_length=COLUMNAR_MAX_ROWS)
+    s_molar: list[float] = Field(..., min_length=1, max_length=COLUMNAR_MAX_ROWS)
+    i_molar: list[float] = Field(..., min_length=1, max_length=COLUMNAR_MAX_ROWS)
+    temperature_k: list[float] = Field(..., min_length=1, max_length=COLUMNAR_MAX_ROWS)
+    time_s: list[float] = Field(..., min_length=1, max_length=COLUMNAR_MAX_ROWS)
+
+    _inputs: np.ndarray = PrivateAttr()
+
+    @model_validator(mode="after")
+    def _check_columns(self) -> ColumnarBatchRequest:
+        lengths = {name: len(getattr(self, name)) for name in INPUT_FIELDS}
+        if len(set(lengths.values())) != 1:
+            raise ValueError(f"All input columns must have the same length, got {lengths}")
+
+        inputs = np.column_stack([getattr(self, name) for name in INPUT_FIELDS])
+        problems = []
+        for name, rows in out_of_bounds_rows(inputs).items():
+            col = INPUT_FIELDS.index(name)
+            shown = ", ".join(str(row) for row in rows[:MAX_REPORTED_ROWS])
+            hidden = len(rows) - MAX_REPORTED_ROWS
+            more = f" (+{hidden} more)" if hidden > 0 else ""
+            problems.append(
+                f"{name} outside [{INPUT_LOWER[col]:g}, {INPUT_UPPER[col]:g}] "
+                f"at rows {shown}{more}"
+            )
+        if problems:
+            raise ValueError("; ".join(problems))
+        self._inputs = inputs
+        return self
+
+    def to_array(self) -> np.ndarray:
+        """Validated (N, 5) input matrix in canonical column order."""
+        return self._inputs
+
+
+class ColumnarBatchResponse(BaseModel):
+    conversion: list[float] = Field(
+        ..., description="Served conversion per row, clipped to [0, 1]."
+    )
+    mn: list[float] = Field(..., description="Mn per row [Da].")
+    mw: list[float] = Field(..., description="Mw per row [Da].")
+    mz: list[float] = Field(..., description="Mz per row [Da].")
+    mz_plus_1: list[float] = Field(..., description="Mz+1 per row [Da].")
+    mv: list[float] = Field(..., description="Mv per row [Da].")
+    dispersity: list[float] = Field(
+        ..., description="Dispersity (Mw/Mn) per row, clamped to a minimum of 1.0."
+    )
+    raw_x: list[float] = Field(..., description="Unclipped X_raw head output.")
+    raw_log10_mn: list[float] = Field(..., description="Raw log10(Mn) head output.")
+    raw_log10_mw: list[float] = Field(..., description="Raw log10(Mw) head output.")
+    raw_log10_mz: list[float] = Field(..., description="Raw log10(Mz) head output.")
+    raw_log10_mz_plus_1: list[float] = Field(
+        ..., description="Raw log10(Mz+1) head output."
+    )
+    raw_log10_mv: list[float] = Field(..., description="Raw log10(Mv) head output.")
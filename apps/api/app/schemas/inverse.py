@@ -0,0 +1,70 @@
+"""Schemas for ``/predict/inverse``: recipes that hit target properties."""
+
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.schemas.prediction import PredictionRequest, PredictionResponse
+from app.schemas.validation import INPUT_FIELDS, INPUT_LOWER, INPUT_UPPER
+
+PropertyName = Literal["conversion", "mn", "mw", "mz", "mz_plus_1", "mv", "dispersity"]
+InputName = Literal["m_molar", "s_molar", "i_molar", "temperature_k", "time_s"]
+
+
+class PropertyTarget(BaseModel):
+    """Goal for one served output: a value to approach and/or hard bounds."""
+
+    target: float | None = Field(None, description="Value to get closest to.")
+    min: float | None = Field(None, description="Feasible solutions are >= this.")
+    max: float | None = Field(None, description="Feasible solutions are <= this.")
+    weight: float = Field(1.0, gt=0.0)
+
+    @model_validator(mode="after")
+    def _check(self) -> PropertyTarget:
+        if self.target is None and self.min is None and self.max is None:
+            raise ValueError("Give at least one of target, min or max")
+        if self.min is not None and self.max is not None and self.min > self.max:
+            raise ValueError("min must not exceed max")
+        return self
+
+
+class InverseDesignRequest(BaseModel):
+    targets: dict[PropertyName, PropertyTarget] = Field(..., min_length=1)
+    fixed: dict[InputName, float] = Field(
+        default_factory=dict, description="Inputs held constant during the search."
+    )
+    top_k: int = Field(5, ge=1, le=50)
+    starts: int = Field(256, ge=1, le=4096, description="Latin-hypercube start points.")
+    max_iterations: int = Field(200, ge=0, le=2000)
+    time_budget_ms: float = Field(1000.0, gt=0.0, le=10_000.0)
+    seed: int | None = None
+
+    @model_validator(mode="after")
+    def _check_values(self) -> InverseDesignRequest:
+        for name, goal in self.targets.items():
+            values = (goal.target, goal.min, goal.max)
+            if name != "conversion" and any(v is not None and v <= 0 for v in values):
+                raise ValueError(f"{name} target and bounds must be positive")
+        for name, value in self.fixed.items():
+            col = INPUT_FIELDS.index(name)
+            if not INPUT_LOWER[col] <= value <= INPUT_UPPER[col]:
+                raise ValueError(
+                    f"fixed {name} outside [{INPUT_LOWER[col]:g}, {INPUT_UPPER[col]:g}]"
+                )
+        return self
+
+
+class InverseDesignSolution(BaseModel):
+    inputs: PredictionRequest
+    prediction: PredictionResponse
+    objective: float = Field(..., description="Weighted target mismatch.")
+    feasible: bool = Field(..., description="All min/max bounds are met.")
+
+
+class InverseDesignResponse(BaseModel):
+    solutions: list[InverseDesignSolution]
+    feasible_count: int = Field(..., description="Distinct feasible recipes found.")
+    iterations: int
+    elapsed_ms: float
@@ -0,0 +1,22 @@
+"""Schemas for the ``/jobs`` background scoring endpoints."""
+
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class JobResponse(BaseModel):
+    id: str
+    model: str
+    status: Literal["queued", "running", "done", "failed", "cancelled"]
+    rows: int
+    rows_done: int
+    progress: float
+    error: str | None
+    # Unix timestamps in seconds.
+    created_at: float
+    started_at: float | None
+    finished_at: float | None
+    expires_at: float | None
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -51,7 +53,35 @@ class TimeSeriesRequest(BaseModel):
     temperature_k: float = Field(..., ge=323.0, le=363.0)
     time_start_s: float = Field(default=0.0, ge=0.0)
     time_end_s: float = Field(..., ge=1.2, le=35854.0)
-    time_steps: int = Field(default=100, ge=2, le=1000)
+    time_steps: int = Field(
+        default=100,
+        ge=2,
+        le=1000,
+        description="Number of time points; the maximum number with adaptive sampling.",
+    )
+    spacing: Literal["linear", "log"] = Field(
+        default="linear",
+        description=(
+            "Spacing of the time grid (the starting grid with adaptive sampling). "
+            "Log grids start at time_start_s and are geometric from there on."
+        ),
+    )
+    sampling: Literal["uniform", "adaptive"] = Field(
+        default="uniform",
+        description=(
+            "'adaptive' starts from a coarse grid and adds midpoints only where "
+            "linear interpolation misses the model by more than tolerance."
+        ),
+    )
+    tolerance: float = Field(
+        default=0.005,
+        gt=0.0,
+        le=1.0,
+        description=(
+            "Adaptive sampling: largest allowed interpolation error, as a fraction "
+            "of each output's range over the series."
+        ),
+    )
 
 
 class TimeSeriesData(BaseModel):
@@ -92,12 +122,50 @@ class CompareResponse(BaseModel):
     sa_pcinn: TimeSeriesData
 
 
+# Models returned side by side by /predict/compare, in CompareResponse field order.
+COMPARE_MODELS = tuple(name for name in CompareResponse.model_fields if name != "times")
+
+
+class EnsembleColumns(BaseModel):
+    conversion: list[float]
+    mn: list[float]
+    mw: list[float]
+    mz: list[float]
+    mz_plus_1: list[float]
+    mv: list[float]
+    dispersity: list[float]
+
+
+class EnsembleBatchResponse(BaseModel):
+    family: str
+    members: list[str] = Field(..., description="Fold models in the ensemble.")
+    mean: EnsembleColumns = Field(..., description="Per-row mean across members.")
+    std: EnsembleColumns = Field(
+        ..., description="Per-row population standard deviation across members."
+    )
+
+
+class EnsembleTimeSeriesResponse(EnsembleBatchResponse):
+    times: list[float] = Field(..., description="Time points [s].")
+
+
+class JacobianResponse(BaseModel):
+    space: str = Field(..., description="'physical' (served units) or 'raw' (heads).")
+    outputs: list[str] = Field(..., description="Row labels of each Jacobian.")
+    inputs: list[str] = Field(..., description="Column labels of each Jacobian.")
+    values: list[list[float]] = Field(..., description="(N, 6) outputs per point.")
+    jacobian: list[list[list[float]]] = Field(
+        ..., description="(N, 6, 5) d(output)/d(input) in physical input units."
+    )
+
+
 class HealthResponse(BaseModel):
     status: str
     models_loaded: int
     available_models: list[str]
     default_model: str
     pytorch_version: str
+    inference_engine: str
     fold: int
 
 
@@ -106,7 +174,8 @@ class ModelInfo(BaseModel):
     display_name: str
     description: str
     is_default: bool
-    final_test_loss: float
+    fold: int
+    final_test_loss: float | None
 
 
 class ModelsResponse(BaseModel):
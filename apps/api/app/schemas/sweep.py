@@ -0,0 +1,84 @@
+"""Schemas for ``/predict/sweep``: full-factorial grids described by their axes."""
+
+from __future__ import annotations
+
+import math
+from typing import Literal
+
+import numpy as np
+from pydantic import BaseModel, Field, model_validator
+
+from app.config import settings
+from app.schemas.validation import INPUT_FIELDS, INPUT_LOWER, INPUT_UPPER
+
+
+class SweepAxis(BaseModel):
+    start: float
+    stop: float
+    steps: int = Field(..., ge=1, le=settings.sweep_max_points)
+    spacing: Literal["linear", "log"] = "linear"
+
+    def values(self) -> np.ndarray:
+        if self.spacing == "log":
+            return np.geomspace(self.start, self.stop, self.steps)
+        return np.linspace(self.start, self.stop, self.steps)
+
+
+class SweepRequest(BaseModel):
+    """One axis or fixed value per input; the grid is their Cartesian product."""
+
+    m_molar: SweepAxis | float
+    s_molar: SweepAxis | float
+    i_molar: SweepAxis | float
+    temperature_k: SweepAxis | float
+    time_s: SweepAxis | float
+
+    @model_validator(mode="after")
+    def _check_axes(self) -> SweepRequest:
+        problems = []
+        for col, name in enumerate(INPUT_FIELDS):
+            axis = getattr(self, name)
+            ends = (axis.start, axis.stop) if isinstance(axis, SweepAxis) else (axis,)
+            if not all(INPUT_LOWER[col] <= end <= INPUT_UPPER[col] for end in ends):
+                problems.append(
+                    f"{name} outside [{INPUT_LOWER[col]:g}, {INPUT_UPPER[col]:g}]"
+                )
+        if problems:
+            raise ValueError("; ".join(problems))
+        if self.size > settings.sweep_max_points:
+            raise ValueError(
+                f"Grid has {self.size} points; at most {settings.sweep_max_points}"
+            )
+        return self
+
+    def axes(self) -> list[np.ndarray]:
+        """Grid values per input, in canonical input order."""
+        return [
+            axis.values() if isinstance(axis, SweepAxis) else np.array([axis])
+            for axis in (getattr(self, name) for name in INPUT_FIELDS)
+        ]
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return tuple(
+            axis.steps if isinstance(axis, SweepAxis) else 1
+            for axis in (getattr(self, name) for name in INPUT_FIELDS)
+        )
+
+    @property
+    def size(self) -> int:
+        return math.prod(self.shape)
+
+
+class SweepResponse(BaseModel):
+    shape: list[int] = Field(
+        ..., description="Grid shape; outputs are flattened in C (row-major) order."
+    )
+    axes: dict[str, list[float]] = Field(..., description="Grid values per input.")
+    conversion: list[float]
+    mn: list[float]
+    mw: list[float]
+    mz: list[float]
+    mz_plus_1: list[float]
+    mv: list[float]
+    dispersity: list[float]
@@ -0,0 +1,90 @@
+"""Vectorized range checks for (N, 5) input matrices.
+
+The bounds are read from the ``ge``/``le`` constraints declared on
+``PredictionRequest`` so array-based endpoints enforce exactly the same domain as
+the per-row schema. Errors use FastAPI's 422 ``detail`` layout, with the row
+index in ``loc``.
+"""
+
+from __future__ import annotations
+
+import math
+
+import annotated_types
+import numpy as np
+
+from app.schemas.prediction import PredictionRequest
+
+INPUT_FIELDS = ("m_molar", "s_molar", "i_molar", "temperature_k", "time_s")
+
+# Cap on reported errors so a bad million-row upload doesn't build a million dicts.
+MAX_REPORTED_ERRORS = 20
+
+
+def _field_bounds(name: str) -> tuple[float, float]:
+    lower, upper = -np.inf, np.inf
+    for constraint in PredictionRequest.model_fields[name].metadata:
+        if isinstance(constraint, annotated_types.Ge):
+            lower = float(constraint.ge)
+        elif isinstance(constraint, annotated_types.Le):
+            upper = float(constraint.le)
+    return lower, upper
+
+
+INPUT_LOWER, INPUT_UPPER = (
+    np.array(bounds) for bounds in zip(*(_field_bounds(name) for name in INPUT_FIELDS))
+)
+
+
+def sample_inputs(n: int, seed: int = 0) -> np.ndarray:
+    """(n, 5) inputs drawn uniformly from the PredictionRequest domain."""
+    rng = np.random.default_rng(seed)
+    return INPUT_LOWER + rng.random((n, len(INPUT_FIELDS))) * (INPUT_UPPER - INPUT_LOWER)
+
+
+def out_of_bounds_rows(inputs: np.ndarray) -> dict[str, np.ndarray]:
+    """Row indices of (N, 5) ``inputs`` outside the bounds, keyed by input field."""
+    bad = ~((inputs >= INPUT_LOWER) & (inputs <= INPUT_UPPER))
+    return {
+        INPUT_FIELDS[col]: np.flatnonzero(bad[:, col])
+        for col in np.flatnonzero(bad.any(axis=0))
+    }
+
+
+def bounds_errors(
+    inputs: np.ndarray, row_offset: int = 0, loc_prefix: tuple = ("body",)
+) -> list[dict]:
+    """Check (N, 5) raw inputs against the PredictionRequest bounds.
+
+    Returns FastAPI-style error dicts for the first ``MAX_REPORTED_ERRORS``
+    offending cells (NaN fails both bounds); an empty list means the matrix is valid.
+    Non-finite values are reported as ``finite_number`` errors with a string input.
+    """
+    too_low = ~(inputs >= INPUT_LOWER)
+    too_high = inputs > INPUT_UPPER
+    if not (too_low.any() or too_high.any()):
+        return []
+
+    errors = []
+    rows, cols = np.nonzero(too_low | too_high)
+    for row, col in zip(rows[:MAX_REPORTED_ERRORS], cols[:MAX_REPORTED_ERRORS]):
+        value = float(inputs[row, col])
+        if not math.isfinite(value):
+            # NaN and infinity are not valid JSON numbers; echo them as strings.
+            error_type, msg = "finite_number", "Input should be a finite number"
+            value = repr(value)
+        elif too_low[row, col]:
+            error_type, bound = "greater_than_equal", float(INPUT_LOWER[col])
+            msg = f"Input should be greater than or equal to {bound}"
+        else:
+            error_type, bound = "less_than_equal", float(INPUT_UPPER[col])
+            msg = f"Input should be less than or equal to {bound}"
+        errors.append(
+            {
+                "type": error_type,
+                "loc": [*loc_prefix, int(row) + row_offset, INPUT_FIELDS[col]],
+                "msg": msg,
+                "input": value,
+            }
+        )
+    return errors
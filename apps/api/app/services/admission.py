@@ -0,0 +1,219 @@
+"""Cost-based admission control for the prediction routes.
+
+Each request is charged for the work it puts in flight, rows per forward pass ×
+models, rather than counted as one request. Up to ``ADMISSION_MAX_COST`` units
+may run at once. Requests costing at most ``ADMISSION_INTERACTIVE_MAX_COST``
+units use the interactive lane and everything else uses the bulk lane. Bulk
+work may hold only ``ADMISSION_BULK_SHARE`` of the budget, so there is always
+headroom for interactive requests, and queued interactive requests are admitted
+before any queued bulk request.
+
+Each lane queues at most ``ADMISSION_QUEUE_DEPTH`` waiters in FIFO order. When
+the queue is full, a request is rejected at once with 429. A request still
+waiting after ``ADMISSION_QUEUE_TIMEOUT_S`` gets a 503. A request bigger than
+its lane's share is charged the whole share, so it runs alone rather than never.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from app.config import settings
+
+LANES = ("interactive", "bulk")
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = max(1, math.ceil(settings.admission_retry_after_s))
+
+
+@dataclass
+class Ticket:
+    lane: str
+    cost: int
+    wait_s: float
+
+
+@dataclass
+class _Waiter:
+    cost: int
+    future: asyncio.Future
+
+
+@dataclass
+class LaneStats:
+    admitted: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    queued_total: int = 0
+    queue_wait_total_s: float = 0.0
+    queue_wait_max_s: float = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.queued_total += 1
+        self.queue_wait_total_s += seconds
+        self.queue_wait_max_s = max(self.queue_wait_max_s, seconds)
+
+
+@dataclass
+class _Lane:
+    capacity: int
+    in_flight: int = 0
+    queue: deque[_Waiter] = field(default_factory=deque)
+    stats: LaneStats = field(default_factory=LaneStats)
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_cost: int | None = None,
+        bulk_share: float | None = None,
+        interactive_max_cost: int | None = None,
+        queue_depth: int | None = None,
+        queue_timeout_s: float | None = None,
+    ):
+        self.max_cost = max_cost or settings.admission_max_cost
+        share = bulk_share if bulk_share is not None else settings.admission_bulk_share
+        self.interactive_max_cost = (
+            interactive_max_cost or settings.admission_interactive_max_cost
+        )
+        self.queue_depth = (
+            queue_depth if queue_depth is not None else settings.admission_queue_depth
+        )
+        self.queue_timeout_s = (
+            queue_timeout_s
+            if queue_timeout_s is not None
+            else settings.admission_queue_timeout_s
+        )
+        self._lanes = {
+            "interactive": _Lane(self.max_cost),
+            "bulk": _Lane(max(1, int(self.max_cost * share))),
+        }
+
+    @property
+    def in_flight(self) -> int:
+        return sum(lane.in_flight for lane in self._lanes.values())
+
+    def lane_for(self, cost: int) -> str:
+        return "interactive" if cost <= self.interactive_max_cost else "bulk"
+
+    def _fits(self, name: str, cost: int) -> bool:
+        lane = self._lanes[name]
+        if self.in_flight + cost > self.max_cost:
+            return False
+        if name == "bulk":
+            return not self._lanes["interactive"].queue and (
+                lane.in_flight + cost <= lane.capacity
+            )
+        return True
+
+    def _dispatch(self) -> None:
+        """Admit queued waiters in lane-priority, then FIFO, order while they fit."""
+        for name in LANES:
+            lane = self._lanes[name]
+            while lane.queue and self._fits(name, lane.queue[0].cost):
+                waiter = lane.queue.popleft()
+                if waiter.future.done():  # cancelled, not yet removed by its task
+                    continue
+                lane.in_flight += waiter.cost
+                waiter.future.set_result(None)
+            if lane.queue:
+                # Head-of-line waits: nothing behind it (or in a lower lane) jumps it.
+                return
+
+    def _check_queue(self, name: str) -> None:
+        lane = self._lanes[name]
+        if len(lane.queue) >= self.queue_depth:
+            lane.stats.rejected += 1
+            raise AdmissionRejected(429, f"The {name} queue is full; retry later")
+
+    def check(self, cost: int) -> None:
+        """Raise ``AdmissionRejected`` if a request of ``cost`` would be rejected now."""
+        name = self.lane_for(cost)
+        if self._lanes[name].queue or not self._fits(name, cost):
+            self._check_queue(name)
+
+    async def acquire(self, cost: int, reject: bool = True) -> Ticket:
+        """Wait until ``cost`` units fit in the budget and reserve them.
+
+        With ``reject=False`` the call skips the queue-depth and timeout checks and
+        waits as long as it takes. Streams pass ``check`` once before responding,
+        then acquire each chunk this way so they never fail halfway through.
+        """
+        name = self.lane_for(cost)
+        lane = self._lanes[name]
+        cost = max(1, min(cost, lane.capacity))
+        if not lane.queue and self._fits(name, cost):
+            lane.in_flight += cost
+            lane.stats.admitted += 1
+            return Ticket(name, cost, 0.0)
+        if reject:
+            self._check_queue(name)
+
+        start = time.perf_counter()
+        waiter = _Waiter(cost, asyncio.get_running_loop().create_future())
+        lane.queue.append(waiter)
+        try:
+            async with asyncio.timeout(self.queue_timeout_s if reject else None):
+                await waiter.future
+        except BaseException as exc:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted just as the wait ended: give the units back.
+                self._release(name, cost)
+            else:
+                waiter.future.cancel()
+                if waiter in lane.queue:
+                    lane.queue.remove(waiter)
+                self._dispatch()
+            if isinstance(exc, TimeoutError):
+                lane.stats.timed_out += 1
+                raise AdmissionRejected(
+                    503,
+                    f"Server busy: not admitted within {self.queue_timeout_s:g}s",
+                ) from None
+            raise
+        wait_s = time.perf_counter() - start
+        lane.stats.admitted += 1
+        lane.stats.record_wait(wait_s)
+        return Ticket(name, cost, wait_s)
+
+    def _release(self, name: str, cost: int) -> None:
+        self._lanes[name].in_flight -= cost
+        self._dispatch()
+
+    def release(self, ticket: Ticket) -> None:
+        self._release(ticket.lane, ticket.cost)
+
+    def stats(self) -> dict:
+        lanes = {}
+        for name, lane in self._lanes.items():
+            stats = lane.stats
+            lanes[name] = {
+                "capacity": lane.capacity,
+                "in_flight": lane.in_flight,
+                "queued": len(lane.queue),
+                "admitted": stats.admitted,
+                "rejected": stats.rejected,
+                "timed_out": stats.timed_out,
+                "mean_queue_wait_ms": (
+                    1000 * stats.queue_wait_total_s / stats.queued_total
+                    if stats.queued_total
+                    else 0.0
+                ),
+                "max_queue_wait_ms": 1000 * stats.queue_wait_max_s,
+            }
+        return {
+            "enabled": settings.admission_enabled,
+            "max_cost": self.max_cost,
+            "in_flight": self.in_flight,
+            "interactive_max_cost": self.interactive_max_cost,
+            "lanes": lanes,
+        }
@@ -0,0 +1,153 @@
+"""Micro-batching of concurrent single-point predictions.
+
+Each model gets one ``MicroBatcher``. Requests queue until either
+``max_batch_size`` rows are pending or ``max_wait_s`` has passed since the first
+one arrived; the whole queue then runs as a single (N, 5) forward pass and each
+caller receives its own row.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.config import settings
+from app.models.inference import ModelPredictor, columns_to_rows, predict_columns
+from app.services.executor import InferenceExecutor
+
+# Upper bounds of the batch-size histogram buckets; larger batches land in "+Inf".
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+@dataclass
+class BatcherStats:
+    requests: int = 0
+    batches: int = 0
+    max_batch_size: int = 0
+    queue_wait_total_s: float = 0.0
+    queue_wait_max_s: float = 0.0
+    batch_size_counts: list[int] = field(
+        default_factory=lambda: [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+    )
+
+    def record(self, batch_size: int, queue_waits: list[float]) -> None:
+        self.requests += batch_size
+        self.batches += 1
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        self.queue_wait_total_s += sum(queue_waits)
+        self.queue_wait_max_s = max(self.queue_wait_max_s, *queue_waits)
+        bucket = next(
+            (i for i, bound in enumerate(BATCH_SIZE_BUCKETS) if batch_size <= bound),
+            len(BATCH_SIZE_BUCKETS),
+        )
+        self.batch_size_counts[bucket] += 1
+
+    def as_dict(self) -> dict:
+        labels = [str(bound) for bound in BATCH_SIZE_BUCKETS] + ["+Inf"]
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "mean_queue_wait_ms": (
+                1000 * self.queue_wait_total_s / self.requests if self.requests else 0.0
+            ),
+            "max_queue_wait_ms": 1000 * self.queue_wait_max_s,
+            "batch_size_histogram": dict(zip(labels, self.batch_size_counts)),
+        }
+
+
+def _predict_rows(predictor: ModelPredictor, inputs: np.ndarray) -> list[dict]:
+    return columns_to_rows(predict_columns(predictor, inputs))
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        predictor: ModelPredictor,
+        max_batch_size: int | None = None,
+        max_wait_s: float | None = None,
+        executor: InferenceExecutor | None = None,
+    ):
+        self.predictor = predictor
+        self.executor = executor
+        self.max_batch_size = max_batch_size or settings.batch_max_size
+        self.max_wait_s = (
+            max_wait_s if max_wait_s is not None else settings.batch_max_wait_ms / 1000
+        )
+        self.stats = BatcherStats()
+        self._pending: list[tuple[np.ndarray, asyncio.Future, float]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, inputs: np.ndarray) -> dict:
+        """Queue one (5,) input row and wait for its prediction dict."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((inputs, future, time.perf_counter()))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_s, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Callers that were cancelled while queued are dropped from the batch.
+        batch = [item for item in self._pending if not item[1].done()]
+        self._pending = []
+        if not batch:
+            return
+
+        now = time.perf_counter()
+        self.stats.record(len(batch), [now - queued_at for _, _, queued_at in batch])
+        task = asyncio.ensure_future(self._run_batch(batch))
+        # Hold a reference so the task isn't garbage-collected mid-flight.
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[tuple[np.ndarray, asyncio.Future, float]]):
+        inputs = np.stack([x for x, _, _ in batch])
+        try:
+            if self.executor is not None:
+                rows = await self.executor.run(_predict_rows, self.predictor, inputs)
+            else:
+                rows = _predict_rows(self.predictor, inputs)
+        except Exception as exc:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future, _), row in zip(batch, rows):
+            if not future.done():
+                future.set_result(row)
+
+
+class BatcherPool:
+    """One ``MicroBatcher`` per model name, rebuilt if the predictor is replaced."""
+
+    def __init__(self, executor: InferenceExecutor | None = None):
+        self.executor = executor
+        self._batchers: dict[str, MicroBatcher] = {}
+
+    def get(self, name: str, predictor: ModelPredictor) -> MicroBatcher:
+        batcher = self._batchers.get(name)
+        if batcher is None or batcher.predictor is not predictor:
+            batcher = MicroBatcher(predictor, executor=self.executor)
+            self._batchers[name] = batcher
+        return batcher
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.batching_enabled,
+            "max_batch_size": settings.batch_max_size,
+            "max_wait_ms": settings.batch_max_wait_ms,
+            "models": {
+                name: batcher.stats.as_dict() for name, batcher in self._batchers.items()
+            },
+        }
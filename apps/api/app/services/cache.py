@@ -0,0 +1,102 @@
+"""In-process LRU cache of serialized prediction responses.
+
+Keys are ``(endpoint, models, values)`` where ``values`` are the request inputs
+and endpoint parameters rounded to ``significant_digits`` significant digits, so
+requests that differ only below that precision share an entry (and the response
+computed for the first of them). Entries hold the response body bytes and are
+evicted least-recently-used once either the entry or byte cap is exceeded.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+
+from app.config import settings
+
+CacheKey = tuple[str, tuple[str, ...], tuple[float, ...]]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class PredictionCache:
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        ttl_s: float | None = None,
+        significant_digits: int | None = None,
+    ):
+        self.max_entries = max_entries or settings.cache_max_entries
+        self.max_bytes = max_bytes or settings.cache_max_bytes
+        self.ttl_s = ttl_s if ttl_s is not None else settings.cache_ttl_s
+        self.significant_digits = significant_digits or settings.cache_significant_digits
+        self.stats = CacheStats()
+        self._entries: OrderedDict[CacheKey, tuple[bytes, float]] = OrderedDict()
+        self._bytes = 0
+
+    def key(
+        self, endpoint: str, models: tuple[str, ...], values: Iterable[float]
+    ) -> CacheKey:
+        digits = self.significant_digits
+        return endpoint, models, tuple(float(f"{v:.{digits}g}") for v in values)
+
+    def get(self, key: CacheKey) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        content, expires_at = entry
+        if expires_at and time.monotonic() >= expires_at:
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return content
+
+    def put(self, key: CacheKey, content: bytes) -> None:
+        if len(content) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.monotonic() + self.ttl_s if self.ttl_s else 0.0
+        self._entries[key] = (content, expires_at)
+        self._bytes += len(content)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def invalidate(self, model: str | None = None) -> int:
+        """Drop every entry, or only those involving ``model``. Returns the count."""
+        keys = [k for k in self._entries if model is None or model in k[1]]
+        for key in keys:
+            self._remove(key)
+        self.stats.invalidations += len(keys)
+        return len(keys)
+
+    def _remove(self, key: CacheKey) -> None:
+        content, _ = self._entries.pop(key)
+        self._bytes -= len(content)
+
+    def as_dict(self) -> dict:
+        lookups = self.stats.hits + self.stats.misses
+        return {
+            "enabled": settings.cache_enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hit_rate": self.stats.hits / lookups if lookups else 0.0,
+            **asdict(self.stats),
+        }
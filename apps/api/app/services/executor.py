@@ -0,0 +1,100 @@
+"""Dedicated executor for CPU-bound inference.
+
+Prediction routes hand their forward passes to an ``InferenceExecutor`` so the
+uvicorn event loop stays free for ``/health`` and other in-flight requests. The
+default is a bounded thread pool (torch and BLAS release the GIL during matmuls);
+``INFERENCE_EXECUTOR=process`` switches to a process pool, which pickles the
+predictor and inputs on every call. Stage timings made in a worker process are
+sent back with the result and recorded in this process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import sys
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from app.config import settings
+from app.services import metrics, tracing
+
+T = TypeVar("T")
+
+
+def default_torch_threads(workers: int) -> int:
+    """Split the CPU cores between pool workers so they don't oversubscribe."""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def configure_torch_threads(threads: int) -> None:
+    # Only tune torch if the torch engine already imported it.
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads)
+
+
+class InferenceExecutor:
+    def __init__(
+        self,
+        kind: str | None = None,
+        max_workers: int | None = None,
+        torch_threads: int | None = None,
+    ):
+        self.kind = kind or settings.inference_executor
+        if self.kind not in ("thread", "process"):
+            raise ValueError(
+                f"Unknown inference executor '{self.kind}'. Expected 'thread' or 'process'"
+            )
+        self.max_workers = max_workers or settings.inference_workers
+        self.torch_threads = (
+            torch_threads
+            or settings.torch_intra_op_threads
+            or default_torch_threads(self.max_workers)
+        )
+        self._pool: Executor | None = None
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=configure_torch_threads,
+                    initargs=(self.torch_threads,),
+                )
+            else:
+                configure_torch_threads(self.torch_threads)
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="inference"
+                )
+        return self._pool
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in the pool and await its result."""
+        loop = asyncio.get_running_loop()
+        if self.kind == "process":
+            call = functools.partial(metrics.capture, fn, *args)
+            result, records = await loop.run_in_executor(self._get_pool(), call)
+            metrics.replay(records)
+            return result
+        trace = tracing.current()
+        if trace is not None and trace.profile:
+            fn = tracing.profiled(fn, trace)
+        # Threads don't inherit contextvars from run_in_executor; carry them over.
+        call = functools.partial(contextvars.copy_context().run, fn, *args)
+        return await loop.run_in_executor(self._get_pool(), call)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "torch_threads": self.torch_threads,
+        }
@@ -0,0 +1,346 @@
+"""Durable background scoring jobs for large uploads.
+
+Job metadata lives in SQLite (``jobs.sqlite3``) under ``JOBS_DIR``. Each job's
+inputs and results sit next to it as raw little-endian float64 files,
+``<id>.inputs.f8`` with shape (N, 5) and ``<id>.results.f8`` with shape (N, 13).
+
+Workers claim queued jobs with an atomic UPDATE and score them
+``JOB_CHUNK_ROWS`` at a time on their own executor, so interactive requests
+keep the main inference pool to themselves. After each chunk is appended to
+the results file, ``rows_done`` is committed. A job interrupted by a restart
+therefore resumes from its last chunk. A running job whose heartbeat is older
+than ``JOB_STALE_S`` is treated as abandoned and reclaimed, which also lets
+several API processes share one jobs directory. Finished jobs and their files
+are deleted ``JOB_TTL_S`` after they finish.
+
+``JobStore`` is synchronous: its commits are durable and ``expire`` deletes
+files. Everything that calls it from the event loop, and every read or write of
+the job files, goes through ``asyncio.to_thread`` or the job executor, so
+background jobs never stall interactive requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import AsyncIterator, Iterator, Mapping
+from typing import BinaryIO
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from app.config import settings
+from app.models.inference import (
+    OUTPUT_FIELDS,
+    ModelPredictor,
+    columns_to_matrix,
+    predict_columns,
+)
+from app.schemas.validation import INPUT_FIELDS
+from app.services.executor import InferenceExecutor
+from app.services.npy import INPUT_DTYPE, OUTPUT_COLUMNS
+
+JOB_STATES = ("queued", "running", "done", "failed", "cancelled")
+FINISHED_STATES = ("done", "failed", "cancelled")
+INPUT_ROW_BYTES = len(INPUT_FIELDS) * INPUT_DTYPE.itemsize
+RESULT_ROW_BYTES = len(OUTPUT_COLUMNS) * INPUT_DTYPE.itemsize
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    status TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    rows_done INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class Job:
+    id: str
+    model: str
+    status: str
+    rows: int
+    rows_done: int
+    error: str | None
+    created_at: float
+    started_at: float | None
+    finished_at: float | None
+    updated_at: float
+
+    def as_dict(self) -> dict:
+        expires_at = self.finished_at + settings.job_ttl_s if self.finished_at else None
+        return {
+            **asdict(self),
+            "progress": self.rows_done / self.rows if self.rows else 1.0,
+            "expires_at": expires_at,
+        }
+
+
+class JobStore:
+    def __init__(self, directory: str | None = None):
+        self.directory = directory or settings.jobs_dir
+        os.makedirs(self.directory, exist_ok=True)
+        # Autocommit: each statement is its own transaction, so claim() is atomic
+        # even when several processes share the database.
+        self._db = sqlite3.connect(
+            os.path.join(self.directory, "jobs.sqlite3"),
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(_SCHEMA)
+
+    def inputs_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.inputs.f8")
+
+    def results_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.results.f8")
+
+    def new_id(self) -> str:
+        return uuid.uuid4().hex
+
+    def create(self, job_id: str, model: str) -> Job:
+        """Register a job whose inputs file has been fully written."""
+        rows = os.path.getsize(self.inputs_path(job_id)) // INPUT_ROW_BYTES
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, model, status, rows, created_at, updated_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, model, rows, now, now),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return Job(**row) if row else None
+
+    def claim(self) -> Job | None:
+        """Atomically move the oldest queued (or abandoned running) job to running."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "UPDATE jobs SET status = 'running', updated_at = ?, "
+                "started_at = COALESCE(started_at, ?) "
+                "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' "
+                "OR (status = 'running' AND updated_at < ?) "
+                "ORDER BY created_at LIMIT 1) RETURNING *",
+                (now, now, now - settings.job_stale_s),
+            ).fetchone()
+        return Job(**row) if row else None
+
+    def progress(self, job_id: str, rows_done: int) -> str:
+        """Record progress and heartbeat; returns the job's status (to see cancels)."""
+        with self._lock:
+            row = self._db.execute(
+                "UPDATE jobs SET rows_done = ?, updated_at = ? WHERE id = ? "
+                "RETURNING status",
+                (rows_done, time.time(), job_id),
+            ).fetchone()
+        return row["status"] if row else "cancelled"
+
+    def finish(self, job_id: str, status: str, error: str | None = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'running'",
+                (status, error, now, now, job_id),
+            )
+
+    def requeue(self, job_id: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = 'queued' WHERE id = ? AND status = 'running'",
+                (job_id,),
+            )
+
+    def cancel(self, job_id: str) -> Job | None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ?, updated_at = ? "
+                "WHERE id = ? AND status IN ('queued', 'running')",
+                (now, now, job_id),
+            )
+        return self.get(job_id)
+
+    def expire(self) -> int:
+        """Delete jobs that finished more than ``JOB_TTL_S`` ago, with their files."""
+        with self._lock:
+            rows = self._db.execute(
+                "DELETE FROM jobs WHERE finished_at < ? RETURNING id",
+                (time.time() - settings.job_ttl_s,),
+            ).fetchall()
+        for row in rows:
+            self.remove_files(row["id"])
+        return len(rows)
+
+    def remove_files(self, job_id: str) -> None:
+        for path in (self.inputs_path(job_id), self.results_path(job_id)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+async def write_inputs(
+    store: JobStore, job_id: str, chunks: AsyncIterator[np.ndarray]
+) -> int:
+    """Write validated (rows, 5) chunks to the job's inputs file; returns rows written."""
+    rows = 0
+    f = await asyncio.to_thread(open, store.inputs_path(job_id), "wb")
+    try:
+        async for inputs in chunks:
+            data = np.ascontiguousarray(inputs, dtype=INPUT_DTYPE).tobytes()
+            await asyncio.to_thread(f.write, data)
+            rows += len(inputs)
+    finally:
+        await asyncio.to_thread(f.close)
+    return rows
+
+
+def _score_chunk(predictor: ModelPredictor, inputs: np.ndarray) -> bytes:
+    matrix = columns_to_matrix(predict_columns(predictor, inputs))
+    return np.ascontiguousarray(matrix, dtype=INPUT_DTYPE).tobytes()
+
+
+def _score_rows(
+    predictor: ModelPredictor, inputs: np.ndarray, start: int, stop: int, out: BinaryIO
+) -> None:
+    """Score ``inputs[start:stop]`` (memory-mapped) and append it to ``out``."""
+    out.write(_score_chunk(predictor, np.array(inputs[start:stop])))
+    out.flush()
+
+
+def _open_results(store: JobStore, job: Job) -> tuple[np.ndarray, BinaryIO]:
+    inputs = np.memmap(store.inputs_path(job.id), dtype=INPUT_DTYPE, mode="r")
+    out = open(store.results_path(job.id), "ab")
+    # Drop any chunk written after the last committed progress update.
+    out.truncate(job.rows_done * RESULT_ROW_BYTES)
+    return inputs.reshape(-1, len(INPUT_FIELDS)), out
+
+
+def read_results(
+    store: JobStore, job: Job, chunk_rows: int
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """(inputs, results) chunks of a finished job, read from its memory-mapped files."""
+    inputs = np.memmap(store.inputs_path(job.id), dtype=INPUT_DTYPE, mode="r")
+    results = np.memmap(store.results_path(job.id), dtype=INPUT_DTYPE, mode="r")
+    inputs = inputs.reshape(-1, len(INPUT_FIELDS))
+    results = results.reshape(-1, len(OUTPUT_COLUMNS))
+    for start in range(0, job.rows, chunk_rows):
+        yield inputs[start : start + chunk_rows], results[start : start + chunk_rows]
+
+
+def matrix_columns(results: np.ndarray) -> dict[str, np.ndarray]:
+    """Inverse of ``columns_to_matrix`` for stored (N, 13) result rows."""
+    columns = {name: results[:, i] for i, name in enumerate(OUTPUT_FIELDS)}
+    columns["raw_outputs"] = results[:, len(OUTPUT_FIELDS) :]
+    return columns
+
+
+class JobRunner:
+    """Background workers that score queued jobs on a dedicated executor.
+
+    Workers start on first use in the running event loop (and restart if that
+    loop changes), so they also work under test clients that skip the lifespan.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        predictors: Mapping[str, ModelPredictor],
+        executor: InferenceExecutor | None = None,
+        workers: int | None = None,
+    ):
+        self.store = store
+        self.predictors = predictors
+        self.workers = workers or settings.job_workers
+        self.executor = executor or InferenceExecutor("thread", self.workers)
+        self._tasks: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    def ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    def notify(self) -> None:
+        self.ensure_started()
+        self._wakeup.set()
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.executor.shutdown()
+
+    async def _work(self) -> None:
+        while True:
+            job = await asyncio.to_thread(self.store.claim)
+            if job is not None:
+                await self.run(job)
+                continue
+            await asyncio.to_thread(self.store.expire)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=settings.job_poll_interval_s
+                )
+            except TimeoutError:
+                pass
+
+    async def run(self, job: Job) -> None:
+        store = self.store
+        try:
+            # Loading a model blocks, so it happens on the executor too.
+            predictor = await self.executor.run(self.predictors.__getitem__, job.model)
+            inputs, out = await self.executor.run(_open_results, store, job)
+            try:
+                for start in range(job.rows_done, job.rows, settings.job_chunk_rows):
+                    stop = min(start + settings.job_chunk_rows, job.rows)
+                    await self.executor.run(
+                        _score_rows, predictor, inputs, start, stop, out
+                    )
+                    status = await asyncio.to_thread(store.progress, job.id, stop)
+                    if status != "running":
+                        return
+            finally:
+                await asyncio.to_thread(out.close)
+        except asyncio.CancelledError:
+            # Shutdown: resume from the last committed chunk on the next start.
+            # Called directly, since a second cancellation could skip a thread hop.
+            store.requeue(job.id)
+            raise
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            await asyncio.to_thread(store.finish, job.id, "failed", error)
+            return
+        await asyncio.to_thread(store.finish, job.id, "done")
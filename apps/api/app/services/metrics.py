@@ -0,0 +1,221 @@
+"""In-process metrics, rendered in the Prometheus text exposition format.
+
+Histograms are module-level singletons. Each label set gets its child the
+first time it is seen; the child holds preallocated bucket counts, so recording
+on the ``predict()`` hot path is one lock, a ``bisect`` and a few float adds with
+no per-call allocation. ``render`` walks every histogram at scrape time, and
+routes append cache, batcher and registry stats read at scrape time with
+``sample_lines``.
+
+Stage histograms split serving time into validation, scaling, forward,
+postprocess and serialization. A stage may be timed more than once per request
+(e.g. one forward pass per model), so compare ``_sum`` between stages rather
+than ``_count``.
+
+Work run in a process pool records into the worker's own histograms, which are
+never scraped. ``InferenceExecutor`` therefore runs those calls under
+``capture``. It collects the stage and row observations and returns them with
+the result, and ``replay`` records them in the API process and the request's
+trace.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, TypeVar
+
+from app.services import tracing
+
+T = TypeVar("T")
+
+# Histogram upper bounds in seconds (or rows); larger values land in "+Inf".
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+STAGE_BUCKETS = (
+    1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 0.01, 0.05, 0.25, 1
+)
+ROWS_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 1024, 4096, 16384, 65536, 262144)
+
+STAGES = ("validation", "scaling", "forward", "postprocess", "serialization")
+
+
+class _HistogramChild:
+    __slots__ = ("_lock", "bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._lock = threading.Lock()
+        self.bounds = bounds
+        # counts[i] holds observations in (bounds[i - 1], bounds[i]]; the last is +Inf.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        bucket = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[bucket] += 1
+            self.sum += value
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._children: dict[tuple, _HistogramChild] = {}
+        self._lock = threading.Lock()
+        _HISTOGRAMS.append(self)
+
+    def labels(self, *values) -> _HistogramChild:
+        """The child for these label values (converted with ``str`` when rendered)."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} takes labels {self.label_names}")
+            with self._lock:
+                child = self._children.setdefault(values, _HistogramChild(self.buckets))
+        return child
+
+    def _label_text(self, values: tuple, extra: str = "") -> str:
+        pairs = [f'{k}="{_escape(v)}"' for k, v in zip(self.label_names, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = 'le="' + (bound if bound == "+Inf" else _number(bound)) + '"'
+                lines.append(
+                    f"{self.name}_bucket{self._label_text(values, le)} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{self._label_text(values)} {_number(total)}")
+            lines.append(f"{self.name}_count{self._label_text(values)} {cumulative}")
+        return lines
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+_HISTOGRAMS: list[Histogram] = []
+
+REQUEST_SECONDS = Histogram(
+    "pcinn_http_request_duration_seconds",
+    "HTTP request latency by route template, method and status code.",
+    ("route", "method", "status"),
+)
+STAGE_SECONDS = Histogram(
+    "pcinn_stage_duration_seconds",
+    "Time spent in each serving stage.",
+    ("stage",),
+    STAGE_BUCKETS,
+)
+MODEL_BATCH_ROWS = Histogram(
+    "pcinn_model_batch_rows",
+    "Rows per forward pass; _count is the number of calls per model.",
+    ("model", "fold"),
+    ROWS_BUCKETS,
+)
+
+_STAGE_CHILDREN = {stage: STAGE_SECONDS.labels(stage) for stage in STAGES}
+
+# Observations collected by ``capture`` instead of being recorded here.
+_captured: contextvars.ContextVar[list[tuple] | None] = contextvars.ContextVar(
+    "captured_metrics", default=None
+)
+
+
+def capture(fn: Callable[..., T], *args: Any) -> tuple[T, list[tuple]]:
+    """``fn(*args)`` and the observations it made, for ``replay`` elsewhere."""
+    records: list[tuple] = []
+    token = _captured.set(records)
+    try:
+        return fn(*args), records
+    finally:
+        _captured.reset(token)
+
+
+def replay(records: Iterable[tuple]) -> None:
+    """Record observations collected by ``capture`` (in another process)."""
+    for kind, *values in records:
+        if kind == "stage":
+            record_stage(*values)
+        else:
+            record_batch_rows(*values)
+
+
+def record_stage(stage: str, seconds: float, model: str | None = None) -> None:
+    """Observe a stage duration, and add it to the request's trace if it has one."""
+    captured = _captured.get()
+    if captured is not None:
+        captured.append(("stage", stage, seconds, model))
+        return
+    _STAGE_CHILDREN[stage].observe(seconds)
+    trace = tracing.current()
+    if trace is not None:
+        trace.add(stage, seconds, model)
+
+
+def record_inference(
+    model: str,
+    fold: int,
+    rows: int,
+    start: float,
+    scaled: float,
+    forwarded: float,
+    end: float,
+) -> None:
+    """Record one ``predict_columns`` call from ``time.perf_counter`` marks."""
+    record_stage("scaling", scaled - start, model)
+    record_stage("forward", forwarded - scaled, model)
+    record_stage("postprocess", end - forwarded, model)
+    record_batch_rows(model, fold, rows)
+
+
+def record_batch_rows(model: str, fold: int, rows: int) -> None:
+    captured = _captured.get()
+    if captured is not None:
+        captured.append(("rows", model, fold, rows))
+        return
+    MODEL_BATCH_ROWS.labels(model, fold).observe(rows)
+
+
+def sample_lines(
+    name: str,
+    help: str,
+    samples: Iterable[tuple[dict[str, object], float]],
+    kind: str = "gauge",
+) -> list[str]:
+    """Exposition lines for a gauge or counter read from other stats at scrape time."""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+        selector = f"{name}{{{text}}}" if text else name
+        lines.append(f"{selector} {_number(value)}")
+    return lines
+
+
+def render(extra_lines: Iterable[str] = ()) -> str:
+    lines = [line for histogram in _HISTOGRAMS for line in histogram.render()]
+    lines.extend(extra_lines)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,162 @@
+"""``.npy`` wire format for machine-to-machine batch scoring.
+
+Requests carry a little-endian float64 (N, 5) matrix in the canonical input
+column order. Responses are an (N, 13) float64 matrix whose column names are sent
+in the ``X-Columns`` header.
+
+``read_header`` parses the header from the first bytes of the request stream, so
+the caller can check the row count before any of the payload arrives.
+``read_payload`` then receives the body straight into one preallocated buffer and
+returns an ``np.frombuffer`` view of it, so the matrix reaches ``predict()``
+without further copies. Uploads too large to hold at once are read in
+fixed-size chunks with ``iter_rows``.
+"""
+
+from __future__ import annotations
+
+import io
+import math
+import struct
+from collections.abc import AsyncIterator
+
+import numpy as np
+
+from app.models.inference import OUTPUT_FIELDS, RAW_OUTPUT_FIELDS
+from app.schemas.validation import INPUT_FIELDS
+
+NPY_MEDIA_TYPE = "application/x-npy"
+INPUT_DTYPE = np.dtype("<f8")
+OUTPUT_COLUMNS = OUTPUT_FIELDS + RAW_OUTPUT_FIELDS
+
+
+class NpyFormatError(ValueError):
+    pass
+
+
+def _read_header(header: io.BytesIO) -> tuple[int, ...]:
+    """Shape of the validated (N, 5) ``<f8`` array whose header starts ``header``."""
+    try:
+        version = np.lib.format.read_magic(header)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(header)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(header)
+    except ValueError as exc:
+        raise NpyFormatError(f"invalid .npy payload: {exc}") from exc
+
+    if dtype != INPUT_DTYPE:
+        raise NpyFormatError(f"expected dtype <f8 (little-endian float64), got {dtype.str}")
+    if fortran_order:
+        raise NpyFormatError("expected a C-ordered array")
+    if len(shape) != 2 or shape[1] != len(INPUT_FIELDS):
+        raise NpyFormatError(
+            f"expected shape (N, {len(INPUT_FIELDS)}) with columns "
+            f"{', '.join(INPUT_FIELDS)}, got {shape}"
+        )
+    return shape
+
+
+# Magic string and version, then the header length: 2 bytes in v1, 4 in v2 and v3.
+_PREAMBLE_BYTES = 8
+# Matches numpy's own limit on the header it will parse.
+MAX_HEADER_BYTES = 10_000
+
+
+async def _fill(stream: AsyncIterator[bytes], buffer: bytearray, size: int) -> None:
+    while len(buffer) < size:
+        try:
+            buffer += await anext(stream)
+        except StopAsyncIteration:
+            raise NpyFormatError("payload ends inside the .npy header") from None
+
+
+async def read_header(
+    stream: AsyncIterator[bytes],
+) -> tuple[tuple[int, ...], bytearray]:
+    """Shape of a streamed ``.npy`` upload and the payload bytes read past its header.
+
+    Only the header is consumed from ``stream``; the payload is left for
+    ``iter_rows``.
+    """
+    buffer = bytearray()
+    await _fill(stream, buffer, _PREAMBLE_BYTES)
+    if buffer[:6] != np.lib.format.MAGIC_PREFIX:
+        raise NpyFormatError("invalid .npy payload: missing magic string")
+    if buffer[6] == 1:
+        await _fill(stream, buffer, _PREAMBLE_BYTES + 2)
+        (length,) = struct.unpack("<H", buffer[8:10])
+        end = _PREAMBLE_BYTES + 2 + length
+    else:
+        await _fill(stream, buffer, _PREAMBLE_BYTES + 4)
+        (length,) = struct.unpack("<I", buffer[8:12])
+        end = _PREAMBLE_BYTES + 4 + length
+    if length > MAX_HEADER_BYTES:
+        raise NpyFormatError(f".npy header is longer than {MAX_HEADER_BYTES} bytes")
+    await _fill(stream, buffer, end)
+    shape = _read_header(io.BytesIO(bytes(buffer[:end])))
+    return shape, buffer[end:]
+
+
+async def read_payload(
+    stream: AsyncIterator[bytes], shape: tuple[int, ...], buffer: bytearray
+) -> np.ndarray:
+    """The whole payload after ``read_header``, as an (N, 5) view of one buffer."""
+    payload = bytearray(math.prod(shape) * INPUT_DTYPE.itemsize)
+    filled = 0
+    data = bytes(buffer)
+    with memoryview(payload) as view:
+        while True:
+            if filled + len(data) > len(payload):
+                raise NpyFormatError("payload length does not match the .npy header")
+            view[filled : filled + len(data)] = data
+            filled += len(data)
+            try:
+                data = await anext(stream)
+            except StopAsyncIteration:
+                break
+    if filled != len(payload):
+        raise NpyFormatError("payload length does not match the .npy header")
+    return np.frombuffer(payload, dtype=INPUT_DTYPE).reshape(shape)
+
+
+async def iter_rows(
+    stream: AsyncIterator[bytes],
+    shape: tuple[int, ...],
+    buffer: bytearray,
+    chunk_rows: int,
+) -> AsyncIterator[np.ndarray]:
+    """(rows, 5) chunks of the payload after ``read_header``, as the bytes arrive."""
+    row_bytes = shape[1] * INPUT_DTYPE.itemsize
+    chunk_bytes = chunk_rows * row_bytes
+    remaining = shape[0] * row_bytes
+    buffer = bytearray(buffer)
+    while True:
+        while remaining and len(buffer) >= min(chunk_bytes, remaining):
+            size = min(chunk_bytes, remaining)
+            count = size // INPUT_DTYPE.itemsize
+            chunk = np.frombuffer(buffer, dtype=INPUT_DTYPE, count=count).copy()
+            del buffer[:size]
+            remaining -= size
+            yield chunk.reshape(-1, shape[1])
+        if len(buffer) > remaining:
+            break
+        try:
+            buffer += await anext(stream)
+        except StopAsyncIteration:
+            break
+    if remaining or buffer:
+        raise NpyFormatError("payload length does not match the .npy header")
+
+
+def encode_outputs(matrix: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, np.ascontiguousarray(matrix, dtype=INPUT_DTYPE), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def encode_header(shape: tuple[int, ...]) -> bytes:
+    """``.npy`` header for a C-ordered ``<f8`` array; rows are streamed after it."""
+    buffer = io.BytesIO()
+    header = {"descr": INPUT_DTYPE.str, "fortran_order": False, "shape": shape}
+    np.lib.format.write_array_header_1_0(buffer, header)
+    return buffer.getvalue()
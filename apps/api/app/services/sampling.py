@@ -0,0 +1,107 @@
+"""Time grids for the time-series endpoints, uniform or adaptively refined.
+
+Adaptive sampling starts from a coarse grid of ``ADAPTIVE_INITIAL_STEPS``
+points. Each round evaluates the midpoints of the candidate intervals as one
+batch and compares every output with the linear interpolation between the
+interval's ends. The error is measured as a fraction of that output's range over
+the series. Intervals where some output misses by more than the tolerance are
+split, and both halves become candidates for the next round. Refinement stops
+when no interval exceeds the tolerance or ``max_points`` is reached. Every
+evaluated point is returned, so the number of times equals the number of model
+evaluations.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+
+from app.models.inference import OUTPUT_FIELDS
+
+# Log grids from t = 0 put their first nonzero point at this fraction of the span.
+LOG_FIRST_FRACTION = 1e-3
+# Outputs with a tiny range are judged against this fraction of their magnitude.
+MIN_SCALE_FRACTION = 1e-3
+
+Series = dict[str, dict[str, np.ndarray]]
+
+
+def time_grid(
+    start: float, end: float, steps: int, spacing: str = "linear"
+) -> np.ndarray:
+    if spacing != "log":
+        return np.linspace(start, end, steps)
+    if start > 0:
+        return np.geomspace(start, end, steps)
+    if steps <= 2:
+        # No room for a first nonzero point: keep both ends.
+        return np.linspace(start, end, steps)
+    first = start + LOG_FIRST_FRACTION * (end - start)
+    return np.concatenate([[start], np.geomspace(first, end, steps - 1)])
+
+
+def _features(series: Series) -> np.ndarray:
+    """(N, outputs) matrix of the served outputs of every group in ``series``."""
+    return np.column_stack(
+        [
+            columns[name]
+            for columns in series.values()
+            for name in OUTPUT_FIELDS
+            if name in columns
+        ]
+    )
+
+
+def _scale(values: np.ndarray) -> np.ndarray:
+    floor = MIN_SCALE_FRACTION * np.abs(values).max(axis=0)
+    scale = np.maximum(np.ptp(values, axis=0), floor)
+    return np.where(scale > 0, scale, 1.0)
+
+
+def refine(
+    evaluate: Callable[[np.ndarray], Series],
+    grid: np.ndarray,
+    max_points: int,
+    tolerance: float,
+) -> tuple[np.ndarray, Series]:
+    """Sorted times and the merged ``evaluate`` output at each of them."""
+    results = [evaluate(grid)]
+    times = np.asarray(grid, dtype=np.float64)
+    values = _features(results[0])
+    left = np.arange(len(times) - 1)
+    right = left + 1
+    # Interval priority when the point budget cannot cover every candidate.
+    priority = np.full(len(left), np.inf)
+
+    while len(left) and len(times) < max_points:
+        budget = max_points - len(times)
+        if len(left) > budget:
+            keep = np.sort(np.argsort(-priority, kind="stable")[:budget])
+            left, right, priority = left[keep], right[keep], priority[keep]
+        mids = (times[left] + times[right]) / 2
+        result = evaluate(mids)
+        mid_values = _features(result)
+        results.append(result)
+        new = np.arange(len(times), len(times) + len(mids))
+        times = np.concatenate([times, mids])
+        values = np.concatenate([values, mid_values])
+
+        interpolated = (values[left] + values[right]) / 2
+        error = (np.abs(mid_values - interpolated) / _scale(values)).max(axis=1)
+        split = error > tolerance
+        left, right = (
+            np.concatenate([left[split], new[split]]),
+            np.concatenate([new[split], right[split]]),
+        )
+        priority = np.tile(error[split], 2)
+
+    order = np.argsort(times, kind="stable")
+    merged = {
+        group: {
+            name: np.concatenate([result[group][name] for result in results])[order]
+            for name in columns
+        }
+        for group, columns in results[0].items()
+    }
+    return times[order], merged
@@ -0,0 +1,74 @@
+"""Single-flight de-duplication of identical concurrent computations.
+
+The first caller for a key starts the computation as its own task, and callers
+that arrive with the same key while it runs await that task instead of
+starting another. All of them get the same serialized bytes, or the same
+exception. The key is forgotten as soon as the task finishes, so nothing is
+cached here; ``PredictionCache`` does that.
+
+A caller that is cancelled (for example, because its client disconnected)
+only stops waiting. The computation is cancelled only when every caller
+waiting on it has gone.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import asdict, dataclass
+
+
+@dataclass
+class SingleFlightStats:
+    leaders: int = 0  # computations started
+    shared: int = 0  # callers served by another caller's computation
+    errors: int = 0  # computations that raised
+    cancelled: int = 0  # computations abandoned by all their callers
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self.stats = SingleFlightStats()
+        self._flights: dict[Hashable, _Flight] = {}
+
+    async def do(
+        self, key: Hashable, compute: Callable[[], Awaitable[bytes]]
+    ) -> tuple[bytes, bool]:
+        """``compute()``'s result and whether it came from another caller's flight."""
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(compute()))
+            self._flights[key] = flight
+            self.stats.leaders += 1
+            flight.task.add_done_callback(lambda task: self._finish(key, task))
+        else:
+            self.stats.shared += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                flight.task.cancel()
+                # Callers arriving before the task unwinds start a new flight.
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        flight = self._flights.get(key)
+        if flight is not None and flight.task is task:
+            del self._flights[key]
+        if task.cancelled():
+            self.stats.cancelled += 1
+        elif task.exception() is not None:
+            self.stats.errors += 1
+
+    def as_dict(self) -> dict:
+        return {**asdict(self.stats), "in_flight": len(self._flights)}
@@ -0,0 +1,215 @@
+"""Chunked NDJSON/CSV parsing and encoding for ``/predict/stream``.
+
+Input arrives as an async iterator of body bytes and is turned into (offset,
+(rows, 5) array) chunks of at most ``chunk_rows`` rows, so memory is bounded by
+the chunk size rather than the upload size. NDJSON lines may be objects with the
+canonical ``m_molar,s_molar,i_molar,temperature_k,time_s`` keys or 5-element
+arrays; CSV needs a header row naming those columns (any order, extras ignored).
+A line longer than ``max_line_bytes`` is rejected without being buffered in full.
+Lines are split on the event loop, but callers can pass their executor's ``run``
+so the chunks are parsed in its pool.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+import numpy as np
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.config import settings
+from app.models.inference import (
+    OUTPUT_FIELDS,
+    RAW_OUTPUT_FIELDS,
+    columns_to_matrix,
+    columns_to_rows,
+)
+from app.schemas.validation import INPUT_FIELDS
+
+NDJSON = "ndjson"
+CSV = "csv"
+
+MEDIA_TYPES = {NDJSON: "application/x-ndjson", CSV: "text/csv"}
+
+CSV_HEADER = (",".join(OUTPUT_FIELDS + RAW_OUTPUT_FIELDS) + "\n").encode()
+# For responses whose rows also carry their inputs (see ``encode_chunk``).
+CSV_HEADER_WITH_INPUTS = (
+    ",".join(INPUT_FIELDS + OUTPUT_FIELDS + RAW_OUTPUT_FIELDS) + "\n"
+).encode()
+
+
+class StreamInputError(ValueError):
+    def __init__(self, row: int, msg: str):
+        super().__init__(f"row {row}: {msg}")
+        self.row = row
+        self.msg = msg
+
+    def __reduce__(self):
+        # Chunks may be parsed in a process pool; rebuild from (row, msg).
+        return type(self), (self.row, self.msg)
+
+    def detail(self) -> list[dict]:
+        return [{"type": "value_error", "loc": ["body", self.row], "msg": self.msg}]
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """Streams output while the handler is still reading the request body.
+
+    For pre-2.4 ASGI servers ``StreamingResponse`` runs a disconnect listener that
+    consumes ``receive()`` messages, swallowing body chunks the handler has not
+    read yet. This variant streams directly, as ``StreamingResponse`` already
+    does on ASGI 2.4 servers.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError as exc:
+            raise ClientDisconnect() from exc
+        if self.background is not None:
+            await self.background()
+
+
+def format_from_media_type(media_type: str | None) -> str | None:
+    media_type = (media_type or "").split(";")[0].strip().lower()
+    for fmt, known in MEDIA_TYPES.items():
+        if media_type == known:
+            return fmt
+    if media_type == "application/jsonl":
+        return NDJSON
+    return None
+
+
+class _LineTooLong(ValueError):
+    pass
+
+
+async def _iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if len(line) > max_line_bytes:
+                raise _LineTooLong
+            if line.strip():
+                yield line
+        if len(buffer) > max_line_bytes:
+            raise _LineTooLong
+    if buffer.strip():
+        yield buffer
+
+
+def _parse_ndjson(lines: list[bytes], offset: int) -> np.ndarray:
+    inputs = np.empty((len(lines), len(INPUT_FIELDS)))
+    for i, line in enumerate(lines):
+        try:
+            record = json.loads(line)
+            if isinstance(record, dict):
+                record = [record[name] for name in INPUT_FIELDS]
+            if len(record) != len(INPUT_FIELDS):
+                raise ValueError(f"expected {len(INPUT_FIELDS)} values")
+            inputs[i] = record
+        except KeyError as exc:
+            raise StreamInputError(offset + i, f"missing field {exc.args[0]!r}") from exc
+        except (TypeError, ValueError) as exc:
+            raise StreamInputError(offset + i, f"invalid NDJSON record: {exc}") from exc
+    return inputs
+
+
+def _csv_columns(header: bytes) -> list[int]:
+    names = [name.strip().lower() for name in header.decode().split(",")]
+    missing = [name for name in INPUT_FIELDS if name not in names]
+    if missing:
+        raise StreamInputError(0, f"CSV header is missing columns: {', '.join(missing)}")
+    return [names.index(name) for name in INPUT_FIELDS]
+
+
+def _parse_csv(lines: list[bytes], offset: int, columns: list[int]) -> np.ndarray:
+    try:
+        return np.loadtxt(
+            [line.decode() for line in lines],
+            delimiter=",",
+            usecols=columns,
+            ndmin=2,
+        )
+    except ValueError as exc:
+        raise StreamInputError(offset, f"invalid CSV in rows starting here: {exc}") from exc
+
+
+def _parse(
+    lines: list[bytes], offset: int, fmt: str, columns: list[int] | None
+) -> np.ndarray:
+    if fmt == CSV:
+        return _parse_csv(lines, offset, columns)
+    return _parse_ndjson(lines, offset)
+
+
+async def _parse_here(fn: Callable[..., np.ndarray], *args: Any) -> np.ndarray:
+    return fn(*args)
+
+
+async def iter_input_chunks(
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+    chunk_rows: int,
+    run: Callable[..., Awaitable[np.ndarray]] = _parse_here,
+    max_line_bytes: int | None = None,
+) -> AsyncIterator[tuple[int, np.ndarray]]:
+    """Yield ``(first_row_index, inputs)`` with inputs of shape (<= chunk_rows, 5).
+
+    Each chunk is parsed by ``run(fn, *args)``, for example
+    ``InferenceExecutor.run``. The default parses it inline.
+    """
+    max_line_bytes = max_line_bytes or settings.stream_max_line_bytes
+    columns: list[int] | None = None
+    pending: list[bytes] = []
+    offset = 0
+    try:
+        async for line in _iter_lines(chunks, max_line_bytes):
+            if fmt == CSV and columns is None:
+                columns = _csv_columns(line)
+                continue
+            pending.append(line)
+            if len(pending) >= chunk_rows:
+                yield offset, await run(_parse, pending, offset, fmt, columns)
+                offset += len(pending)
+                pending = []
+    except _LineTooLong:
+        raise StreamInputError(
+            offset + len(pending), f"line is longer than {max_line_bytes} bytes"
+        ) from None
+    if pending:
+        yield offset, await run(_parse, pending, offset, fmt, columns)
+
+
+def encode_chunk(
+    columns: dict[str, np.ndarray], fmt: str, inputs: np.ndarray | None = None
+) -> bytes:
+    """Encode results as NDJSON or CSV rows, prefixed by ``inputs`` when given."""
+    if fmt == CSV:
+        matrix = columns_to_matrix(columns)
+        if inputs is not None:
+            matrix = np.column_stack([inputs, matrix])
+        rows = matrix.tolist()
+        return "".join(",".join(map(repr, row)) + "\n" for row in rows).encode()
+    records = columns_to_rows(columns)
+    if inputs is not None:
+        records = [
+            {**dict(zip(INPUT_FIELDS, values)), **record}
+            for values, record in zip(inputs.tolist(), records)
+        ]
+    return "".join(json.dumps(record) + "\n" for record in records).encode()
+
+
+def encode_error(detail: list[dict], fmt: str) -> bytes:
+    """In-band error record for failures after the response has started."""
+    if fmt == CSV:
+        return f"# error: {json.dumps(detail)}\n".encode()
+    return (json.dumps({"error": detail}) + "\n").encode()
@@ -0,0 +1,27 @@
+"""Lazy full-factorial grids for ``/predict/sweep``.
+
+A grid is one array of values per input. Point ``i`` is located with
+``np.unravel_index`` on the C-ordered grid shape, so any row range can be built
+from its indices alone and the full (N, 5) input matrix is never materialized.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+
+import numpy as np
+
+
+def grid_shape(axes: Sequence[np.ndarray]) -> tuple[int, ...]:
+    return tuple(len(axis) for axis in axes)
+
+
+def grid_chunk(axes: Sequence[np.ndarray], start: int, stop: int) -> np.ndarray:
+    """(stop - start, 5) inputs for grid rows ``start:stop`` in C order."""
+    coords = np.unravel_index(np.arange(start, stop), grid_shape(axes))
+    return np.column_stack([axis[index] for axis, index in zip(axes, coords)])
+
+
+def chunk_ranges(size: int, chunk_rows: int) -> Iterator[tuple[int, int]]:
+    for start in range(0, size, chunk_rows):
+        yield start, min(start + chunk_rows, size)
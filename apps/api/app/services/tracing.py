@@ -0,0 +1,184 @@
+"""Per-request stage timings for ``Server-Timing`` and the opt-in profiler.
+
+A ``RequestTrace`` is installed in a context variable for requests that ask for
+one, and the stage recorders in ``app.services.metrics`` append to it as well as
+to the global histograms. ``InferenceExecutor`` copies the context into its
+worker threads, so forward passes run off the event loop are still attributed to
+the request that queued them. With ``profile`` set, each executor call runs under
+its own ``cProfile.Profile``; the merged stats are kept in a small in-memory
+store and served by id. Only the executor work is profiled, because coroutines
+of other requests interleave with this one on the event loop thread.
+
+The profiler's scope is process-wide: only one ``cProfile.Profile`` can be
+active in the interpreter at a time, and while it runs it also records calls
+made by other threads. Profiled calls therefore take ``_PROFILE_LOCK`` without
+waiting. A call that finds another profile running runs unprofiled and is
+counted in the summary as skipped. It neither fails nor waits.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import contextvars
+import io
+import itertools
+import pstats
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from app.config import settings
+
+T = TypeVar("T")
+
+
+@dataclass
+class RequestTrace:
+    profile: bool = False
+    start: float = field(default_factory=time.perf_counter)
+    # (stage, model or None, seconds or None, description or None), in record order.
+    entries: list[tuple[str, str | None, float | None, str | None]] = field(
+        default_factory=list
+    )
+    stats: pstats.Stats | None = None
+    # Executor calls that ran unprofiled because another profile was active.
+    skipped: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(
+        self,
+        stage: str,
+        seconds: float | None,
+        model: str | None = None,
+        description: str | None = None,
+    ) -> None:
+        self.entries.append((stage, model, seconds, description))
+
+    def add_profile(self, profiler: cProfile.Profile) -> None:
+        with self._lock:
+            if self.stats is None:
+                self.stats = pstats.Stats(profiler)
+            else:
+                self.stats.add(profiler)
+
+    def skip_profile(self) -> None:
+        with self._lock:
+            self.skipped += 1
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` value: summed durations per stage (and model), plus total."""
+        totals: dict[str, float | None] = {}
+        descriptions: dict[str, str] = {}
+        for stage, model, seconds, description in self.entries:
+            name = f"{stage}.{model}" if model else stage
+            if seconds is None:
+                totals.setdefault(name, None)
+            else:
+                totals[name] = (totals.get(name) or 0.0) + seconds
+            if description:
+                descriptions[name] = description
+        totals["total"] = time.perf_counter() - self.start
+        parts = []
+        for name, seconds in totals.items():
+            part = _token(name)
+            if seconds is not None:
+                part += f";dur={1000 * seconds:.3f}"
+            if name in descriptions:
+                part += ';desc="' + descriptions[name].replace('"', "'") + '"'
+            parts.append(part)
+        return ", ".join(parts)
+
+
+def _token(name: str) -> str:
+    # Server-Timing metric names are HTTP tokens; model names already are.
+    return "".join(c if c.isalnum() or c in "-_.+" else "_" for c in name)
+
+
+_current: contextvars.ContextVar[RequestTrace | None] = contextvars.ContextVar(
+    "request_trace", default=None
+)
+
+
+def current() -> RequestTrace | None:
+    return _current.get()
+
+
+def begin(profile: bool = False) -> tuple[RequestTrace, contextvars.Token]:
+    trace = RequestTrace(profile=profile)
+    return trace, _current.set(trace)
+
+
+def end(token: contextvars.Token) -> None:
+    _current.reset(token)
+
+
+_PROFILE_LOCK = threading.Lock()
+
+
+def profiled(fn: Callable[..., T], trace: RequestTrace) -> Callable[..., T]:
+    """``fn`` run under its own cProfile, merged into ``trace`` when it returns.
+
+    If another profile is active anywhere in the process, ``fn`` runs unprofiled.
+    """
+
+    def call(*args: Any) -> T:
+        if not _PROFILE_LOCK.acquire(blocking=False):
+            trace.skip_profile()
+            return fn(*args)
+        try:
+            profiler = cProfile.Profile()
+            try:
+                return profiler.runcall(fn, *args)
+            finally:
+                trace.add_profile(profiler)
+        finally:
+            _PROFILE_LOCK.release()
+
+    return call
+
+
+def authorized(token: str | None) -> bool:
+    return bool(settings.profiling_token) and token == settings.profiling_token
+
+
+class ProfileStore:
+    """The most recent ``profile_store_size`` profile summaries, by id."""
+
+    def __init__(self, max_entries: int | None = None):
+        self.max_entries = max_entries or settings.profile_store_size
+        self._profiles: OrderedDict[str, str] = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def reserve(self) -> str:
+        """An id for a profile that is stored once its request finishes."""
+        return str(next(self._ids))
+
+    def put(self, profile_id: str, trace: RequestTrace, request_line: str) -> None:
+        stream = io.StringIO()
+        stream.write(f"{request_line}\nServer-Timing: {trace.server_timing()}\n")
+        if trace.skipped:
+            stream.write(
+                f"{trace.skipped} executor call(s) ran unprofiled because another "
+                "profile was active.\n"
+            )
+        if trace.stats is None:
+            stream.write("\nNo executor work was profiled.\n")
+        else:
+            trace.stats.stream = stream
+            trace.stats.sort_stats("cumulative").print_stats(
+                settings.profile_top_functions
+            )
+        with self._lock:
+            self._profiles[profile_id] = stream.getvalue()
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> str | None:
+        return self._profiles.get(profile_id)
+
+
+PROFILES = ProfileStore()
@@ -0,0 +1,53 @@
+"""Load-time optimisation (scaler folding, TorchScript) vs. the unoptimised path.
+
+Run from apps/api: ``python -m benchmarks.bench_optimize``
+
+Per-call latency of ``predict_columns`` at several batch sizes, plus the first
+call after loading with and without warmup.
+"""
+
+import time
+
+from app.models.inference import load_model, predict_columns
+from app.models.optimize import compile_model, fold_scaler, warmup
+from app.schemas.validation import sample_inputs
+from benchmarks.bench_stacked import _best_of
+
+SIZES = (1, 64, 1024, 10_000)
+WARMUP_SIZES = (1, 64, 1024)
+ARTIFACT = "artifacts/sa_pcinn_fold8_bundle.safetensors"
+
+
+def _variants(engine: str) -> dict:
+    base = load_model(ARTIFACT, engine=engine, precision="mixed")
+    variants = {"unoptimised": base, "folded": fold_scaler(base)}
+    if engine == "torch":
+        variants["folded+trace"] = compile_model(variants["folded"], "trace")
+    return variants
+
+
+def _first_call_ms(engine: str, warm: bool) -> float:
+    predictor = fold_scaler(load_model(ARTIFACT, engine=engine, precision="mixed"))
+    if warm:
+        warmup(predictor, WARMUP_SIZES)
+    inputs = sample_inputs(64, seed=1)
+    start = time.perf_counter()
+    predict_columns(predictor, inputs)
+    return 1000 * (time.perf_counter() - start)
+
+
+def main() -> None:
+    for engine in ("torch", "numpy"):
+        variants = _variants(engine)
+        print(f"engine={engine}")
+        print(f"{'rows':>8} " + " ".join(f"{name + ' ms':>17}" for name in variants))
+        for n in SIZES:
+            x = sample_inputs(n)
+            timings = [_best_of(lambda: predict_columns(p, x)) for p in variants.values()]
+            print(f"{n:>8} " + " ".join(f"{1000 * t:>17.4f}" for t in timings))
+        cold, warm = _first_call_ms(engine, False), _first_call_ms(engine, True)
+        print(f"first 64-row call: cold {cold:.3f} ms, after warmup {warm:.3f} ms\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Fused StackedPredictor vs. the sequential per-model loop used before it.
+
+Run from apps/api: ``python -m benchmarks.bench_stacked``
+"""
+
+import timeit
+
+import numpy as np
+
+from app.models.inference import predict_columns
+from app.models.registry import ModelRegistry
+from app.models.stacked import StackedPredictor
+
+SIZES = (1, 20, 100, 1000, 10_000)
+
+
+def _inputs(n: int) -> np.ndarray:
+    lo = np.array([0.5, 5.0, 0.005, 323.0, 1.2])
+    hi = np.array([5.0, 9.5, 0.1, 363.0, 35854.0])
+    return lo + np.random.default_rng(0).random((n, 5)) * (hi - lo)
+
+
+def _best_of(fn, repeat: int = 5) -> float:
+    number = max(1, int(0.2 / max(timeit.timeit(fn, number=1), 1e-6)))
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    for engine in ("torch", "numpy"):
+        predictors = dict(ModelRegistry(engine=engine))
+        stacked = StackedPredictor.from_predictors(predictors)
+        print(f"engine={engine}")
+        print(f"{'rows':>8} {'sequential ms':>14} {'stacked ms':>11} {'speedup':>8}")
+        for n in SIZES:
+            x = _inputs(n)
+            sequential = _best_of(lambda: [predict_columns(p, x) for p in predictors.values()])
+            fused = _best_of(lambda: stacked.predict_columns(x))
+            print(
+                f"{n:>8} {1000 * sequential:>14.3f} {1000 * fused:>11.3f} "
+                f"{sequential / fused:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
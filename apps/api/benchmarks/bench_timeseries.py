@@ -0,0 +1,37 @@
+"""Time-series fast path vs. tiling the recipe into a (steps, 5) input matrix.
+
+Run from apps/api: ``python -m benchmarks.bench_timeseries``
+"""
+
+import numpy as np
+
+from app.models.inference import load_model, predict_columns
+from app.models.stacked import StackedPredictor
+from benchmarks.bench_stacked import _best_of
+
+STEPS = (100, 1000, 10_000, 100_000)
+RECIPE = np.array([3.326, 6.674, 0.0246, 333.0])
+
+
+def main() -> None:
+    predictor = load_model("artifacts/sa_pcinn_fold8_bundle.pt", engine="numpy")
+    stacked = StackedPredictor.from_predictors({"sa_pcinn": predictor})
+    print(f"{'steps':>8} {'tiled ms':>10} {'fast path ms':>13} {'speedup':>8}")
+    for steps in STEPS:
+        times = np.linspace(1.2, 35854.0, steps)
+
+        def tiled():
+            inputs = np.tile(np.append(RECIPE, 0.0), (steps, 1))
+            inputs[:, 4] = times
+            return predict_columns(predictor, inputs)
+
+        baseline = _best_of(tiled)
+        fast = _best_of(lambda: stacked.predict_timeseries_columns(RECIPE, times))
+        print(
+            f"{steps:>8} {1000 * baseline:>10.3f} {1000 * fast:>13.3f} "
+            f"{baseline / fast:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""Offline inference benchmark suite with a JSON baseline and regression check.
+
+Run from apps/api::
+
+    python -m benchmarks.suite run --output benchmarks/baseline.json
+    python -m benchmarks.suite compare benchmarks/baseline.json --threshold 0.25
+
+Cases cover ``predict()`` at 1 to 100k rows, the time-series engine at 100 to
+100k steps, the three-model compare engine, and end-to-end requests through
+``app.main:app`` with an in-process ASGI client (response cache off). Each case
+records p50/p99 latency, throughput in rows per second and peak traced memory
+(``tracemalloc``, which sees NumPy buffers but not torch's allocator).
+``compare`` re-runs the suite and exits 1 when a case's p50 latency or peak
+memory exceeds the baseline by more than the threshold.
+
+Engine cases load their models through ``ModelRegistry``, so they measure the
+predictors the API serves under the current engine, precision, scaler folding
+and compile settings. The settings are recorded with the results.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from importlib.metadata import PackageNotFoundError, version
+
+import numpy as np
+
+from app.config import settings
+from app.models.inference import predict
+from app.models.registry import ModelRegistry
+from app.models.stacked import StackedPredictor
+from app.schemas.prediction import COMPARE_MODELS
+from app.schemas.validation import INPUT_FIELDS, sample_inputs
+
+BATCH_SIZES = (1, 100, 1000, 10_000, 100_000)
+TIMESERIES_STEPS = (100, 1000, 10_000, 100_000)
+COMPARE_STEPS = (100, 1000)
+RECIPE = np.array([3.326, 6.674, 0.0246, 333.0])
+
+# Sampling stops at MAX_SAMPLES calls or after TIME_BUDGET_S, but not before MIN_SAMPLES.
+MIN_SAMPLES = 5
+MAX_SAMPLES = 200
+TIME_BUDGET_S = 1.0
+
+
+@dataclass
+class CaseResult:
+    rows: int
+    samples: int
+    p50_ms: float
+    p99_ms: float
+    rows_per_s: float
+    peak_memory_mb: float
+
+
+def _summarize(rows: int, latencies: list[float], peak_bytes: int) -> CaseResult:
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return CaseResult(
+        rows=rows,
+        samples=len(latencies),
+        p50_ms=1000 * float(p50),
+        p99_ms=1000 * float(p99),
+        rows_per_s=rows / float(np.mean(latencies)),
+        peak_memory_mb=peak_bytes / 2**20,
+    )
+
+
+def _enough(latencies: list[float], started: float) -> bool:
+    if len(latencies) < MIN_SAMPLES:
+        return False
+    return len(latencies) >= MAX_SAMPLES or time.perf_counter() - started > TIME_BUDGET_S
+
+
+def measure(fn: Callable[[], object], rows: int) -> CaseResult:
+    fn()  # warm caches and lazy initialisation
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies: list[float] = []
+    started = time.perf_counter()
+    while not _enough(latencies, started):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return _summarize(rows, latencies, peak)
+
+
+async def ameasure(fn: Callable[[], Awaitable[object]], rows: int) -> CaseResult:
+    await fn()
+    tracemalloc.start()
+    await fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies: list[float] = []
+    started = time.perf_counter()
+    while not _enough(latencies, started):
+        start = time.perf_counter()
+        await fn()
+        latencies.append(time.perf_counter() - start)
+    return _summarize(rows, latencies, peak)
+
+
+def serving_predictors() -> ModelRegistry:
+    """The registry the API would build, with its load-time optimisations."""
+    return ModelRegistry()
+
+
+def _engine_cases(quick: bool) -> dict[str, CaseResult]:
+    predictors = serving_predictors()
+    predictor = predictors["sa_pcinn"]
+    single = StackedPredictor.from_predictors({"sa_pcinn": predictor})
+    compare = StackedPredictor.from_predictors({n: predictors[n] for n in COMPARE_MODELS})
+    results = {}
+    for n in BATCH_SIZES[:-1] if quick else BATCH_SIZES:
+        x = sample_inputs(n)
+        results[f"predict/{n}"] = measure(lambda: predict(predictor, x), n)
+    for steps in TIMESERIES_STEPS[:-1] if quick else TIMESERIES_STEPS:
+        times = np.linspace(1.2, 35854.0, steps)
+        results[f"timeseries/{steps}"] = measure(
+            lambda: single.predict_timeseries_columns(RECIPE, times), steps
+        )
+    for steps in COMPARE_STEPS:
+        times = np.linspace(1.2, 35854.0, steps)
+        results[f"compare/{steps}"] = measure(
+            lambda: compare.predict_timeseries_columns(RECIPE, times), steps
+        )
+    return results
+
+
+async def _asgi_cases() -> dict[str, CaseResult]:
+    from httpx import ASGITransport, AsyncClient
+
+    from app.main import app
+
+    point = dict(zip(INPUT_FIELDS, sample_inputs(1)[0].tolist()))
+    batch = {"inputs": [dict(zip(INPUT_FIELDS, row)) for row in sample_inputs(100).tolist()]}
+    series = {**dict(zip(INPUT_FIELDS[:4], RECIPE.tolist())), "time_end_s": 35854.0}
+    requests = {
+        "asgi/predict": ("/api/v1/predict", point, 1),
+        "asgi/predict_batch/100": ("/api/v1/predict/batch", batch, 100),
+        "asgi/timeseries/100": ("/api/v1/predict/timeseries", series, 100),
+        "asgi/compare/100": ("/api/v1/predict/compare", series, 100),
+    }
+
+    results = {}
+    transport = ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, (path, body, rows) in requests.items():
+
+                async def call(path=path, body=body):
+                    response = await client.post(path, json=body)
+                    response.raise_for_status()
+
+                results[name] = await ameasure(call, rows)
+    return results
+
+
+def _package_version(name: str) -> str | None:
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def run_suite(quick: bool = False, include_asgi: bool = True) -> dict:
+    cache_enabled = settings.cache_enabled
+    settings.cache_enabled = False
+    try:
+        cases = _engine_cases(quick)
+        if include_asgi:
+            cases.update(asyncio.run(_asgi_cases()))
+    finally:
+        settings.cache_enabled = cache_enabled
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "numpy": np.__version__,
+            "torch": _package_version("torch"),
+            "inference_engine": settings.inference_engine,
+            "inference_precision": settings.inference_precision,
+            "model_precisions": settings.model_precisions,
+            "fold_scaler": settings.fold_scaler,
+            "torch_compile": settings.torch_compile,
+        },
+        "cases": {name: asdict(result) for name, result in cases.items()},
+    }
+
+
+def compare_results(
+    baseline: dict, current: dict, threshold: float, memory_threshold: float
+) -> list[str]:
+    """Regression messages for cases present in both runs; empty means pass."""
+    regressions = []
+    for name, base in baseline["cases"].items():
+        now = current["cases"].get(name)
+        if now is None:
+            continue
+        if now["p50_ms"] > base["p50_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p50 {now['p50_ms']:.3f} ms vs baseline {base['p50_ms']:.3f} ms"
+            )
+        if now["peak_memory_mb"] > base["peak_memory_mb"] * (1 + memory_threshold):
+            regressions.append(
+                f"{name}: peak memory {now['peak_memory_mb']:.2f} MiB vs baseline "
+                f"{base['peak_memory_mb']:.2f} MiB"
+            )
+    return regressions
+
+
+def _print_table(results: dict, baseline: dict | None = None) -> None:
+    print(f"{'case':<26} {'p50 ms':>10} {'p99 ms':>10} {'rows/s':>12} {'peak MiB':>9} {'Δp50':>7}")
+    for name, case in results["cases"].items():
+        delta = ""
+        if baseline and name in baseline["cases"]:
+            delta = f"{case['p50_ms'] / baseline['cases'][name]['p50_ms'] - 1:+.0%}"
+        print(
+            f"{name:<26} {case['p50_ms']:>10.3f} {case['p99_ms']:>10.3f} "
+            f"{case['rows_per_s']:>12.4g} {case['peak_memory_mb']:>9.2f} {delta:>7}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="run the suite and write a JSON baseline")
+    run.add_argument("--output", default="benchmarks/baseline.json")
+    check = commands.add_parser("compare", help="run the suite and compare to a baseline")
+    check.add_argument("baseline")
+    check.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed p50 slowdown (0.25 = 25%%)"
+    )
+    check.add_argument("--memory-threshold", type=float, default=0.25)
+    check.add_argument("--output", help="also write this run's results here")
+    for command in (run, check):
+        command.add_argument("--quick", action="store_true", help="skip the 100k cases")
+        command.add_argument("--no-asgi", action="store_true", help="engine cases only")
+    args = parser.parse_args(argv)
+
+    results = run_suite(quick=args.quick, include_asgi=not args.no_asgi)
+    if args.command == "run" or args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.command == "run":
+        _print_table(results)
+        print(f"\nwrote {args.output}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    _print_table(results, baseline)
+    regressions = compare_results(
+        baseline, results, args.threshold, args.memory_threshold
+    )
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,18 +1,50 @@
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from app.config import settings
 from app.main import app
-from app.models.inference import load_all_models
+from app.models.registry import ModelRegistry
+from app.services.admission import AdmissionController
+from app.services.batcher import BatcherPool
+from app.services.cache import PredictionCache
+from app.services.executor import InferenceExecutor
+from app.services.jobs import JobRunner, JobStore
+from app.services.singleflight import SingleFlight
 
 DEFAULT_MODEL = "sa_pcinn"
 
+# Tolerances in the tests assume the default serving path, whatever the
+# environment sets; tests that cover other engines and precisions ask for them.
+settings.inference_engine = "torch"
+settings.inference_precision = "mixed"
+settings.model_precisions = ""
+
 
 @pytest.fixture(scope="session", autouse=True)
-def _load_models():
+def _load_models(tmp_path_factory):
     """Load models into app state once for all tests."""
-    app.state.predictors = load_all_models()
+    app.state.predictors = ModelRegistry()
+    app.state.predictors.preload(settings.registry_preload.split(","))
     app.state.default_model = DEFAULT_MODEL
+    app.state.executor = InferenceExecutor()
+    app.state.batchers = BatcherPool(app.state.executor)
+    app.state.cache = PredictionCache()
+    app.state.admission = AdmissionController()
+    app.state.single_flight = SingleFlight()
+    app.state.predictors.on_reload(app.state.cache.invalidate)
+    app.state.jobs = JobRunner(
+        JobStore(str(tmp_path_factory.mktemp("jobs"))), app.state.predictors
+    )
     yield
+    app.state.jobs.executor.shutdown()
+    app.state.jobs.store.close()
+    del app.state.jobs
+    del app.state.single_flight
+    del app.state.admission
+    del app.state.cache
+    del app.state.batchers
+    app.state.executor.shutdown()
+    del app.state.executor
     del app.state.predictors
 
 
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from app.main import app
+from app.services.admission import AdmissionController, AdmissionRejected
+
+BATCH = [
+    {
+        "m_molar": 3.326,
+        "s_molar": 6.674,
+        "i_molar": 0.0246,
+        "temperature_k": 333.0,
+        "time_s": 600.0 * (i + 1),
+    }
+    for i in range(20)
+]
+
+
+def _controller(**kwargs) -> AdmissionController:
+    options = dict(
+        max_cost=10,
+        bulk_share=0.5,
+        interactive_max_cost=2,
+        queue_depth=1,
+        queue_timeout_s=5.0,
+    )
+    return AdmissionController(**{**options, **kwargs})
+
+
+@pytest.mark.asyncio
+async def test_bulk_lane_is_capped_and_rejects_when_its_queue_is_full():
+    admission = _controller()
+    first = await admission.acquire(5)
+    assert first.lane == "bulk"
+    waiting = asyncio.create_task(admission.acquire(4))
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejected) as exc:
+        await admission.acquire(3)
+    assert exc.value.status_code == 429
+    assert exc.value.retry_after >= 1
+
+    # Bulk holds half the budget, so interactive work is still admitted at once.
+    interactive = await admission.acquire(1)
+    assert interactive.lane == "interactive" and interactive.wait_s == 0.0
+
+    admission.release(first)
+    second = await waiting
+    assert second.wait_s > 0
+    stats = admission.stats()["lanes"]["bulk"]
+    assert stats["rejected"] == 1 and stats["in_flight"] == 4
+
+
+@pytest.mark.asyncio
+async def test_queued_interactive_requests_go_before_queued_bulk():
+    admission = _controller(queue_depth=4)
+    held = [await admission.acquire(2) for _ in range(5)]
+    bulk = asyncio.create_task(admission.acquire(3))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(admission.acquire(2))
+    await asyncio.sleep(0)
+
+    admission.release(held.pop())
+    await asyncio.sleep(0)
+    assert interactive.done() and not bulk.done()
+    admission.release(held.pop())
+    admission.release(held.pop())
+    assert (await bulk).lane == "bulk"
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_and_cancellation_free_the_slot():
+    admission = _controller(queue_timeout_s=0.01)
+    held = [await admission.acquire(2) for _ in range(5)]
+    with pytest.raises(AdmissionRejected) as exc:
+        await admission.acquire(1)
+    assert exc.value.status_code == 503
+
+    cancelled = asyncio.create_task(admission.acquire(1, reject=False))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.gather(cancelled, return_exceptions=True)
+    for ticket in held:
+        admission.release(ticket)
+    stats = admission.stats()
+    assert stats["in_flight"] == 0
+    assert stats["lanes"]["interactive"]["queued"] == 0
+    assert stats["lanes"]["interactive"]["timed_out"] == 1
+
+
+@pytest.mark.asyncio
+async def test_overloaded_bulk_route_returns_429_but_single_predictions_pass(
+    client, monkeypatch
+):
+    admission = _controller(max_cost=100, interactive_max_cost=1, queue_depth=0)
+    monkeypatch.setattr(app.state, "admission", admission)
+    held = await admission.acquire(50)  # the whole bulk share
+
+    r = await client.post("/api/v1/predict/batch", json={"inputs": BATCH})
+    assert r.status_code == 429
+    assert r.headers["retry-after"] == "1"
+    r = await client.post("/api/v1/predict", json={**BATCH[0], "time_s": 1234.5})
+    assert r.status_code == 200
+
+    admission.release(held)
+    r = await client.post("/api/v1/predict/batch", json={"inputs": BATCH})
+    assert r.status_code == 200
+    stats = (await client.get("/api/v1/stats")).json()["admission"]
+    assert stats["lanes"]["bulk"]["rejected"] == 1
+    assert stats["in_flight"] == 0
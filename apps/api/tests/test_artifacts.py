@@ -0,0 +1,87 @@
+import shutil
+
+import numpy as np
+import pytest
+
+from app.models.artifacts import load_safetensors, read_bundle, save_safetensors
+from app.models.convert import convert_bundle, main, max_abs_difference
+from app.models.inference import load_model, predict_columns
+from app.models.numpy_engine import NUMPY_ENGINE_ATOL, NumpyMLP
+from app.models.registry import ModelRegistry
+from app.schemas.validation import sample_inputs
+
+
+def test_safetensors_round_trip_is_read_only_mmap(tmp_path):
+    path = str(tmp_path / "t.safetensors")
+    arrays = {
+        "a": np.arange(6, dtype=np.float32).reshape(2, 3),
+        "b": np.array([1.5, 2.5], dtype=np.float64),
+    }
+    save_safetensors(path, arrays, {"k": "v"})
+
+    tensors, metadata = load_safetensors(path)
+
+    assert metadata == {"k": "v"}
+    for name, array in arrays.items():
+        np.testing.assert_array_equal(tensors[name], array)
+        assert tensors[name].dtype == array.dtype
+        assert not tensors[name].flags.writeable
+        assert isinstance(tensors[name].base, np.memmap)
+
+
+def test_rewriting_a_mapped_artifact_leaves_existing_views_intact(tmp_path):
+    path = str(tmp_path / "t.safetensors")
+    save_safetensors(path, {"a": np.zeros(1024, dtype=np.float32)}, {})
+    old, _ = load_safetensors(path)
+
+    save_safetensors(path, {"a": np.ones(8, dtype=np.float32)}, {})
+
+    assert old["a"].sum() == 0  # still readable: the old inode stays mapped
+    new, _ = load_safetensors(path)
+    np.testing.assert_array_equal(new["a"], np.ones(8, dtype=np.float32))
+    assert [p.name for p in tmp_path.iterdir()] == ["t.safetensors"]
+
+
+def test_convert_bundle_preserves_model(tmp_path):
+    source = "artifacts/pcinn_fold8_bundle.pt"
+    target = convert_bundle(source, str(tmp_path))
+
+    assert target.endswith("pcinn_fold8_bundle.safetensors")
+    assert max_abs_difference(source, target) <= NUMPY_ENGINE_ATOL
+    original, converted = read_bundle(source), read_bundle(target)
+    for key in ("model_name", "fold", "final_test_loss", "is_best"):
+        assert converted[key] == original[key]
+
+
+@pytest.mark.parametrize("engine", ["torch", "numpy"])
+def test_load_model_from_safetensors(engine):
+    p = load_model("artifacts/sa_pcinn_fold8_bundle.safetensors", engine=engine)
+    assert p.model_name == "sa_pcinn"
+    assert p.fold == 8
+    assert p.is_best is True
+    if engine == "numpy":
+        assert isinstance(p.model, NumpyMLP)
+    inputs = sample_inputs(64)
+    reference = load_model("artifacts/sa_pcinn_fold8_bundle.pt", engine="torch")
+    np.testing.assert_allclose(
+        predict_columns(p, inputs)["raw_outputs"],
+        predict_columns(reference, inputs)["raw_outputs"],
+        rtol=0,
+        atol=NUMPY_ENGINE_ATOL,
+    )
+
+
+def test_registry_prefers_safetensors(tmp_path):
+    for name in ("baseline_nn", "pcinn", "sa_pcinn"):
+        shutil.copy(f"artifacts/{name}_fold8_bundle.pt", tmp_path)
+        convert_bundle(f"artifacts/{name}_fold8_bundle.pt", str(tmp_path))
+    registry = ModelRegistry(str(tmp_path), engine="numpy")
+    assert set(registry) == {"baseline_nn", "pcinn", "sa_pcinn"}
+    assert all(registry.entry(name).path.endswith(".safetensors") for name in registry)
+
+
+def test_convert_cli(tmp_path, capsys):
+    argv = ["artifacts/baseline_nn_fold8_bundle.pt", "--output-dir", str(tmp_path)]
+    assert main(argv) == 0
+    assert (tmp_path / "baseline_nn_fold8_bundle.safetensors").exists()
+    assert "ok" in capsys.readouterr().out
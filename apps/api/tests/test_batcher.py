@@ -0,0 +1,58 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.models.inference import load_model, predict
+from app.services.batcher import MicroBatcher
+
+INPUT = np.array([3.326, 6.674, 0.0246, 333.0, 7200.0])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submits_share_one_batch():
+    p = load_model("artifacts/sa_pcinn_fold8_bundle.pt")
+    batcher = MicroBatcher(p, max_batch_size=64, max_wait_s=0.01)
+    inputs = [INPUT.copy() for _ in range(10)]
+    for i, x in enumerate(inputs):
+        x[4] = 600.0 * (i + 1)
+
+    results = await asyncio.gather(*(batcher.submit(x) for x in inputs))
+
+    assert batcher.stats.batches == 1
+    assert batcher.stats.requests == 10
+    assert results == predict(p, np.stack(inputs))
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_without_waiting():
+    p = load_model("artifacts/sa_pcinn_fold8_bundle.pt")
+    batcher = MicroBatcher(p, max_batch_size=4, max_wait_s=60.0)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.submit(INPUT) for _ in range(8))), timeout=5
+    )
+
+    assert len(results) == 8
+    assert batcher.stats.batches == 2
+    assert batcher.stats.as_dict()["batch_size_histogram"]["4"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stats_endpoint_reports_batcher(client):
+    r = await client.post(
+        "/api/v1/predict",
+        json={
+            "m_molar": 3.326,
+            "s_molar": 6.674,
+            "i_molar": 0.0246,
+            "temperature_k": 333.0,
+            "time_s": 7200.0,
+        },
+    )
+    assert r.status_code == 200
+    r = await client.get("/api/v1/stats")
+    assert r.status_code == 200
+    batcher = r.json()["batcher"]
+    assert batcher["enabled"] is True
+    assert batcher["models"]["sa_pcinn"]["requests"] >= 1
@@ -0,0 +1,28 @@
+from app.config import settings
+from benchmarks.suite import compare_results, serving_predictors
+
+
+def _run(p50_ms: float, peak_memory_mb: float = 1.0) -> dict:
+    return {"cases": {"predict/100": {"p50_ms": p50_ms, "peak_memory_mb": peak_memory_mb}}}
+
+
+def test_compare_flags_only_regressions_beyond_threshold():
+    baseline = _run(10.0)
+    assert compare_results(baseline, _run(11.9), 0.2, 0.2) == []
+    assert compare_results(baseline, _run(5.0), 0.2, 0.2) == []
+    (message,) = compare_results(baseline, _run(12.5), 0.2, 0.2)
+    assert message.startswith("predict/100: p50")
+
+
+def test_compare_checks_memory_and_skips_missing_cases():
+    (message,) = compare_results(_run(10.0), _run(10.0, peak_memory_mb=2.0), 0.2, 0.5)
+    assert "peak memory" in message
+    assert compare_results(_run(10.0), {"cases": {}}, 0.2, 0.2) == []
+
+
+def test_engine_cases_use_the_served_predictors(monkeypatch):
+    monkeypatch.setattr(settings, "inference_precision", "bfloat16")
+    predictor = serving_predictors()["sa_pcinn"]
+    assert predictor.precision == "bfloat16"
+    monkeypatch.setattr(settings, "inference_precision", "mixed")
+    assert serving_predictors()["sa_pcinn"].folded == settings.fold_scaler
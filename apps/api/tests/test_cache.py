@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+from app.config import settings
+from app.main import app
+from app.services.cache import PredictionCache
+
+TIMESERIES_INPUT = {
+    "m_molar": 2.5,
+    "s_molar": 7.0,
+    "i_molar": 0.01,
+    "temperature_k": 343.0,
+    "time_start_s": 10,
+    "time_end_s": 20000,
+    "time_steps": 30,
+}
+
+
+def test_key_quantizes_to_significant_digits():
+    cache = PredictionCache(significant_digits=4)
+    a = cache.key("predict", ("pcinn",), [3.3261, 7200.04])
+    b = cache.key("predict", ("pcinn",), [3.32609, 7200.0])
+    c = cache.key("predict", ("pcinn",), [3.327, 7200.0])
+    assert a == b
+    assert a != c
+
+
+def test_evicts_least_recently_used():
+    cache = PredictionCache(max_entries=2, max_bytes=1024, ttl_s=0)
+    k1, k2, k3 = (cache.key("predict", ("m",), [float(i)]) for i in range(3))
+    cache.put(k1, b"one")
+    cache.put(k2, b"two")
+    assert cache.get(k1) == b"one"
+    cache.put(k3, b"three")
+
+    assert cache.get(k2) is None
+    assert cache.get(k1) == b"one"
+    assert cache.stats.evictions == 1
+
+
+def test_byte_cap_and_ttl(monkeypatch):
+    cache = PredictionCache(max_entries=10, max_bytes=8, ttl_s=5.0)
+    k1, k2 = (cache.key("predict", ("m",), [float(i)]) for i in range(2))
+    cache.put(k1, b"12345")
+    cache.put(k2, b"67890")
+    assert cache.get(k1) is None
+    assert cache.as_dict()["bytes"] == 5
+
+    now = time.monotonic()
+    monkeypatch.setattr("app.services.cache.time.monotonic", lambda: now + 10)
+    assert cache.get(k2) is None
+    assert cache.stats.expirations == 1
+
+
+def test_invalidate_by_model():
+    cache = PredictionCache(max_entries=10, max_bytes=1024, ttl_s=0)
+    cache.put(cache.key("predict", ("pcinn",), [1.0]), b"a")
+    cache.put(cache.key("compare", ("baseline_nn", "pcinn"), [1.0]), b"b")
+    cache.put(cache.key("predict", ("sa_pcinn",), [1.0]), b"c")
+    assert cache.invalidate("pcinn") == 2
+    assert cache.as_dict()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_repeated_timeseries_is_served_from_cache(client):
+    app.state.cache.invalidate()
+    first = await client.post("/api/v1/predict/timeseries", json=TIMESERIES_INPUT)
+    second = await client.post("/api/v1/predict/timeseries", json=TIMESERIES_INPUT)
+    other_model = await client.post(
+        "/api/v1/predict/timeseries?model=pcinn", json=TIMESERIES_INPUT
+    )
+
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert other_model.headers["x-cache"] == "MISS"
+    assert second.content == first.content
+    assert len(second.json()["times"]) == 30
+
+
+@pytest.mark.asyncio
+async def test_delete_cache_endpoint(client, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_token", "secret")
+    await client.post("/api/v1/predict/compare", json=TIMESERIES_INPUT)
+    r = await client.delete("/api/v1/cache")
+    assert r.status_code == 403
+    r = await client.delete("/api/v1/cache", headers={"x-profile-token": "secret"})
+    assert r.status_code == 200
+    assert r.json()["invalidated"] >= 1
+    r = await client.get("/api/v1/stats")
+    assert r.json()["cache"]["entries"] == 0
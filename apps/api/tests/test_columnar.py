@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.main import app
+from app.models.inference import predict
+from app.schemas.columnar import ColumnarBatchRequest
+
+COLUMNS = {
+    "m_molar": [3.326, 3.326, 1.0],
+    "s_molar": [6.674, 6.674, 9.0],
+    "i_molar": [0.0246, 0.0246, 0.05],
+    "temperature_k": [333.0, 333.0, 353.0],
+    "time_s": [7200.0, 14400.0, 600.0],
+}
+
+
+def test_columnar_request_builds_input_matrix():
+    body = ColumnarBatchRequest(**COLUMNS)
+    assert body.to_array().shape == (3, 5)
+    assert body.to_array()[:, 4].tolist() == COLUMNS["time_s"]
+
+
+def test_columnar_request_reports_offending_rows():
+    bad = {**COLUMNS, "m_molar": [0.1, 3.0, 9.0], "time_s": [7200.0, -1.0, 600.0]}
+    with pytest.raises(ValidationError) as exc_info:
+        ColumnarBatchRequest(**bad)
+    message = str(exc_info.value)
+    assert "m_molar outside [0.5, 5] at rows 0, 2" in message
+    assert "time_s outside [1.2, 35854] at rows 1" in message
+
+
+def test_columnar_request_rejects_ragged_columns():
+    with pytest.raises(ValidationError, match="same length"):
+        ColumnarBatchRequest(**{**COLUMNS, "i_molar": [0.01]})
+
+
+@pytest.mark.asyncio
+async def test_predict_batch_columnar(client):
+    r = await client.post("/api/v1/predict/batch/columnar?model=pcinn", json=COLUMNS)
+    assert r.status_code == 200
+    data = r.json()
+    inputs = np.column_stack(list(COLUMNS.values()))
+    expected = predict(app.state.predictors["pcinn"], inputs)
+    assert data["mn"] == [p["mn"] for p in expected]
+    assert data["raw_log10_mv"] == [p["raw_outputs"][5] for p in expected]
+    assert all(d >= 1.0 for d in data["dispersity"])
+
+
+@pytest.mark.asyncio
+async def test_predict_batch_columnar_invalid(client):
+    r = await client.post(
+        "/api/v1/predict/batch/columnar", json={**COLUMNS, "temperature_k": [1, 2, 3]}
+    )
+    assert r.status_code == 422
+    assert "temperature_k outside" in r.json()["detail"][0]["msg"]
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from app.models.ensemble import EnsemblePredictor
+from app.models.inference import OUTPUT_FIELDS, predict_columns
+from app.models.registry import ModelRegistry
+from app.schemas.validation import sample_inputs
+
+
+def test_ensemble_matches_per_member_statistics():
+    predictors = dict(ModelRegistry("artifacts", engine="numpy"))
+    ensemble = EnsemblePredictor.from_predictors("mixed", predictors)
+    inputs = sample_inputs(32)
+
+    summary = ensemble.predict_columns(inputs)
+
+    per_member = [predict_columns(p, inputs) for p in predictors.values()]
+    for name in OUTPUT_FIELDS:
+        values = np.stack([columns[name] for columns in per_member])
+        np.testing.assert_allclose(
+            summary["mean"][name], values.mean(axis=0), rtol=1e-5
+        )
+        np.testing.assert_allclose(
+            summary["std"][name], values.std(axis=0), rtol=1e-4, atol=1e-6
+        )
+
+
+def test_ensemble_timeseries_matches_batch():
+    predictors = dict(ModelRegistry("artifacts", engine="numpy"))
+    ensemble = EnsemblePredictor.from_predictors("mixed", predictors)
+    recipe = np.array([2.0, 7.0, 0.05, 343.0])
+    times = np.linspace(10.0, 30000.0, 50)
+    inputs = np.column_stack([np.tile(recipe, (len(times), 1)), times])
+
+    series = ensemble.predict_timeseries_columns(recipe, times)
+    batch = ensemble.predict_columns(inputs)
+
+    for stat in ("mean", "std"):
+        for name in OUTPUT_FIELDS:
+            np.testing.assert_allclose(
+                series[stat][name], batch[stat][name], rtol=1e-4, atol=1e-5
+            )
+
+
+@pytest.mark.asyncio
+async def test_ensemble_batch_endpoint(client):
+    row = {
+        "m_molar": 2.0,
+        "s_molar": 7.0,
+        "i_molar": 0.05,
+        "temperature_k": 343.0,
+        "time_s": 3600.0,
+    }
+    r = await client.post(
+        "/api/v1/predict/ensemble/batch",
+        params={"family": "pcinn"},
+        json={"inputs": [row, row]},
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["family"] == "pcinn"
+    assert data["members"] == ["pcinn"]
+    assert len(data["mean"]["mn"]) == 2
+    assert data["std"]["mn"] == [0.0, 0.0]
+
+
+@pytest.mark.asyncio
+async def test_ensemble_timeseries_endpoint(client):
+    body = {
+        "m_molar": 2.0,
+        "s_molar": 7.0,
+        "i_molar": 0.05,
+        "temperature_k": 343.0,
+        "time_end_s": 3600.0,
+        "time_steps": 10,
+    }
+    r = await client.post("/api/v1/predict/ensemble/timeseries", json=body)
+    assert r.status_code == 200
+    data = r.json()
+    assert data["family"] == "sa_pcinn"
+    assert len(data["times"]) == 10
+    assert len(data["mean"]["conversion"]) == 10
+
+
+@pytest.mark.asyncio
+async def test_ensemble_unknown_family(client):
+    r = await client.post(
+        "/api/v1/predict/ensemble/batch", params={"family": "nope"}, json={"inputs": []}
+    )
+    assert r.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_ensemble_batch_accepts_an_empty_batch(client):
+    r = await client.post("/api/v1/predict/ensemble/batch", json={"inputs": []})
+    assert r.status_code == 200
+    assert r.json()["mean"]["mn"] == [] and r.json()["std"]["mn"] == []
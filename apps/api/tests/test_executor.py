@@ -0,0 +1,91 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from app.main import app
+from app.models.inference import load_model, predict
+from app.routers import predict as predict_router
+from app.services import metrics, tracing
+from app.services.executor import InferenceExecutor
+
+TIMESERIES_INPUT = {
+    "m_molar": 3.326,
+    "s_molar": 6.674,
+    "i_molar": 0.0246,
+    "temperature_k": 333.0,
+    "time_end_s": 18000,
+    "time_steps": 20,
+}
+
+
+@pytest.mark.asyncio
+async def test_health_responds_while_compare_is_running(client, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    original = predict_router._compare_payload
+
+    def slow_compare(engine, body):
+        started.set()
+        release.wait(timeout=5)
+        return original(engine, body)
+
+    monkeypatch.setattr(predict_router, "_compare_payload", slow_compare)
+    app.state.cache.invalidate()
+    compare = asyncio.ensure_future(
+        client.post("/api/v1/predict/compare", json=TIMESERIES_INPUT)
+    )
+    for _ in range(500):
+        if started.is_set():
+            break
+        await asyncio.sleep(0.01)
+    assert started.is_set()
+
+    r = await asyncio.wait_for(client.get("/api/v1/health"), timeout=2)
+    assert r.status_code == 200
+    assert not compare.done()
+
+    release.set()
+    r = await compare
+    assert r.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_process_executor_matches_inline_predict():
+    p = load_model("artifacts/pcinn_fold8_bundle.pt")
+    inputs = np.array([[3.326, 6.674, 0.0246, 333.0, 7200.0]] * 3)
+    executor = InferenceExecutor(kind="process", max_workers=1)
+    try:
+        assert await executor.run(predict, p, inputs) == predict(p, inputs)
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_executor_reports_worker_stage_timings():
+    p = load_model("artifacts/pcinn_fold8_bundle.pt")
+    inputs = np.array([[3.326, 6.674, 0.0246, 333.0, 7200.0]] * 3)
+    forward = metrics.STAGE_SECONDS.labels("forward")
+    before = sum(forward.counts)
+    executor = InferenceExecutor(kind="process", max_workers=1)
+    trace, token = tracing.begin()
+    try:
+        await executor.run(predict, p, inputs)
+    finally:
+        tracing.end(token)
+        executor.shutdown()
+    assert sum(forward.counts) == before + 1
+    stages = {(stage, model) for stage, model, _, _ in trace.entries}
+    assert {("scaling", "pcinn"), ("forward", "pcinn")} <= stages
+
+
+def test_executor_rejects_unknown_kind():
+    with pytest.raises(ValueError, match="Unknown inference executor"):
+        InferenceExecutor(kind="gpu")
+
+
+@pytest.mark.asyncio
+async def test_stats_reports_executor(client):
+    r = await client.get("/api/v1/stats")
+    assert r.json()["executor"]["kind"] == app.state.executor.kind
@@ -17,3 +17,18 @@ async def test_ready(client):
     r = await client.get("/api/v1/health/ready")
     assert r.status_code == 200
     assert r.json()["status"] == "ready"
+
+
+@pytest.mark.asyncio
+async def test_health_does_not_load_models(client, monkeypatch):
+    from app.main import app
+    from app.models.registry import ModelRegistry
+
+    registry = ModelRegistry()
+    monkeypatch.setattr(app.state, "predictors", registry)
+    r = await client.get("/api/v1/health")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["models_loaded"] == 0
+    assert data["inference_engine"] == "torch"
+    assert registry.resident() == []
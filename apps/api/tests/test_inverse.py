@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from app.models.inference import load_model
+from app.models.inverse import Objective, inverse_design, latin_hypercube
+from app.schemas.inverse import PropertyTarget
+from app.schemas.validation import INPUT_LOWER, INPUT_UPPER
+
+PREDICTOR = load_model("artifacts/sa_pcinn_fold8_bundle.safetensors", engine="numpy")
+
+TARGETS = {
+    "conversion": PropertyTarget(min=0.8),
+    "mn": PropertyTarget(target=50_000.0),
+}
+
+
+def test_latin_hypercube_fills_every_stratum():
+    points = latin_hypercube(16, 5, np.random.default_rng(0))
+    assert points.shape == (16, 5)
+    for col in points.T:
+        assert sorted(np.floor(col * 16).astype(int)) == list(range(16))
+
+
+def test_inverse_design_meets_targets_within_bounds():
+    result = inverse_design(
+        PREDICTOR,
+        Objective.from_targets(TARGETS),
+        fixed={"temperature_k": 343.0},
+        top_k=3,
+        starts=64,
+        max_iterations=150,
+        time_budget_s=5.0,
+        seed=0,
+    )
+
+    assert result.feasible.all()
+    assert (result.columns["conversion"] >= 0.8).all()
+    np.testing.assert_allclose(result.columns["mn"], 50_000.0, rtol=1e-3)
+    assert ((result.inputs >= INPUT_LOWER) & (result.inputs <= INPUT_UPPER)).all()
+    np.testing.assert_array_equal(result.inputs[:, 3], 343.0)
+    assert list(result.objective) == sorted(result.objective)
+
+
+def test_inverse_design_respects_iteration_budget():
+    result = inverse_design(
+        PREDICTOR, Objective.from_targets(TARGETS), starts=8, max_iterations=0, seed=1
+    )
+    assert result.iterations == 0
+    assert len(result.inputs) == 5
+
+
+@pytest.mark.asyncio
+async def test_inverse_endpoint(client):
+    body = {
+        "targets": {"conversion": {"min": 0.8}, "mn": {"target": 50000}},
+        "top_k": 2,
+        "starts": 32,
+        "max_iterations": 100,
+        "seed": 0,
+    }
+    r = await client.post("/api/v1/predict/inverse", json=body)
+    assert r.status_code == 200
+    data = r.json()
+    assert len(data["solutions"]) == 2
+    best = data["solutions"][0]
+    assert best["feasible"]
+    assert best["prediction"]["conversion"] >= 0.8
+    assert set(best["inputs"]) == {
+        "m_molar",
+        "s_molar",
+        "i_molar",
+        "temperature_k",
+        "time_s",
+    }
+
+
+@pytest.mark.asyncio
+async def test_inverse_endpoint_rejects_nonpositive_mass(client):
+    body = {"targets": {"mn": {"max": 0}}}
+    r = await client.post("/api/v1/predict/inverse", json=body)
+    assert r.status_code == 422
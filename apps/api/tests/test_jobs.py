@@ -0,0 +1,203 @@
+import asyncio
+import io
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.main import app
+from app.models.inference import columns_to_matrix, predict_columns
+from app.schemas.validation import sample_inputs
+from app.services import jobs, npy
+
+
+async def _wait(client, job_id: str, timeout: float = 10.0) -> dict:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        status = (await client.get(f"/api/v1/jobs/{job_id}")).json()
+        if status["status"] not in ("queued", "running"):
+            return status
+        assert asyncio.get_running_loop().time() < deadline, status
+        await asyncio.sleep(0.02)
+
+
+def _npy(inputs: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, inputs)
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_job_scores_upload_and_serves_results(client, monkeypatch):
+    monkeypatch.setattr(settings, "job_chunk_rows", 64)
+    inputs = sample_inputs(300, seed=3)
+    r = await client.post(
+        "/api/v1/jobs?model=pcinn",
+        content=_npy(inputs),
+        headers={"content-type": npy.NPY_MEDIA_TYPE},
+    )
+    assert r.status_code == 202
+    job_id = r.json()["id"]
+    assert r.headers["location"] == f"/api/v1/jobs/{job_id}"
+    assert r.json()["rows"] == 300
+
+    status = await _wait(client, job_id)
+    assert status["status"] == "done"
+    assert status["progress"] == 1.0
+    assert status["expires_at"] > status["finished_at"]
+
+    expected = columns_to_matrix(predict_columns(app.state.predictors["pcinn"], inputs))
+    r = await client.get(
+        f"/api/v1/jobs/{job_id}/result", headers={"accept": npy.NPY_MEDIA_TYPE}
+    )
+    assert r.headers["x-columns"].split(",") == list(npy.OUTPUT_COLUMNS)
+    np.testing.assert_allclose(np.load(io.BytesIO(r.content)), expected, rtol=1e-5)
+
+    r = await client.get(f"/api/v1/jobs/{job_id}/result")
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = np.loadtxt(io.StringIO(r.text), delimiter=",", skiprows=1)
+    np.testing.assert_allclose(rows[:, :5], inputs)
+    np.testing.assert_allclose(rows[:, 5:], expected, rtol=1e-5)
+
+
+@pytest.mark.asyncio
+async def test_job_accepts_csv_and_rejects_bad_uploads(client):
+    csv = "m_molar,s_molar,i_molar,temperature_k,time_s\n3.3,6.6,0.02,333,3600\n"
+    headers = {"content-type": "text/csv"}
+    r = await client.post("/api/v1/jobs", content=csv, headers=headers)
+    assert r.status_code == 202
+    assert (await _wait(client, r.json()["id"]))["status"] == "done"
+    job_id = r.json()["id"]
+    r = await client.get(
+        f"/api/v1/jobs/{job_id}/result", headers={"accept": "application/x-ndjson"}
+    )
+    assert r.json()["m_molar"] == 3.3
+
+    files = sorted(os.listdir(app.state.jobs.store.directory))
+    bad = csv.replace("333", "999")
+    r = await client.post("/api/v1/jobs", content=bad, headers=headers)
+    assert r.status_code == 422
+    r = await client.post(
+        "/api/v1/jobs", content="{}", headers={"content-type": "text/plain"}
+    )
+    assert r.status_code == 415
+    # Rejected uploads leave nothing behind.
+    assert sorted(os.listdir(app.state.jobs.store.directory)) == files
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("value", ["NaN", "-Infinity"])
+async def test_job_with_non_finite_inputs_is_422(client, value):
+    row = "[3.3, 6.6, 0.02, 333.0, %s]\n" % value
+    r = await client.post(
+        "/api/v1/jobs", content=row, headers={"content-type": "application/x-ndjson"}
+    )
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["type"] == "finite_number"
+
+
+@pytest.mark.asyncio
+async def test_oversized_npy_job_is_refused_from_its_header(client, monkeypatch):
+    monkeypatch.setattr(settings, "job_max_rows", 10)
+    header = npy.encode_header((11, 5))
+
+    async def body():
+        yield header
+        raise AssertionError("the payload should not be read")
+
+    r = await client.post(
+        "/api/v1/jobs", content=body(), headers={"content-type": npy.NPY_MEDIA_TYPE}
+    )
+    assert r.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_cancelled_job_stops_and_has_no_result(client):
+    store = app.state.jobs.store
+    job_id = store.new_id()
+    with open(store.inputs_path(job_id), "wb") as f:
+        f.write(sample_inputs(10).tobytes())
+    store.create(job_id, "sa_pcinn")  # not notified, so it stays queued
+
+    r = await client.post(f"/api/v1/jobs/{job_id}/cancel")
+    assert r.json()["status"] == "cancelled"
+    assert (await client.get(f"/api/v1/jobs/{job_id}/result")).status_code == 409
+    assert (await client.get("/api/v1/jobs/missing")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_interrupted_job_resumes_from_committed_progress(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "job_chunk_rows", 4)
+    store = jobs.JobStore(str(tmp_path))
+    inputs = sample_inputs(10, seed=5)
+    job_id = store.new_id()
+    with open(store.inputs_path(job_id), "wb") as f:
+        f.write(inputs.tobytes())
+    store.create(job_id, "sa_pcinn")
+    job = store.claim()
+    store.progress(job_id, 4)
+    predictor = app.state.predictors["sa_pcinn"]
+    # First chunk committed, plus a partial second chunk that was never committed.
+    with open(store.results_path(job_id), "wb") as f:
+        f.write(jobs._score_chunk(predictor, inputs[:4]))
+        f.write(b"\0" * jobs.RESULT_ROW_BYTES * 3)
+    job.rows_done = 4
+
+    runner = jobs.JobRunner(store, app.state.predictors)
+    await runner.run(job)
+    runner.executor.shutdown()
+    job = store.get(job_id)
+    assert job.status == "done"
+    results = np.concatenate([r for _, r in jobs.read_results(store, job, 100)])
+    expected = columns_to_matrix(predict_columns(predictor, inputs))
+    np.testing.assert_allclose(results, expected, rtol=1e-5)
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_job_store_and_file_io_stay_off_the_event_loop(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "job_chunk_rows", 4)
+    store = jobs.JobStore(str(tmp_path))
+    loop_thread = threading.get_ident()
+    on_loop = []
+    for name in ("claim", "progress", "finish", "expire"):
+        method = getattr(store, name)
+
+        def traced(*args, _name=name, _method=method):
+            if threading.get_ident() == loop_thread:
+                on_loop.append(_name)
+            return _method(*args)
+
+        monkeypatch.setattr(store, name, traced)
+
+    job_id = store.new_id()
+
+    async def chunks():
+        yield sample_inputs(10, seed=7)
+
+    assert await jobs.write_inputs(store, job_id, chunks()) == 10
+    store.create(job_id, "sa_pcinn")
+    runner = jobs.JobRunner(store, app.state.predictors)
+    runner.notify()
+    while store.get(job_id).status != "done":
+        await asyncio.sleep(0.01)
+    await runner.stop()
+    assert on_loop == []
+    store.close()
+
+
+def test_expired_jobs_are_deleted_with_files(tmp_path, monkeypatch):
+    store = jobs.JobStore(str(tmp_path))
+    job_id = store.new_id()
+    with open(store.inputs_path(job_id), "wb") as f:
+        f.write(sample_inputs(2).tobytes())
+    store.create(job_id, "sa_pcinn")
+    store.cancel(job_id)
+    assert store.expire() == 0
+    monkeypatch.setattr(settings, "job_ttl_s", -1.0)
+    assert store.expire() == 1
+    assert store.get(job_id) is None
+    assert not os.path.exists(store.inputs_path(job_id))
+    store.close()
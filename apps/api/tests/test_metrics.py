@@ -0,0 +1,69 @@
+import re
+
+import pytest
+
+from app.services.metrics import Histogram, _HISTOGRAMS
+
+POINT = {
+    "m_molar": 3.326,
+    "s_molar": 6.674,
+    "i_molar": 0.0246,
+    "temperature_k": 333.0,
+    "time_s": 1800.0,
+}
+
+
+def _sample(text: str, series: str) -> float:
+    match = re.search(rf"^{re.escape(series)} (\S+)$", text, re.MULTILINE)
+    assert match, f"{series} not in /metrics"
+    return float(match.group(1))
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test.", ("route",), buckets=(0.1, 1))
+    _HISTOGRAMS.remove(histogram)
+    child = histogram.labels("/a")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        child.observe(value)
+    lines = histogram.render()
+    assert 'test_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'test_seconds_bucket{route="/a",le="1"} 3' in lines
+    assert 'test_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'test_seconds_sum{route="/a"} 3.65' in lines
+    assert 'test_seconds_count{route="/a"} 4' in lines
+    with pytest.raises(ValueError, match="takes labels"):
+        histogram.labels("/a", "extra")
+
+
+@pytest.mark.asyncio
+async def test_metrics_records_routes_stages_and_models(client):
+    before = (await client.get("/metrics")).text
+    r = await client.post(
+        "/api/v1/predict/batch", params={"model": "pcinn"}, json={"inputs": [POINT] * 3}
+    )
+    assert r.status_code == 200
+    r = await client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = r.text
+
+    route = (
+        "pcinn_http_request_duration_seconds_count"
+        '{route="/api/v1/predict/batch",method="POST",status="200"}'
+    )
+    assert _sample(text, route) >= 1
+    for stage in ("validation", "scaling", "forward", "postprocess", "serialization"):
+        series = f'pcinn_stage_duration_seconds_count{{stage="{stage}"}}'
+        assert _sample(text, series) > _sample(before, series)
+    rows = 'pcinn_model_batch_rows_sum{model="pcinn",fold="8"}'
+    assert _sample(text, rows) - _sample(before, rows) == 3
+    assert "# TYPE pcinn_cache_events_total counter" in text
+    assert "pcinn_registry_resident_models " in text
+
+
+@pytest.mark.asyncio
+async def test_unmatched_paths_share_one_label(client):
+    await client.get("/api/v1/no-such-route")
+    text = (await client.get("/metrics")).text
+    assert 'route="unmatched",method="GET",status="404"' in text
+    assert "no-such-route" not in text
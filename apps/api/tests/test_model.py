@@ -1,7 +1,16 @@
 import numpy as np
+import pytest
 import torch
 
-from app.models.inference import ModelPredictor, load_model, predict
+from app.models.inference import (
+    OUTPUT_FIELDS,
+    ModelPredictor,
+    load_model,
+    postprocess_columns,
+    predict,
+    predict_columns,
+)
+from app.models.numpy_engine import NUMPY_ENGINE_ATOL, NumpyMLP
 
 
 def test_load_model():
@@ -61,3 +70,54 @@ def test_predict_clamps_dispersity_minimum():
     )
     result = predict(p, np.array([0.2, 0.3, 0.4, 0.5, 0.6]))
     assert result["dispersity"] == 1.0
+
+
+def _reference_grid() -> np.ndarray:
+    lo = np.array([0.5, 5.0, 0.005, 323.0, 1.2])
+    hi = np.array([5.0, 9.5, 0.1, 363.0, 35854.0])
+    rng = np.random.default_rng(0)
+    return lo + rng.random((256, 5)) * (hi - lo)
+
+
+def test_numpy_engine_matches_torch():
+    inputs = _reference_grid()
+    for name in ("baseline_nn", "pcinn", "sa_pcinn"):
+        path = f"artifacts/{name}_fold8_bundle.pt"
+        torch_results = predict(load_model(path, engine="torch"), inputs)
+        numpy_predictor = load_model(path, engine="numpy")
+        assert isinstance(numpy_predictor.model, NumpyMLP)
+        numpy_results = predict(numpy_predictor, inputs)
+        np.testing.assert_allclose(
+            [r["raw_outputs"] for r in numpy_results],
+            [r["raw_outputs"] for r in torch_results],
+            rtol=0,
+            atol=NUMPY_ENGINE_ATOL,
+        )
+
+
+def test_load_model_rejects_unknown_engine():
+    with pytest.raises(ValueError, match="Unknown inference engine"):
+        load_model("artifacts/sa_pcinn_fold8_bundle.pt", engine="onnx")
+
+
+def test_predict_columns_matches_rows():
+    p = load_model("artifacts/pcinn_fold8_bundle.pt")
+    inputs = _reference_grid()
+    columns = predict_columns(p, inputs)
+    rows = predict(p, inputs)
+    for name in OUTPUT_FIELDS:
+        assert columns[name].shape == (len(inputs),)
+        assert columns[name].tolist() == [r[name] for r in rows]
+    assert columns["raw_outputs"].shape == (len(inputs), 6)
+
+
+def test_postprocess_columns_applies_serving_constraints():
+    raw = np.array(
+        [[1.2, 3.0, 2.0, 2.1, 2.2, 2.3], [-0.1, 3.0, 3.5, 3.6, 3.7, 3.8]],
+        dtype=np.float32,
+    )
+    columns = postprocess_columns(raw)
+    assert columns["conversion"].tolist() == [1.0, 0.0]
+    assert columns["dispersity"][0] == 1.0
+    np.testing.assert_allclose(columns["dispersity"][1], 10**0.5, rtol=1e-6)
+    assert columns["raw_outputs"][0, 0] == np.float32(1.2)
@@ -0,0 +1,175 @@
+import io
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.main import app
+from app.models.inference import predict
+from app.services.npy import (
+    NpyFormatError,
+    OUTPUT_COLUMNS,
+    encode_header,
+    iter_rows,
+    read_header,
+    read_payload,
+)
+
+ROWS = np.array(
+    [
+        [3.326, 6.674, 0.0246, 333.0, 7200.0],
+        [3.326, 6.674, 0.0246, 333.0, 14400.0],
+        [1.0, 9.0, 0.05, 353.0, 600.0],
+    ]
+)
+
+
+def _npy(array: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, array)
+    return buffer.getvalue()
+
+
+async def _pieces(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+@pytest.mark.asyncio
+async def test_read_payload_is_a_view_of_one_buffer():
+    stream = _pieces(_npy(ROWS), 16)
+    shape, rest = await read_header(stream)
+    inputs = await read_payload(stream, shape, rest)
+    np.testing.assert_array_equal(inputs, ROWS)
+    # Received into one bytearray and viewed in place, not copied again.
+    assert isinstance(inputs.base.base.obj, bytearray)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "array",
+    [ROWS.astype(np.float32), ROWS[:, :4].copy(), np.asfortranarray(ROWS), ROWS[0]],
+)
+async def test_read_header_rejects_wrong_layout(array):
+    with pytest.raises(NpyFormatError):
+        await read_header(_pieces(_npy(array), 64))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("piece", [1, 7, 1000])
+async def test_streamed_npy_matches_decode_in_any_piece_size(piece):
+    inputs = np.tile(ROWS, (5, 1))
+    stream = _pieces(_npy(inputs), piece)
+    shape, rest = await read_header(stream)
+    assert shape == inputs.shape
+    chunks = [chunk async for chunk in iter_rows(stream, shape, rest, 4)]
+    assert [len(chunk) for chunk in chunks] == [4, 4, 4, 3]
+    np.testing.assert_array_equal(np.concatenate(chunks), inputs)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("extra", [-8, 8])
+async def test_streamed_npy_rejects_wrong_payload_length(extra):
+    body = _npy(ROWS)
+    body = body[:extra] if extra < 0 else body + b"\0" * extra
+    stream = _pieces(body, 16)
+    shape, rest = await read_header(stream)
+    with pytest.raises(NpyFormatError, match="length"):
+        [chunk async for chunk in iter_rows(stream, shape, rest, 2)]
+    stream = _pieces(body, 16)
+    shape, rest = await read_header(stream)
+    with pytest.raises(NpyFormatError, match="length"):
+        await read_payload(stream, shape, rest)
+
+
+@pytest.mark.asyncio
+async def test_batch_npy_row_cap_is_checked_from_the_header(client, monkeypatch):
+    monkeypatch.setattr(settings, "binary_batch_max_rows", 2)
+
+    async def body():
+        yield encode_header((3, 5))
+        raise AssertionError("the payload should not be read")
+
+    r = await client.post(
+        "/api/v1/predict/batch",
+        content=body(),
+        headers={"content-type": "application/x-npy"},
+    )
+    assert r.status_code == 413
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("value", [np.nan, np.inf])
+async def test_batch_npy_non_finite_inputs_are_422(client, value):
+    rows = ROWS.copy()
+    rows[1, 3] = value
+    r = await client.post(
+        "/api/v1/predict/batch",
+        content=_npy(rows),
+        headers={"content-type": "application/x-npy"},
+    )
+    assert r.status_code == 422
+    (error,) = r.json()["detail"]
+    assert error["loc"] == ["body", 1, "temperature_k"]
+    assert error["type"] == "finite_number"
+    assert error["input"] == repr(float(value))
+
+
+@pytest.mark.asyncio
+async def test_batch_npy_in_npy_out(client):
+    r = await client.post(
+        "/api/v1/predict/batch?model=pcinn",
+        content=_npy(ROWS),
+        headers={"content-type": "application/x-npy", "accept": "application/x-npy"},
+    )
+    assert r.status_code == 200
+    assert r.headers["x-columns"].split(",") == list(OUTPUT_COLUMNS)
+    matrix = np.load(io.BytesIO(r.content))
+    assert matrix.shape == (3, 13)
+    expected = predict(app.state.predictors["pcinn"], ROWS)
+    assert matrix[:, 1].tolist() == [p["mn"] for p in expected]
+    assert matrix[:, 7:].tolist() == [p["raw_outputs"] for p in expected]
+
+
+@pytest.mark.asyncio
+async def test_batch_npy_in_json_out(client):
+    r = await client.post(
+        "/api/v1/predict/batch",
+        content=_npy(ROWS),
+        headers={"content-type": "application/x-npy"},
+    )
+    assert r.status_code == 200
+    assert len(r.json()["predictions"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_npy_range_errors_report_rows(client):
+    bad = ROWS.copy()
+    bad[2, 4] = 50000.0
+    r = await client.post(
+        "/api/v1/predict/batch",
+        content=_npy(bad),
+        headers={"content-type": "application/x-npy"},
+    )
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["loc"] == ["body", 2, "time_s"]
+
+
+@pytest.mark.asyncio
+async def test_batch_json_validation_errors_keep_body_loc(client):
+    r = await client.post(
+        "/api/v1/predict/batch",
+        json={
+            "inputs": [
+                {
+                    "m_molar": 0.1,
+                    "s_molar": 6.0,
+                    "i_molar": 0.01,
+                    "temperature_k": 333.0,
+                    "time_s": 10.0,
+                }
+            ]
+        },
+    )
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["loc"] == ["body", "inputs", 0, "m_molar"]
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.config import Settings
+
+from app.models.inference import load_model, predict_columns
+from app.models.numpy_engine import NUMPY_ENGINE_ATOL
+from app.models.optimize import compile_model, fold_scaler, optimize_predictor
+from app.models.registry import ModelRegistry
+from app.schemas.validation import sample_inputs
+from app.services import metrics
+
+PATH = "artifacts/pcinn_fold8_bundle.safetensors"
+
+
+@pytest.mark.parametrize("engine", ["torch", "numpy"])
+def test_folded_scaler_matches_unfolded(engine):
+    base = load_model(PATH, engine=engine, precision="mixed")
+    folded = fold_scaler(base)
+    inputs = sample_inputs(512)
+
+    assert folded.folded and not base.folded
+    assert folded.mlp is base.mlp
+    np.testing.assert_allclose(
+        predict_columns(folded, inputs)["raw_outputs"],
+        predict_columns(base, inputs)["raw_outputs"],
+        rtol=0,
+        atol=NUMPY_ENGINE_ATOL,
+    )
+
+
+def test_traced_model_matches_eager():
+    folded = fold_scaler(load_model(PATH, engine="torch", precision="mixed"))
+    traced = compile_model(folded, "trace")
+    inputs = sample_inputs(100)
+    np.testing.assert_allclose(
+        predict_columns(traced, inputs)["raw_outputs"],
+        predict_columns(folded, inputs)["raw_outputs"],
+        rtol=0,
+        atol=1e-6,
+    )
+
+
+@pytest.mark.parametrize(
+    ("precision", "max_conversion_error"), [("bfloat16", 0.03), ("int8", 0.2)]
+)
+def test_reduced_precision_is_served_unfolded_with_bounded_error(
+    precision, max_conversion_error
+):
+    base = load_model(PATH, engine="torch", precision="mixed")
+    served = optimize_predictor(base, fold=True, precision=precision)
+    inputs = sample_inputs(5000)
+    error = np.abs(
+        predict_columns(served, inputs)["conversion"]
+        - predict_columns(base, inputs)["conversion"]
+    ).max()
+
+    assert not served.folded and served.precision == precision
+    assert error < max_conversion_error
+    with pytest.raises(ValueError, match="before reducing precision"):
+        fold_scaler(load_model(PATH, engine="torch", precision="int8"))
+
+
+def test_trace_is_rejected_with_the_process_executor():
+    with pytest.raises(ValidationError, match="TORCH_COMPILE=trace"):
+        Settings(torch_compile="trace", inference_executor="process")
+    Settings(torch_compile="compile", inference_executor="process")
+
+
+def test_registry_optimizes_and_warms_up_on_load():
+    registry = ModelRegistry(
+        "artifacts", engine="numpy", fold_scaler=True, warmup_batch_sizes=(1, 32)
+    )
+    assert registry["pcinn"].folded
+    assert registry.stats()["models"]["pcinn"]["last_warmup_ms"] > 0
+
+
+def test_warmup_is_not_recorded_in_metrics():
+    forward = metrics.STAGE_SECONDS.labels("forward")
+    before = sum(forward.counts)
+    registry = ModelRegistry("artifacts", engine="numpy", warmup_batch_sizes=(1, 32))
+    registry["pcinn"]
+    assert registry.stats()["models"]["pcinn"]["last_warmup_ms"] > 0
+    assert sum(forward.counts) == before
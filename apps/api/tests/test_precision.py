@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from app.models.inference import (
+    apply_precision,
+    load_model,
+    predict_columns,
+    scale_inputs,
+)
+from app.models.precision import accuracy_report, reference_grid
+from app.models.registry import ModelRegistry, parse_model_precisions
+from app.schemas.validation import sample_inputs
+
+PATH = "artifacts/sa_pcinn_fold8_bundle.safetensors"
+
+# Max raw-output difference from the mixed-precision path per mode.
+RAW_ATOL = {"float32": 1e-5, "bfloat16": 0.05, "int8": 0.2}
+
+
+@pytest.mark.parametrize("precision", ["float32", "bfloat16", "int8"])
+def test_precision_modes_stay_close_to_mixed(precision):
+    baseline = load_model(PATH, engine="torch", precision="mixed")
+    reduced = apply_precision(baseline, precision)
+    inputs = sample_inputs(256)
+
+    expected = predict_columns(baseline, inputs)["raw_outputs"]
+    actual = predict_columns(reduced, inputs)["raw_outputs"]
+
+    assert reduced.precision == precision
+    assert reduced.mlp is baseline.mlp
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=RAW_ATOL[precision])
+
+
+def test_float32_precision_scales_in_float32():
+    mixed = load_model(PATH, engine="numpy", precision="mixed")
+    single = load_model(PATH, engine="numpy", precision="float32")
+    inputs = sample_inputs(16)
+    assert scale_inputs(mixed, inputs).dtype == np.float64
+    scaled = scale_inputs(single, inputs)
+    assert scaled.dtype == np.float32
+    np.testing.assert_allclose(scaled, scale_inputs(mixed, inputs), atol=1e-6)
+
+
+def test_numpy_engine_rejects_torch_only_precisions():
+    with pytest.raises(ValueError, match="torch engine"):
+        load_model(PATH, engine="numpy", precision="int8")
+
+
+def test_registry_applies_per_model_precision():
+    assert parse_model_precisions(" pcinn=int8, sa_pcinn=float32 ") == {
+        "pcinn": "int8",
+        "sa_pcinn": "float32",
+    }
+    registry = ModelRegistry("artifacts", "torch", precisions={"pcinn": "bfloat16"})
+    assert registry["pcinn"].precision == "bfloat16"
+    assert registry["sa_pcinn"].precision == "mixed"
+    stats = registry.stats()
+    assert stats["models"]["pcinn"]["precision"] == "bfloat16"
+    # The stacked paths run the unfolded mixed-precision weights regardless.
+    assert stats["stacked"] == {"engine": "numpy", "precision": "mixed", "folded": False}
+
+
+def test_accuracy_report_covers_every_mode_and_output():
+    report = accuracy_report(PATH, inputs=reference_grid(3))
+    assert set(report) == {"mixed", "float32", "bfloat16", "int8"}
+    # Folding the scaler only reorders float32 arithmetic.
+    assert report["mixed"]["errors"]["raw_log10_mn"]["max_abs"] < 1e-4
+    assert report["int8"]["errors"]["raw_log10_mn"]["max_abs"] > 0.0
+    assert len(report["float32"]["errors"]) == 13
+
+
+@pytest.mark.parametrize("precision", ["bfloat16", "int8"])
+def test_accuracy_report_matches_the_served_predictor(precision):
+    inputs = reference_grid(3)
+    report = accuracy_report(PATH, precisions=[precision], inputs=inputs)
+    baseline = load_model(PATH, engine="torch", precision="mixed")
+    served = ModelRegistry("artifacts", "torch", precisions={"sa_pcinn": precision})
+    diff = np.abs(
+        predict_columns(served["sa_pcinn"], inputs)["raw_outputs"]
+        - predict_columns(baseline, inputs)["raw_outputs"]
+    )
+    assert report[precision]["errors"]["raw_log10_mn"]["max_abs"] == pytest.approx(
+        diff[:, 1].max(), abs=1e-6
+    )
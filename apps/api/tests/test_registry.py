@@ -0,0 +1,126 @@
+import os
+import threading
+
+import pytest
+
+from app.config import settings
+from app.models.artifacts import bundle_to_safetensors, read_bundle
+from app.models.registry import ModelRegistry
+
+
+def _write_fold(directory, family: str, fold: int) -> str:
+    bundle = read_bundle(f"artifacts/{family}_fold8_bundle.safetensors")
+    path = os.path.join(directory, f"{family}_fold{fold}_bundle.safetensors")
+    bundle_to_safetensors({**bundle, "fold": fold}, path)
+    return path
+
+
+def test_discovers_folds_and_loads_lazily(tmp_path):
+    for fold in (3, 8, 1):
+        _write_fold(tmp_path, "pcinn", fold)
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    registry = ModelRegistry(str(tmp_path), engine="numpy")
+
+    assert set(registry) == {"pcinn", "pcinn_fold1", "pcinn_fold3"}
+    assert registry.family_members("pcinn") == ["pcinn_fold1", "pcinn_fold3", "pcinn"]
+    assert registry.resident() == []
+    # The test loss comes from the safetensors header, without loading the model.
+    loss = registry.entry("pcinn_fold3").final_test_loss
+    assert loss is not None
+    assert registry.resident() == []
+    assert registry["pcinn_fold3"].final_test_loss == loss
+    assert registry["pcinn_fold3"].fold == 3
+    assert registry.resident() == ["pcinn_fold3"]
+    assert registry.stats()["models"]["pcinn_fold3"]["loads"] == 1
+    with pytest.raises(KeyError):
+        registry["pcinn_fold9"]
+
+
+def test_lru_eviction_by_count(tmp_path):
+    for fold in (1, 2, 3):
+        _write_fold(tmp_path, "pcinn", fold)
+    registry = ModelRegistry(str(tmp_path), engine="numpy", max_models=2)
+
+    registry["pcinn_fold1"]
+    registry["pcinn_fold2"]
+    registry["pcinn_fold1"]
+    registry["pcinn_fold3"]
+
+    assert registry.resident() == ["pcinn_fold1", "pcinn_fold3"]
+    assert registry.evictions == 1
+    stats = registry.stats()
+    assert stats["last_evict_ms"] > 0
+    assert stats["evict_ms_total"] == stats["last_evict_ms"]
+    assert stats["models"]["pcinn_fold3"]["last_load_ms"] > 0
+
+
+def test_changed_artifact_is_reloaded(tmp_path, monkeypatch):
+    path = _write_fold(tmp_path, "sa_pcinn", 8)
+    registry = ModelRegistry(str(tmp_path), engine="numpy", hot_reload=True)
+    invalidated = []
+    registry.on_reload(invalidated.append)
+    monkeypatch.setattr("app.config.settings.registry_reload_interval_s", 0.0)
+
+    first = registry["sa_pcinn"]
+    assert registry["sa_pcinn"] is first
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    assert registry["sa_pcinn"] is not first
+    assert invalidated == ["sa_pcinn"]
+    assert registry.reloads == 1
+
+
+def test_refresh_picks_up_new_artifacts(tmp_path):
+    _write_fold(tmp_path, "pcinn", 8)
+    registry = ModelRegistry(str(tmp_path), engine="numpy", hot_reload=False)
+    _write_fold(tmp_path, "pcinn", 2)
+
+    assert registry.refresh() == {"added": ["pcinn_fold2"], "removed": [], "reloaded": []}
+    assert "pcinn_fold2" in registry
+
+
+@pytest.mark.asyncio
+async def test_get_async_loads_in_a_worker_thread(tmp_path, monkeypatch):
+    _write_fold(tmp_path, "pcinn", 8)
+    registry = ModelRegistry(str(tmp_path), engine="numpy")
+    load, threads = registry._load, []
+
+    def traced_load(entry):
+        threads.append(threading.get_ident())
+        return load(entry)
+
+    monkeypatch.setattr(registry, "_load", traced_load)
+    predictor = await registry.get_async("pcinn")
+    assert threads[0] != threading.get_ident()
+    # Resident models are returned without another load.
+    assert await registry.get_async("pcinn") is predictor
+    assert len(threads) == 1
+
+
+@pytest.mark.asyncio
+async def test_models_endpoint_lists_registry(client):
+    r = await client.get("/api/v1/models")
+    assert r.status_code == 200
+    models = {m["name"]: m for m in r.json()["models"]}
+    assert set(models) == {"baseline_nn", "pcinn", "sa_pcinn"}
+    assert models["sa_pcinn"]["fold"] == 8
+    assert models["sa_pcinn"]["is_default"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_model_lists_available(client):
+    r = await client.get("/api/v1/model/info", params={"model": "nope"})
+    assert r.status_code == 400
+    assert "baseline_nn, pcinn, sa_pcinn" in r.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_reload_endpoint_requires_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_token", "secret")
+    r = await client.post("/api/v1/models/reload")
+    assert r.status_code == 403
+    r = await client.post("/api/v1/models/reload", headers={"x-profile-token": "secret"})
+    assert r.status_code == 200
+    assert r.json() == {"added": [], "removed": [], "reloaded": []}
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from app.services import sampling
+
+SERIES = {
+    "m_molar": 3.326,
+    "s_molar": 6.674,
+    "i_molar": 0.0246,
+    "temperature_k": 333.0,
+    "time_end_s": 35854.0,
+    "time_steps": 400,
+}
+
+
+def _saturating(times: np.ndarray) -> sampling.Series:
+    """Fast early rise that flattens, like conversion."""
+    conversion = 1 - np.exp(-times / 500.0)
+    return {"model": {"conversion": conversion, "mn": np.full_like(times, 2.0)}}
+
+
+def _max_error(times: np.ndarray, series: sampling.Series) -> float:
+    fine = np.linspace(times[0], times[-1], 20001)
+    exact = _saturating(fine)["model"]["conversion"]
+    interpolated = np.interp(fine, times, series["model"]["conversion"])
+    return float(np.abs(interpolated - exact).max())
+
+
+def test_refinement_concentrates_points_where_the_curve_bends():
+    calls = []
+
+    def evaluate(times):
+        calls.append(len(times))
+        return _saturating(times)
+
+    grid = sampling.time_grid(0.0, 30000.0, 9)
+    times, series = sampling.refine(evaluate, grid, 1000, 0.001)
+
+    assert np.all(np.diff(times) > 0)
+    assert sum(calls) == len(times)  # one batch per round, every point returned
+    assert _max_error(times, series) < 0.005
+    uniform = np.linspace(0.0, 30000.0, len(times))
+    assert _max_error(uniform, _saturating(uniform)) > 5 * _max_error(times, series)
+    assert np.median(times) < 3000
+
+
+def test_refinement_stops_at_max_points():
+    times, series = sampling.refine(
+        _saturating, sampling.time_grid(0.0, 30000.0, 9, "log"), 20, 1e-9
+    )
+    assert len(times) == 20
+    assert len(series["model"]["mn"]) == 20
+
+
+def test_log_grid_from_zero_keeps_the_start():
+    grid = sampling.time_grid(0.0, 1000.0, 5, "log")
+    assert grid[0] == 0.0 and grid[1] == pytest.approx(1.0) and grid[-1] == 1000.0
+
+
+@pytest.mark.parametrize("steps", [2, 3])
+def test_short_log_grid_from_zero_ends_at_end(steps):
+    grid = sampling.time_grid(0.0, 1000.0, steps, "log")
+    assert len(grid) == steps
+    assert grid[0] == 0.0 and grid[-1] == 1000.0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_compare_returns_fewer_non_uniform_times(client):
+    uniform = await client.post("/api/v1/predict/compare", json=SERIES)
+    adaptive = await client.post(
+        "/api/v1/predict/compare", json={**SERIES, "sampling": "adaptive"}
+    )
+    assert adaptive.status_code == 200
+    times = np.array(adaptive.json()["times"])
+    assert times[0] == 0.0 and times[-1] == SERIES["time_end_s"]
+    assert np.all(np.diff(times) > 0)
+    assert len(times) < SERIES["time_steps"] / 2
+    assert np.ptp(np.diff(times)) > 1.0  # non-uniform spacing
+    assert len(adaptive.json()["pcinn"]["conversion"]) == len(times)
+    assert len(adaptive.content) < len(uniform.content) / 2
+
+    # A looser tolerance still tracks the dense uniform curve.
+    coarse = await client.post(
+        "/api/v1/predict/timeseries",
+        json={**SERIES, "sampling": "adaptive", "tolerance": 0.05},
+    )
+    series = coarse.json()
+    dense = uniform.json()
+    expected = np.interp(dense["times"], series["times"], series["conversion"])
+    np.testing.assert_allclose(expected, dense["sa_pcinn"]["conversion"], atol=0.05)
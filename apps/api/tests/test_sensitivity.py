@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+import torch
+
+from app.models.inference import load_model, scale_inputs
+from app.models.sensitivity import predict_jacobian
+from app.schemas.validation import INPUT_LOWER, INPUT_UPPER, sample_inputs
+
+PREDICTOR = load_model("artifacts/pcinn_fold8_bundle.pt", engine="torch")
+
+
+def test_raw_jacobian_matches_autograd():
+    inputs = sample_inputs(16)
+    values, jacobian = predict_jacobian(PREDICTOR, inputs, space="raw")
+
+    scale = torch.tensor(1.0 / (PREDICTOR.scalerx_max - PREDICTOR.scalerx_min))
+    x = torch.tensor(scale_inputs(PREDICTOR, inputs), dtype=torch.float64)
+    model = PREDICTOR.model.double()
+    try:
+        expected = torch.autograd.functional.jacobian(
+            lambda x: model(x).sum(dim=0), x
+        ).permute(1, 0, 2)
+    finally:
+        model.float()
+
+    np.testing.assert_allclose(
+        jacobian, (expected * scale).numpy(), rtol=1e-6, atol=1e-9
+    )
+    assert values.shape == (16, 6)
+
+
+def test_physical_jacobian_matches_finite_differences():
+    inputs = sample_inputs(8, seed=3)
+    _, jacobian = predict_jacobian(PREDICTOR, inputs)
+
+    step = 1e-4 * (INPUT_UPPER - INPUT_LOWER)
+    for j in range(5):
+        offset = np.zeros(5)
+        offset[j] = step[j]
+        upper, _ = predict_jacobian(PREDICTOR, inputs + offset)
+        lower, _ = predict_jacobian(PREDICTOR, inputs - offset)
+        central = (upper - lower) / (2 * step[j])
+        np.testing.assert_allclose(jacobian[:, :, j], central, rtol=1e-3, atol=1e-6)
+
+
+def test_chunked_matches_single_pass(monkeypatch):
+    inputs = sample_inputs(10)
+    _, full = predict_jacobian(PREDICTOR, inputs)
+    monkeypatch.setattr("app.models.sensitivity.JACOBIAN_CHUNK_ROWS", 3)
+    _, chunked = predict_jacobian(PREDICTOR, inputs)
+    np.testing.assert_allclose(full, chunked, rtol=1e-12)
+
+
+@pytest.mark.asyncio
+async def test_jacobian_endpoint(client):
+    row = {
+        "m_molar": 2.0,
+        "s_molar": 7.0,
+        "i_molar": 0.05,
+        "temperature_k": 343.0,
+        "time_s": 3600.0,
+    }
+    r = await client.post(
+        "/api/v1/predict/jacobian",
+        params={"model": "pcinn"},
+        json={"inputs": [row] * 3},
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["outputs"][1] == "mn"
+    assert data["inputs"][3] == "temperature_k"
+    assert np.array(data["jacobian"]).shape == (3, 6, 5)
+
+
+@pytest.mark.asyncio
+async def test_jacobian_endpoint_rejects_bad_space(client):
+    r = await client.post(
+        "/api/v1/predict/jacobian", params={"space": "log"}, json={"inputs": []}
+    )
+    assert r.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_jacobian_endpoint_accepts_an_empty_batch(client):
+    r = await client.post("/api/v1/predict/jacobian", json={"inputs": []})
+    assert r.status_code == 200
+    assert r.json()["values"] == [] and r.json()["jacobian"] == []
@@ -0,0 +1,104 @@
+import pytest
+
+from app.config import settings
+from app.services import tracing
+
+SERIES = {
+    "m_molar": 3.326,
+    "s_molar": 6.674,
+    "i_molar": 0.0246,
+    "temperature_k": 333.0,
+    "time_end_s": 35854.0,
+    "time_steps": 50,
+}
+
+
+def _entries(header: str) -> dict[str, str]:
+    return {part.split(";")[0]: part for part in header.split(", ")}
+
+
+@pytest.mark.asyncio
+async def test_server_timing_is_opt_in(client):
+    r = await client.post("/api/v1/predict/compare", json=SERIES)
+    assert "server-timing" not in r.headers
+
+
+@pytest.mark.asyncio
+async def test_compare_server_timing_breaks_down_stages_per_model(client, monkeypatch):
+    monkeypatch.setattr(settings, "cache_enabled", False)
+    r = await client.post(
+        "/api/v1/predict/compare",
+        json=SERIES,
+        headers={"x-server-timing": "1", "origin": "http://localhost:3000"},
+    )
+    assert r.status_code == 200
+    entries = _entries(r.headers["server-timing"])
+    assert "validation" in entries
+    assert "forward.baseline_nn+pcinn+sa_pcinn" in entries
+    for model in ("baseline_nn", "pcinn", "sa_pcinn"):
+        assert f"postprocess.{model}" in entries
+    assert "serialization" in entries
+    assert entries["total"].startswith("total;dur=")
+    assert r.headers["timing-allow-origin"] == "http://localhost:3000"
+
+
+@pytest.mark.asyncio
+async def test_single_prediction_timing_reports_cache_status(client):
+    body = {
+        "m_molar": 2.0,
+        "s_molar": 7.0,
+        "i_molar": 0.01,
+        "temperature_k": 340.0,
+        "time_s": 1234.5,
+    }
+    first = await client.post(
+        "/api/v1/predict", json=body, headers={"x-server-timing": "1"}
+    )
+    entries = _entries(first.headers["server-timing"])
+    assert {"scaling.sa_pcinn", "forward.sa_pcinn", "postprocess.sa_pcinn"} <= set(entries)
+    assert entries["cache"] == 'cache;desc="MISS"'
+    second = await client.post(
+        "/api/v1/predict", json=body, headers={"x-server-timing": "1"}
+    )
+    entries = _entries(second.headers["server-timing"])
+    assert entries["cache"] == 'cache;desc="HIT"'
+    assert "forward.sa_pcinn" not in entries
+
+
+@pytest.mark.asyncio
+async def test_profiling_requires_token_and_serves_summary(client, monkeypatch):
+    monkeypatch.setattr(settings, "cache_enabled", False)
+    monkeypatch.setattr(settings, "profiling_token", "secret")
+    r = await client.post(
+        "/api/v1/predict/compare", json=SERIES, headers={"x-profile-token": "wrong"}
+    )
+    assert "x-profile-id" not in r.headers
+
+    r = await client.post(
+        "/api/v1/predict/compare", json=SERIES, headers={"x-profile-token": "secret"}
+    )
+    assert "server-timing" in r.headers
+    profile_id = r.headers["x-profile-id"]
+
+    r = await client.get(f"/api/v1/profiles/{profile_id}")
+    assert r.status_code == 403
+    r = await client.get(
+        f"/api/v1/profiles/{profile_id}", headers={"x-profile-token": "secret"}
+    )
+    assert r.status_code == 200
+    assert r.text.startswith("POST /api/v1/predict/compare")
+    assert "predict_timeseries_columns" in r.text
+
+
+def test_profiled_call_runs_unprofiled_while_another_profile_is_active():
+    outer, inner = tracing.RequestTrace(profile=True), tracing.RequestTrace(profile=True)
+
+    def nested() -> int:
+        return tracing.profiled(sum, inner)([1, 2, 3])
+
+    assert tracing.profiled(nested, outer)() == 6
+    assert outer.stats is not None and outer.skipped == 0
+    assert inner.stats is None and inner.skipped == 1
+    # The lock is released, so the next call is profiled again.
+    assert tracing.profiled(sum, inner)([1]) == 1
+    assert inner.stats is not None
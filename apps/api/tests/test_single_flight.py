@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.main import app
+from app.services.singleflight import SingleFlight
+
+SERIES = {
+    "m_molar": 3.1,
+    "s_molar": 6.9,
+    "i_molar": 0.03,
+    "temperature_k": 340.0,
+    "time_end_s": 20000.0,
+    "time_steps": 400,
+}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_computation():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def compute() -> bytes:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return b"result"
+
+    callers = [asyncio.create_task(flight.do("k", compute)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*callers)
+
+    assert calls == 1
+    assert [shared for _, shared in results] == [False, True, True]
+    assert {content for content, _ in results} == {b"result"}
+    assert flight.as_dict() == {
+        "leaders": 1,
+        "shared": 2,
+        "errors": 0,
+        "cancelled": 0,
+        "in_flight": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller_and_are_not_remembered():
+    flight = SingleFlight()
+
+    async def fail() -> bytes:
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        flight.do("k", fail), flight.do("k", fail), return_exceptions=True
+    )
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.stats.errors == 1
+
+    async def succeed() -> bytes:
+        return b"ok"
+
+    assert await flight.do("k", succeed) == (b"ok", False)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_work():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    started = asyncio.Event()
+
+    async def compute() -> bytes:
+        started.set()
+        await release.wait()
+        return b"result"
+
+    leader = asyncio.create_task(flight.do("k", compute))
+    follower = asyncio.create_task(flight.do("k", compute))
+    await started.wait()
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await follower == (b"result", True)
+    assert leader.cancelled()
+
+    # Once nobody is waiting the computation itself is cancelled.
+    release.clear()
+    lone = asyncio.create_task(flight.do("j", compute))
+    await asyncio.sleep(0.01)
+    lone.cancel()
+    await asyncio.gather(lone, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert flight.as_dict()["cancelled"] == 1
+    assert flight.as_dict()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_compare_requests_share_a_response(
+    client, monkeypatch
+):
+    monkeypatch.setattr(settings, "cache_enabled", False)
+    before = app.state.single_flight.as_dict()
+    responses = await asyncio.gather(
+        *(client.post("/api/v1/predict/compare", json=SERIES) for _ in range(5))
+    )
+    assert all(r.status_code == 200 for r in responses)
+    assert len({r.content for r in responses}) == 1
+
+    after = (await client.get("/api/v1/stats")).json()["single_flight"]
+    leaders = after["leaders"] - before["leaders"]
+    shared = after["shared"] - before["shared"]
+    assert leaders + shared == 5 and shared >= 1
+    assert sum("x-single-flight" in r.headers for r in responses) == shared
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from app.models.inference import OUTPUT_FIELDS, predict_columns
+from app.models.numpy_engine import NUMPY_ENGINE_ATOL
+from app.models.registry import ModelRegistry
+from app.models.stacked import StackedPredictor
+
+
+def _inputs(n: int = 128) -> np.ndarray:
+    lo = np.array([0.5, 5.0, 0.005, 323.0, 1.2])
+    hi = np.array([5.0, 9.5, 0.1, 363.0, 35854.0])
+    return lo + np.random.default_rng(1).random((n, 5)) * (hi - lo)
+
+
+@pytest.mark.parametrize("engine", ["torch", "numpy"])
+def test_stacked_matches_sequential(engine):
+    predictors = dict(ModelRegistry("artifacts", engine=engine))
+    stacked = StackedPredictor.from_predictors(predictors)
+    inputs = _inputs()
+
+    fused = stacked.predict_columns(inputs)
+
+    assert tuple(fused) == ("baseline_nn", "pcinn", "sa_pcinn")
+    for name, predictor in predictors.items():
+        expected = predict_columns(predictor, inputs)
+        np.testing.assert_allclose(
+            fused[name]["raw_outputs"],
+            expected["raw_outputs"],
+            rtol=0,
+            atol=NUMPY_ENGINE_ATOL,
+        )
+        for field in OUTPUT_FIELDS:
+            assert fused[name][field].shape == (len(inputs),)
+
+
+def test_stacked_built_from_tracks_predictor_identity():
+    predictors = dict(ModelRegistry("artifacts", engine="numpy"))
+    stacked = StackedPredictor.from_predictors(predictors)
+    assert stacked.built_from(predictors)
+    reloaded = ModelRegistry("artifacts", engine="numpy")
+    assert not stacked.built_from({**predictors, "pcinn": reloaded["pcinn"]})
+
+
+@pytest.mark.parametrize("steps", [2, 100, 5000])
+def test_forward_timeseries_matches_tiled_inputs(steps):
+    predictors = dict(ModelRegistry("artifacts", engine="numpy"))
+    stacked = StackedPredictor.from_predictors(predictors)
+    recipe = np.array([3.326, 6.674, 0.0246, 333.0])
+    times = np.linspace(0.0, 35854.0, steps)
+    tiled = np.column_stack([np.tile(recipe, (steps, 1)), times])
+
+    np.testing.assert_allclose(
+        stacked.forward_timeseries(recipe, times),
+        stacked.forward(tiled),
+        rtol=0,
+        atol=NUMPY_ENGINE_ATOL,
+    )
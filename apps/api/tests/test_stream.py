@@ -0,0 +1,161 @@
+import json
+import pickle
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.main import app
+from app.models.inference import predict
+from app.schemas.validation import INPUT_FIELDS, bounds_errors
+from app.services import streaming
+
+ROW = [3.326, 6.674, 0.0246, 333.0, 7200.0]
+
+
+def _rows(n: int) -> np.ndarray:
+    rows = np.tile(ROW, (n, 1))
+    rows[:, 4] = np.linspace(1.2, 35854.0, n)
+    return rows
+
+
+async def _body(text: str, piece: int = 997):
+    data = text.encode()
+    for start in range(0, len(data), piece):
+        yield data[start : start + piece]
+
+
+def test_bounds_errors_report_row_and_field():
+    rows = _rows(5)
+    rows[3, 0] = 0.1
+    rows[4, 3] = np.nan
+    errors = bounds_errors(rows, row_offset=100)
+    assert [e["loc"] for e in errors] == [
+        ["body", 103, "m_molar"],
+        ["body", 104, "temperature_k"],
+    ]
+    assert errors[0]["type"] == "greater_than_equal"
+    assert bounds_errors(_rows(5)) == []
+
+
+@pytest.mark.asyncio
+async def test_stream_ndjson_in_chunks(client, monkeypatch):
+    monkeypatch.setattr(settings, "stream_chunk_rows", 100)
+    rows = _rows(1050)
+    text = "".join(json.dumps(dict(zip(INPUT_FIELDS, r))) + "\n" for r in rows.tolist())
+    r = await client.post(
+        "/api/v1/predict/stream",
+        content=_body(text),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    results = [json.loads(line) for line in r.text.splitlines()]
+    assert len(results) == 1050
+    assert results == predict(app.state.predictors["sa_pcinn"], rows)
+
+
+@pytest.mark.asyncio
+async def test_stream_csv_to_csv(client, monkeypatch):
+    monkeypatch.setattr(settings, "stream_chunk_rows", 64)
+    rows = _rows(200)
+    text = "time_s,m_molar,s_molar,i_molar,temperature_k\n" + "".join(
+        f"{r[4]},{r[0]},{r[1]},{r[2]},{r[3]}\n" for r in rows.tolist()
+    )
+    r = await client.post(
+        "/api/v1/predict/stream?model=pcinn",
+        content=_body(text),
+        headers={"content-type": "text/csv"},
+    )
+    assert r.status_code == 200
+    header, *lines = r.text.splitlines()
+    assert header.split(",")[:2] == ["conversion", "mn"]
+    assert len(lines) == 200
+    expected = predict(app.state.predictors["pcinn"], rows)
+    assert float(lines[-1].split(",")[1]) == expected[-1]["mn"]
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_bad_first_chunk(client):
+    text = json.dumps([0.1, 6.674, 0.0246, 333.0, 7200.0]) + "\n"
+    r = await client.post(
+        "/api/v1/predict/stream",
+        content=text,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["loc"] == ["body", 0, "m_molar"]
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_later_errors_in_band(client, monkeypatch):
+    monkeypatch.setattr(settings, "stream_chunk_rows", 10)
+    lines = [json.dumps(ROW)] * 25
+    lines[17] = "not json"
+    r = await client.post(
+        "/api/v1/predict/stream",
+        content="\n".join(lines),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert r.status_code == 200
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert len(records) == 11
+    assert records[-1]["error"][0]["loc"] == ["body", 17]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("value", ["NaN", "Infinity"])
+async def test_stream_non_finite_inputs_are_422(client, value):
+    text = json.dumps(ROW) + "\n" + json.dumps(ROW).replace("333.0", value) + "\n"
+    r = await client.post(
+        "/api/v1/predict/stream",
+        content=text,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert r.status_code == 422
+    (error,) = r.json()["detail"]
+    assert error["loc"] == ["body", 1, "temperature_k"]
+    assert error["type"] == "finite_number"
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_overlong_lines(client, monkeypatch):
+    monkeypatch.setattr(settings, "stream_max_line_bytes", 100)
+    text = json.dumps(ROW) + "\n" + " " * 200 + json.dumps(ROW) + "\n"
+    r = await client.post(
+        "/api/v1/predict/stream",
+        content=_body(text, piece=16),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert r.status_code == 422
+    assert r.json()["detail"][0]["loc"] == ["body", 1]
+    assert "longer than 100 bytes" in r.json()["detail"][0]["msg"]
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_parsed_by_the_given_runner():
+    calls = []
+
+    async def run(fn, *args):
+        calls.append(len(args[0]))
+        return fn(*args)
+
+    text = "\n".join(json.dumps(ROW) for _ in range(5))
+    chunks = streaming.iter_input_chunks(_body(text), streaming.NDJSON, 2, run=run)
+    assert [len(inputs) async for _, inputs in chunks] == [2, 2, 1]
+    assert calls == [2, 2, 1]
+
+
+def test_stream_input_error_survives_pickling():
+    error = pickle.loads(pickle.dumps(streaming.StreamInputError(3, "bad")))
+    assert (error.row, error.msg) == (3, "bad")
+
+
+@pytest.mark.asyncio
+async def test_stream_requires_known_content_type(client):
+    r = await client.post(
+        "/api/v1/predict/stream",
+        content="{}",
+        headers={"content-type": "application/json"},
+    )
+    assert r.status_code == 415
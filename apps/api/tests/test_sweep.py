@@ -0,0 +1,96 @@
+import io
+import itertools
+import json
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.main import app
+from app.models.inference import predict_columns
+from app.schemas.sweep import SweepRequest
+from app.services.sweep import grid_chunk
+
+BODY = {
+    "m_molar": {"start": 1.0, "stop": 4.0, "steps": 3},
+    "s_molar": 7.0,
+    "i_molar": {"start": 0.01, "stop": 0.1, "steps": 4, "spacing": "log"},
+    "temperature_k": 343.0,
+    "time_s": {"start": 60.0, "stop": 30000.0, "steps": 5},
+}
+
+
+def _grid() -> np.ndarray:
+    axes = SweepRequest.model_validate(BODY).axes()
+    return np.array(list(itertools.product(*axes)))
+
+
+def test_grid_chunks_match_full_product():
+    axes = SweepRequest.model_validate(BODY).axes()
+    full = _grid()
+    chunks = [grid_chunk(axes, start, min(start + 7, 60)) for start in range(0, 60, 7)]
+    np.testing.assert_array_equal(np.concatenate(chunks), full)
+    np.testing.assert_allclose(axes[2], 0.01 * 10 ** (np.arange(4) / 3))
+
+
+def test_sweep_rejects_out_of_bounds_axis():
+    with pytest.raises(ValueError, match="temperature_k"):
+        SweepRequest.model_validate({**BODY, "temperature_k": 400.0})
+
+
+def test_sweep_rejects_oversized_grid():
+    body = {
+        **BODY,
+        "m_molar": {"start": 1.0, "stop": 4.0, "steps": 100},
+        "s_molar": {"start": 5.0, "stop": 9.0, "steps": 100},
+        "time_s": {"start": 60.0, "stop": 600.0, "steps": 1000},
+    }
+    with pytest.raises(ValueError, match="at most"):
+        SweepRequest.model_validate(body)
+
+
+@pytest.mark.asyncio
+async def test_sweep_columnar_json(client, monkeypatch):
+    monkeypatch.setattr(settings, "sweep_chunk_rows", 16)
+    r = await client.post("/api/v1/predict/sweep", json=BODY)
+    assert r.status_code == 200
+    data = r.json()
+    assert data["shape"] == [3, 1, 4, 1, 5]
+    assert data["axes"]["s_molar"] == [7.0]
+    expected = predict_columns(app.state.predictors["sa_pcinn"], _grid())
+    np.testing.assert_allclose(data["mn"], expected["mn"], rtol=1e-12)
+
+
+@pytest.mark.asyncio
+async def test_sweep_streams_npy(client, monkeypatch):
+    monkeypatch.setattr(settings, "sweep_chunk_rows", 16)
+    r = await client.post(
+        "/api/v1/predict/sweep",
+        params={"model": "pcinn"},
+        json=BODY,
+        headers={"accept": "application/x-npy"},
+    )
+    assert r.status_code == 200
+    assert r.headers["x-sweep-shape"] == "3,1,4,1,5"
+    matrix = np.load(io.BytesIO(r.content))
+    assert matrix.shape == (60, 13)
+    expected = predict_columns(app.state.predictors["pcinn"], _grid())
+    np.testing.assert_allclose(matrix[:, 1], expected["mn"], rtol=1e-12)
+
+
+@pytest.mark.asyncio
+async def test_sweep_streams_ndjson_with_inputs(client):
+    r = await client.post(
+        "/api/v1/predict/sweep", json=BODY, headers={"accept": "application/x-ndjson"}
+    )
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert len(records) == 60
+    assert records[1]["time_s"] == pytest.approx(_grid()[1, 4])
+    assert "dispersity" in records[0]
+
+
+@pytest.mark.asyncio
+async def test_large_sweep_requires_streaming(client, monkeypatch):
+    monkeypatch.setattr(settings, "sweep_json_max_points", 10)
+    r = await client.post("/api/v1/predict/sweep", json=BODY)
+    assert r.status_code == 413
@@ -50,7 +50,7 @@ export interface ModelInfo {
   display_name: string;
   description: string;
   is_default: boolean;
-  final_test_loss: number;
+  final_test_loss: number | null;
 }
 
 export interface HealthStatus {